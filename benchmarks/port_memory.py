@@ -0,0 +1,48 @@
+"""Measure memory retained by the resolution stage per node and per port.
+
+Usage: python benchmarks/port_memory.py [switches] [ports-per-switch]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+
+from graphloom import MinimalGraphIn, compile_settings, sample_settings
+from graphloom.builder import _resolve_graph
+
+
+def port_dense_graph(switches: int, ports: int) -> MinimalGraphIn:
+    nodes = [{"name": f"SW{i}", "type": "switch"} for i in range(switches)]
+    links = [
+        {"from": f"SW{i}:ge-0/0/{j}", "to": f"SW{(i + j + 1) % switches}:xe-1/0/{j}"}
+        for i in range(switches)
+        for j in range(ports // 2)
+    ]
+    return MinimalGraphIn.model_validate({"nodes": nodes, "links": links})
+
+
+def main(argv: list[str]) -> None:
+    switches = int(argv[0]) if argv else 2000
+    ports = int(argv[1]) if len(argv) > 1 else 48
+    data = port_dense_graph(switches, ports)
+    compiled = compile_settings(sample_settings())
+    _resolve_graph(data, compiled)  # warm caches outside the measurement
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    graph = _resolve_graph(data, compiled)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    port_count = sum(len(node_ports) for node_ports in graph.root.ports.values())
+    link_count = len(graph.root.links)
+    print(f"{switches} nodes, {port_count} ports, {link_count} links")
+    print(f"resolved graph: {retained / 1e6:.1f} MB, {retained / port_count:.0f} bytes per port")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 from .canvas import Canvas
 from .base import Properties
+from .compiled import CompiledSettings, compile_settings
 from .enums import (
     Direction,
     EdgeMarker,
@@ -37,8 +38,23 @@ from .profile import (
 from .settings import ElkSettings, sample_settings
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .builder import MinimalGraphIn, MinimalEdgeIn, MinimalNodeIn, build_canvas, sanitize_id
+    from .builder import (
+        MinimalGraphIn,
+        MinimalEdgeIn,
+        MinimalNodeIn,
+        build_canvas,
+        build_canvas_dict,
+        build_canvas_dicts,
+        build_canvases,
+        sanitize_id,
+        write_canvas_json,
+    )
     from .elkjs import layout_with_elkjs
+    from .incremental import rebuild_canvas
+    from .ir import GraphIR, build_graph_ir, canvas_dict_from_ir, canvas_from_ir, write_ir_json
+    from .streaming import write_canvas_json_stream
+    from .tabular import read_edge_table
+    from .views import expand_canvas, expand_canvas_dict, extract_view
 
 __all__ = [
     "Node",
@@ -71,23 +87,62 @@ __all__ = [
     "MinimalEdgeIn",
     "MinimalNodeIn",
     "build_canvas",
+    "build_canvas_dict",
+    "build_canvases",
+    "build_canvas_dicts",
+    "write_canvas_json",
+    "write_canvas_json_stream",
+    "rebuild_canvas",
+    "GraphIR",
+    "build_graph_ir",
+    "canvas_from_ir",
+    "canvas_dict_from_ir",
+    "write_ir_json",
+    "read_edge_table",
+    "extract_view",
+    "expand_canvas",
+    "expand_canvas_dict",
     "layout_with_elkjs",
     "sanitize_id",
     "ElkSettings",
     "sample_settings",
+    "CompiledSettings",
+    "compile_settings",
     "ResolvedProfileElkSettings",
     "resolve_profile_elk_settings",
     "build_canvas_from_profile_bundle",
 ]
 
 
-def __getattr__(name: str):
-    if name in {"MinimalGraphIn", "MinimalEdgeIn", "MinimalNodeIn", "build_canvas", "sanitize_id"}:
-        from . import builder as _builder
+_LAZY_EXPORTS = {
+    "MinimalGraphIn": "builder",
+    "MinimalEdgeIn": "builder",
+    "MinimalNodeIn": "builder",
+    "build_canvas": "builder",
+    "build_canvas_dict": "builder",
+    "build_canvases": "builder",
+    "build_canvas_dicts": "builder",
+    "sanitize_id": "builder",
+    "write_canvas_json": "builder",
+    "write_canvas_json_stream": "streaming",
+    "rebuild_canvas": "incremental",
+    "GraphIR": "ir",
+    "build_graph_ir": "ir",
+    "canvas_from_ir": "ir",
+    "canvas_dict_from_ir": "ir",
+    "write_ir_json": "ir",
+    "read_edge_table": "tabular",
+    "extract_view": "views",
+    "expand_canvas": "views",
+    "expand_canvas_dict": "views",
+    "layout_with_elkjs": "elkjs",
+}
+
 
-        return getattr(_builder, name)
-    if name == "layout_with_elkjs":
-        from . import elkjs as _elkjs
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is not None:
+        from importlib import import_module
 
-        return _elkjs.layout_with_elkjs
+        return getattr(import_module(f".{module_name}", __name__), name)
     raise AttributeError(f"module 'graphloom' has no attribute '{name}'")
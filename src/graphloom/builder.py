@@ -1,28 +1,33 @@
 from __future__ import annotations
 
-import json
-import re
-from collections import OrderedDict
-from typing import Any, Dict, List, Tuple, Optional
+import shutil
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import IO, Any, Callable, Collection, Dict, Hashable, Iterable, Iterator, List, Mapping, NamedTuple, Optional, TextIO, Tuple
 
 try:  # Python 3.11+
     import tomllib  # type: ignore
 except ImportError:  # pragma: no cover
     import tomli as tomllib  # type: ignore
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_validator
 
 from .canvas import Canvas
-from .options import (
-    EdgeLayoutOptions,
-    LabelLayoutOptions,
-    LayoutOptions,
-    NodeLayoutOptions,
-    ParentLayoutOptions,
-    PortLayoutOptions,
-)
+from . import codec
 from .base import Properties, _gen_id
-from .edge_properties import normalize_graphrapids_edge_properties
+from .options import LayoutOptions
+from .compiled import (
+    CompiledSettings,
+    LabelTemplate,
+    _label_font,
+    _normalize_properties,
+    compile_settings,
+)
+from .edge_properties import apply_graphrapids_edge_defaults, normalize_graphrapids_edge_properties
+from .fonts import FontMetrics, font_metrics
 from .edge import Edge, EdgeLabel
 from .elkjs import layout_with_elkjs
 from .node import Node, NodeLabel
@@ -40,6 +45,15 @@ _LABEL_ESTIMATE_CHAR_WIDTH_FACTOR = 0.6
 _LABEL_ESTIMATE_LINE_HEIGHT_FACTOR = 1.2
 _LABEL_ESTIMATE_HORIZONTAL_PADDING = 1.0
 _LABEL_ESTIMATE_VERTICAL_PADDING = 1.0
+_LABEL_CACHE_SIZE = 65536
+
+# Properties of a subgraph node collapsed by ``max_depth``.
+COLLAPSED_CHILDREN_KEY = "graphloom.collapsed.children"
+COLLAPSED_DESCENDANTS_KEY = "graphloom.collapsed.descendants"
+
+# Properties carried by an edge that bundles parallel links (see ``EdgeBundling``).
+BUNDLE_COUNT_KEY = "graphloom.bundle.count"
+BUNDLE_MEMBERS_KEY = "graphloom.bundle.members"
 
 
 def _validate_length(value: str, *, field_name: str, min_len: int, max_len: int) -> str:
@@ -49,6 +63,37 @@ def _validate_length(value: str, *, field_name: str, min_len: int, max_len: int)
     return value
 
 
+def _validate_edge_label(value: str | None) -> str | None:
+    if value is None:
+        return None
+    return _validate_length(
+        value,
+        field_name="Edge name",
+        min_len=EDGE_NAME_MIN_LENGTH,
+        max_len=EDGE_NAME_MAX_LENGTH,
+    )
+
+
+def _validate_endpoint_parts(node_part: str, port_part: str | None) -> None:
+    _validate_length(
+        node_part,
+        field_name="Node name",
+        min_len=NODE_NAME_MIN_LENGTH,
+        max_len=NODE_NAME_MAX_LENGTH,
+    )
+    if port_part is not None:
+        if ":" in port_part:
+            raise ValueError(
+                "Port name cannot contain ':' because edge endpoints use 'node:port' syntax."
+            )
+        _validate_length(
+            port_part,
+            field_name="Port name",
+            min_len=PORT_NAME_MIN_LENGTH,
+            max_len=PORT_NAME_MAX_LENGTH,
+        )
+
+
 class MinimalNodeIn(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -112,40 +157,23 @@ class MinimalEdgeIn(BaseModel):
         validation_alias="to",
         serialization_alias="to",
     )
+    # Parsed during validation and read by the builder, each next to the input
+    # it was derived from: fields changed after validation (assignment,
+    # ``model_copy(update=...)``) are parsed again (see ``_edge_endpoints``).
+    _endpoints: Optional[Tuple[str, str, Tuple[str, Optional[str]], Tuple[str, Optional[str]]]] = PrivateAttr(
+        default=None
+    )
+    _elk_properties: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = PrivateAttr(default=None)
 
     @field_validator("label")
     @classmethod
     def validate_edge_label(cls, value: str | None) -> str | None:
-        if value is None:
-            return None
-        return _validate_length(
-            value,
-            field_name="Edge name",
-            min_len=EDGE_NAME_MIN_LENGTH,
-            max_len=EDGE_NAME_MAX_LENGTH,
-        )
+        return _validate_edge_label(value)
 
     @field_validator("source", "target")
     @classmethod
     def validate_endpoint(cls, value: str) -> str:
-        node_part, port_part = split_endpoint(value)
-        _validate_length(
-            node_part,
-            field_name="Node name",
-            min_len=NODE_NAME_MIN_LENGTH,
-            max_len=NODE_NAME_MAX_LENGTH,
-        )
-        if port_part is not None:
-            if ":" in port_part:
-                raise ValueError(
-                    "Port name cannot contain ':' because edge endpoints use 'node:port' syntax."
-                )
-            _validate_length(
-                port_part,
-                field_name="Port name",
-                min_len=PORT_NAME_MIN_LENGTH,
-                max_len=PORT_NAME_MAX_LENGTH,
-            )
+        _validate_endpoint_parts(*_parse_endpoint(value))
         return value
 
     @model_validator(mode="after")
@@ -154,6 +182,8 @@ class MinimalEdgeIn(BaseModel):
             self.properties,
             apply_defaults=False,
         )
+        _edge_endpoints(self)
+        _edge_elk_properties(self)
         return self
 
 
@@ -197,24 +227,42 @@ class MinimalGraphIn(BaseModel):
 MinimalNodeIn.model_rebuild()
 
 
+_ID_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+_ID_CACHE_SIZE = 65536
+_ALIAS_STOP_WORDS = frozenset({"router", "switch", "node", "host", "device"})
+# Every byte outside [a-z0-9] becomes a space so ``split()`` yields the id runs.
+_ASCII_ID_TABLE = bytes(c if chr(c) in _ID_CHARS else ord(" ") for c in range(256))
+
+
+class _UnicodeIdTable(dict):
+    """``str.translate`` table for non-ASCII input, filled in lazily per code point."""
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        replacement = char if char in _ID_CHARS else " "
+        self[codepoint] = replacement
+        return replacement
+
+
+_UNICODE_ID_TABLE = _UnicodeIdTable()
+
+
+@lru_cache(maxsize=_ID_CACHE_SIZE)
 def sanitize_id(value: str) -> str:
     """Lowercase, replace non-alnum with underscores, collapse duplicates."""
-    s = value.strip().lower()
-    s = re.sub(r"[\s:/@-]+", "_", s)
-    s = re.sub(r"[^a-z0-9_]", "_", s)
-    s = re.sub(r"_+", "_", s).strip("_")
-    return s or "id"
+    lowered = value.lower()
+    if lowered.isascii():
+        return b"_".join(lowered.encode("ascii").translate(_ASCII_ID_TABLE).split()).decode("ascii") or "id"
+    return "_".join(lowered.translate(_UNICODE_ID_TABLE).split()) or "id"
 
 
-def _candidate_aliases(label: str) -> List[str]:
+@lru_cache(maxsize=_ID_CACHE_SIZE)
+def _candidate_aliases(label: str) -> Tuple[str, ...]:
     base = sanitize_id(label)
-    tokens = [t for t in re.split(r"[\s_]+", base) if t]
-    stop = {"router", "switch", "node", "host", "device"}
-    filtered = [t for t in tokens if t not in stop]
-    aliases = {base}
-    if filtered:
-        aliases.add("_".join(filtered))
-    return list(aliases)
+    filtered = "_".join(token for token in base.split("_") if token not in _ALIAS_STOP_WORDS)
+    if filtered and filtered != base:
+        return (base, filtered)
+    return (base,)
 
 
 def split_endpoint(endpoint: str) -> Tuple[str, Optional[str]]:
@@ -224,6 +272,52 @@ def split_endpoint(endpoint: str) -> Tuple[str, Optional[str]]:
     return endpoint.strip(), None
 
 
+# The same endpoint strings recur across links (both validators and the
+# model-level cache below parse them), so parses are memoized.
+_parse_endpoint = lru_cache(maxsize=_ID_CACHE_SIZE)(split_endpoint)
+
+
+_EndpointParts = Tuple[str, Optional[str]]
+
+
+class _EdgeRow(NamedTuple):
+    """A link whose endpoints arrive already split, e.g. one edge-table row.
+
+    Rows are checked with the same rules as :class:`MinimalEdgeIn` by their
+    reader and are resolved and emitted like validated edges, without a
+    pydantic model per link.
+    """
+
+    source: _EndpointParts
+    target: _EndpointParts
+    id: str | None = None
+    label: str | None = None
+    type: str | None = None
+    properties: Mapping[str, Any] | None = None
+
+
+def _edge_endpoints(edge: "MinimalEdgeIn | _EdgeRow") -> Tuple[_EndpointParts, _EndpointParts]:
+    """Parsed ``(node, port)`` parts of an edge's source and target."""
+    if isinstance(edge, _EdgeRow):
+        return edge.source, edge.target
+    source, target = edge.source, edge.target
+    cached = edge._endpoints
+    if cached is None or cached[0] != source or cached[1] != target:
+        cached = edge._endpoints = (source, target, _parse_endpoint(source), _parse_endpoint(target))
+    return cached[2], cached[3]
+
+
+def _edge_elk_properties(edge: "MinimalEdgeIn | _EdgeRow") -> Dict[str, Any]:
+    """An edge's validated properties with short ELK option keys expanded."""
+    if isinstance(edge, _EdgeRow):
+        return _normalize_properties(dict(edge.properties or {}))
+    properties = edge.properties
+    cached = edge._elk_properties
+    if cached is None or cached[0] != properties:
+        cached = edge._elk_properties = (dict(properties), _normalize_properties(properties))
+    return cached[1]
+
+
 def _parse_link_shorthand(link: str) -> Dict[str, str]:
     left, sep, right = link.partition("->")
     if not sep:
@@ -251,91 +345,173 @@ def _as_node(node: "MinimalNodeIn | str") -> "MinimalNodeIn":
     return MinimalNodeIn.model_validate({"name": node})
 
 
-def _as_edge(edge: "MinimalEdgeIn | str") -> "MinimalEdgeIn":
-    if isinstance(edge, MinimalEdgeIn):
+def _as_edge(edge: "MinimalEdgeIn | _EdgeRow | str") -> "MinimalEdgeIn | _EdgeRow":
+    if isinstance(edge, (MinimalEdgeIn, _EdgeRow)):
         return edge
     return MinimalEdgeIn.model_validate(_normalize_link_entry(edge))
 
 
-def _collect_alias_candidates(graph_data: MinimalGraphIn) -> Dict[str, List[str]]:
-    """Collect node aliases across all scopes for cross-scope endpoint resolution."""
-    alias_candidates: Dict[str, List[str]] = {}
+class _ScopeView(NamedTuple):
+    """Nodes and links of one graph scope, viewed without re-validating them.
+
+    Both :class:`MinimalGraphIn` and nested :class:`MinimalNodeIn` entries are
+    already validated, so the builder recurses over these views instead of
+    wrapping each nested node in a new ``MinimalGraphIn``.
+    """
+
+    nodes: List["MinimalNodeIn | str"]
+    links: List["MinimalEdgeIn | str"]
 
-    def add_alias(alias: str, node_id: str) -> None:
-        alias_candidates.setdefault(alias, []).append(node_id)
 
-    def visit(scope: MinimalGraphIn) -> None:
+def _scope_view(source: "MinimalGraphIn | MinimalNodeIn | _ScopeView") -> _ScopeView:
+    if isinstance(source, _ScopeView):
+        return source
+    return _ScopeView(source.nodes, source.links)
+
+
+class _SubtreeKeys:
+    """Content keys for nested scopes: equal keys mean equal nodes and links.
+
+    Each distinct scope content is interned to a small integer, so the key of
+    a parent scope only hashes its own entries plus the integer keys of its
+    children.  Keys are memoized per input model for the lifetime of a build.
+    """
+
+    def __init__(self) -> None:
+        self._interned: Dict[Hashable, int] = {}
+        self._by_model: Dict[int, int] = {}
+
+    def key(self, node: MinimalNodeIn) -> int:
+        key = self._by_model.get(id(node))
+        if key is None:
+            content = (
+                tuple(self._node_key(node_raw) for node_raw in node.nodes),
+                tuple(self._link_key(edge_raw) for edge_raw in node.links),
+            )
+            key = self._interned.setdefault(content, len(self._interned))
+            self._by_model[id(node)] = key
+        return key
+
+    def _node_key(self, node_raw: "MinimalNodeIn | str") -> Hashable:
+        if isinstance(node_raw, str):
+            return node_raw
+        child = self.key(node_raw) if node_raw.nodes or node_raw.links else None
+        return (node_raw.name, node_raw.type, node_raw.id, child)
+
+    @staticmethod
+    def _link_key(edge_raw: "MinimalEdgeIn | str") -> Hashable:
+        if isinstance(edge_raw, str):
+            return edge_raw
+        return (
+            edge_raw.source,
+            edge_raw.target,
+            edge_raw.id,
+            edge_raw.label,
+            edge_raw.type,
+            repr(edge_raw.properties),
+        )
+
+
+def _node_names(label: str, node_id: str, node_id_override: str | None = None) -> Tuple[str, ...]:
+    """Aliases a node answers to, in registration order, ending with its id."""
+    aliases = list(_candidate_aliases(label))
+    if node_id_override:
+        aliases.extend(_candidate_aliases(node_id_override))
+    aliases.append(node_id)
+    return tuple(dict.fromkeys(aliases))
+
+
+class _AliasIndex:
+    """Node aliases of every scope, collected in one pass over the input tree.
+
+    Each scope, keyed by its :class:`_SubtreeKeys` key (``None`` for the root),
+    gets a local alias map where the first node declaring an alias wins.  The
+    global map records every registration of an alias across all scopes, so a
+    token that is not local is a unique cross-scope hit when it has exactly one
+    registration and ambiguous otherwise.  Scopes with equal content share one
+    local map, but still count once per occurrence in the global map.
+    """
+
+    def __init__(self, data: "MinimalGraphIn | _ScopeView", subtree_keys: _SubtreeKeys) -> None:
+        self._local: Dict[int | None, Dict[str, str]] = {}
+        self._global: Dict[str, List[str]] = {}
+        self._subtree_keys = subtree_keys
+        self._add_scope(_scope_view(data), None)
+
+    def _add_scope(self, scope: _ScopeView, scope_key: int | None) -> None:
+        local = self._local.get(scope_key)
+        new_scope = local is None
+        if new_scope:
+            local = self._local[scope_key] = {}
+        global_index = self._global
         for node_raw in scope.nodes:
             node = _as_node(node_raw)
-            node_id_source = node.id or node.name
-            node_id = sanitize_id(node_id_source)
-            aliases = _candidate_aliases(node.name)
-            if node.id:
-                aliases.extend(_candidate_aliases(node.id))
-            aliases.append(node_id)
-            for alias in dict.fromkeys(aliases):
-                add_alias(alias, node_id)
+            node_id = sanitize_id(node.id or node.name)
+            for alias in _node_names(node.name, node_id, node.id):
+                if new_scope:
+                    local.setdefault(alias, node_id)
+                global_index.setdefault(alias, []).append(node_id)
             if node.nodes or node.links:
-                visit(MinimalGraphIn(nodes=node.nodes, links=node.links))
+                self._add_scope(_scope_view(node), self._subtree_keys.key(node))
+
+    def add_local(self, scope_key: int | None, node_id: str, label: str) -> None:
+        """Register an auto-created node; it is only visible inside its scope."""
+        local = self._local[scope_key]
+        for alias in _node_names(label, node_id):
+            local.setdefault(alias, node_id)
 
-    visit(graph_data)
-    return alias_candidates
+    def local(self, scope_key: int | None, token: str) -> str | None:
+        return self._local[scope_key].get(token)
 
+    def matches(self, token: str) -> List[str]:
+        """Node ids registered for ``token`` anywhere in the graph, one per registration."""
+        return self._global.get(token, [])
 
-class _NodeRecord(BaseModel):
+
+class _NodeRecord(NamedTuple):
     id: str
     label: str
     type: str
-    aliases: List[str]
-    input_node: MinimalNodeIn | None = None
 
 
-def _layout_aliases(model_cls: type[BaseModel]) -> set[str]:
-    return {f.alias or name for name, f in model_cls.model_fields.items()}
+class _Port(NamedTuple):
+    id: str
+    label: str
 
 
-def _elk_option_identifiers() -> set[str]:
-    return {
-        *_layout_aliases(ParentLayoutOptions),
-        *_layout_aliases(NodeLayoutOptions),
-        *_layout_aliases(EdgeLayoutOptions),
-        *_layout_aliases(PortLayoutOptions),
-        *_layout_aliases(LabelLayoutOptions),
-    }
+_PortStore = Dict[str, Dict[str, _Port]]
+"""Ports by node id, then by sanitized port name, in registration order."""
 
 
-_ELK_OPTION_IDENTIFIERS = _elk_option_identifiers()
+class _Endpoint(NamedTuple):
+    """A link endpoint resolved to its node, optional port and scope locality."""
 
+    node_id: str
+    port_id: str | None
+    is_local: bool
 
-def _normalize_properties(data: Dict[str, Any]) -> Dict[str, Any]:
-    if not data:
-        return {}
-    normalized: Dict[str, Any] = {}
+    @property
+    def ref(self) -> str:
+        """Id referenced by the emitted edge: the port when present, else the node."""
+        return self.port_id if self.port_id is not None else self.node_id
 
-    # Preserve long-form keys first
-    for key, value in data.items():
-        if key.startswith("org.eclipse.elk."):
-            normalized[key] = value
 
-    # Map short-form keys to long-form when possible
-    for key, value in data.items():
-        if key.startswith("org.eclipse.elk."):
-            continue
-        long_key = f"org.eclipse.elk.{key}"
-        if long_key in _ELK_OPTION_IDENTIFIERS:
-            normalized.setdefault(long_key, value)
-        else:
-            normalized[key] = value
+class _ResolvedLink(NamedTuple):
+    edge: "MinimalEdgeIn | _EdgeRow"
+    source: _Endpoint
+    target: _Endpoint
 
-    return normalized
 
+@dataclass
+class _ResolvedScope:
+    """Per-scope endpoint table produced by the resolution stage of :func:`build_canvas`."""
 
-def _canvas_layout_options(options: Dict[str, Any]) -> LayoutOptions:
-    disallowed = sorted(key for key in options if key not in _ELK_OPTION_IDENTIFIERS)
-    if disallowed:
-        disallowed_list = ", ".join(disallowed)
-        raise ValueError(f"Unknown layout option identifiers: {disallowed_list}")
-    return LayoutOptions(**options)
+    nodes: Dict[str, _NodeRecord] = field(default_factory=dict)
+    ports: _PortStore = field(default_factory=dict)
+    links: List[_ResolvedLink] = field(default_factory=list)
+    children: Dict[str, "_ResolvedScope"] = field(default_factory=dict)
+    # Extra properties of subgraph nodes collapsed into summary leaves.
+    summaries: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 
 def _merge_properties(base: Properties, extra: Dict[str, Any]) -> Properties:
@@ -347,6 +523,37 @@ def _merge_properties(base: Properties, extra: Dict[str, Any]) -> Properties:
     return Properties(**merged)
 
 
+def _estimate_text_dimensions(
+    text: str,
+    font_size: float,
+    metrics: FontMetrics | None = None,
+) -> tuple[float, float]:
+    lines = text.splitlines() or [text]
+    line_count = max(len(lines), 1)
+    if metrics is None:
+        max_chars = max((len(line) for line in lines), default=0)
+        text_width = max_chars * font_size * _LABEL_ESTIMATE_CHAR_WIDTH_FACTOR
+    else:
+        text_width = max(metrics.text_width(line) for line in lines) * font_size
+
+    estimated_width = text_width + _LABEL_ESTIMATE_HORIZONTAL_PADDING
+    estimated_height = (
+        line_count * font_size * _LABEL_ESTIMATE_LINE_HEIGHT_FACTOR
+        + _LABEL_ESTIMATE_VERTICAL_PADDING
+    )
+    return round(estimated_width, 2), round(estimated_height, 2)
+
+
+@lru_cache(maxsize=_LABEL_CACHE_SIZE)
+def _estimate_label_size(text: str, font_name: str, font_size: float) -> tuple[float, float]:
+    """Memoized label size estimate; port names and edge labels repeat heavily.
+
+    Fonts with an advance table in :mod:`graphloom.fonts` are measured glyph by
+    glyph; other fonts use the flat per-character width factor.
+    """
+    return _estimate_text_dimensions(text, font_size, font_metrics(font_name))
+
+
 def _estimate_label_dimensions(
     *,
     text: str,
@@ -358,310 +565,1041 @@ def _estimate_label_dimensions(
     if not settings.estimate_label_size_from_font:
         return width, height
 
-    props = properties.model_dump()
-    font_name = props.get("org.eclipse.elk.font.name")
-    font_size_value = props.get("org.eclipse.elk.font.size")
-    if not isinstance(font_name, str) or not font_name.strip():
+    font = _label_font(properties.model_dump())
+    if font is None:
         return width, height
+    return _estimate_label_size(text, *font)
 
-    try:
-        font_size = float(font_size_value)
-    except (TypeError, ValueError):
-        return width, height
-    if font_size <= 0:
-        return width, height
 
-    lines = text.splitlines() or [text]
-    line_count = max(len(lines), 1)
-    max_chars = max((len(line) for line in lines), default=0)
+def _label_dimensions(
+    template: LabelTemplate,
+    text: str,
+    compiled: CompiledSettings,
+) -> tuple[float, float]:
+    if not compiled.estimate_label_size_from_font or template.font is None:
+        return template.width, template.height
+    return _estimate_label_size(text, *template.font)
 
-    estimated_width = (
-        max_chars * font_size * _LABEL_ESTIMATE_CHAR_WIDTH_FACTOR
-        + _LABEL_ESTIMATE_HORIZONTAL_PADDING
-    )
-    estimated_height = (
-        line_count * font_size * _LABEL_ESTIMATE_LINE_HEIGHT_FACTOR
-        + _LABEL_ESTIMATE_VERTICAL_PADDING
-    )
-    return round(estimated_width, 2), round(estimated_height, 2)
 
+def _compiled_settings(settings: ElkSettings | CompiledSettings | None) -> CompiledSettings:
+    if isinstance(settings, CompiledSettings):
+        return settings
+    return compile_settings(settings or sample_settings())
 
-def build_canvas(data: MinimalGraphIn, settings: ElkSettings | None = None) -> Canvas:
-    settings = settings or sample_settings()
-    parent_layout = _canvas_layout_options(settings.layout_options)
-    global_alias_candidates = _collect_alias_candidates(data)
-    cross_scope_ports: Dict[str, OrderedDict[str, Dict[str, str]]] = {}
-
-    type_overrides_lc = {k.lower(): v for k, v in settings.type_overrides.items()}
-    type_icon_map_lc = {k.lower(): v for k, v in settings.type_icon_map.items()}
-    edge_type_overrides_lc = {k.lower(): v for k, v in settings.edge_type_overrides.items()}
-
-    def build_scope(graph_data: MinimalGraphIn) -> tuple[List[Node], List[Edge]]:
-        nodes: "OrderedDict[str, _NodeRecord]" = OrderedDict()
-        alias_index: Dict[str, str] = {}
-        ports: Dict[str, OrderedDict[str, Dict[str, str]]] = {}
-
-        def ensure_port(
-            port_store: Dict[str, OrderedDict[str, Dict[str, str]]],
-            *,
-            node_id: str,
-            port_name: str,
-        ) -> str:
-            port_key = sanitize_id(port_name)
-            if node_id not in port_store:
-                port_store[node_id] = OrderedDict()
-            if port_key not in port_store[node_id]:
-                port_store[node_id][port_key] = {
-                    "label": port_name,
-                    "id": f"{node_id}_{port_key}",
-                }
-            return port_store[node_id][port_key]["id"]
+
+@dataclass
+class _ResolvedGraph:
+    """Output of the resolution stage: the root scope tree plus cross-scope ports."""
+
+    root: _ResolvedScope
+    cross_scope_ports: _PortStore
+
+
+def _ensure_port(
+    port_store: _PortStore,
+    *,
+    node_id: str,
+    port_name: str,
+) -> str:
+    port_key = sanitize_id(port_name)
+    node_ports = port_store.get(node_id)
+    if node_ports is None:
+        node_ports = port_store[node_id] = {}
+    port = node_ports.get(port_key)
+    if port is None:
+        port = node_ports[port_key] = _Port(id=f"{node_id}_{port_key}", label=port_name)
+    return port.id
+
+
+def _resolve_graph(
+    data: "MinimalGraphIn | _ScopeView",
+    compiled: CompiledSettings,
+    root_links: "List[_ResolvedLink] | None" = None,
+) -> _ResolvedGraph:
+    """Resolve ``data`` into per-scope node, port and endpoint tables.
+
+    ``root_links`` replaces the list collecting the top-level resolved links,
+    e.g. with a container that spills them to disk.
+    """
+    cross_scope_ports: _PortStore = {}
+    subtree_keys = _SubtreeKeys()
+    alias_index = _AliasIndex(data, subtree_keys)
+    resolved_subtrees: Dict[int, _ResolvedScope] = {}
+
+    def resolve_scope(graph_data: _ScopeView, scope_key: int | None) -> _ResolvedScope:
+        """Register a scope's nodes and resolve every link endpoint exactly once.
+
+        Nested scopes are resolved depth-first after their parent's links so that
+        cross-scope ports are registered in the same order as they are declared.
+        Node ids are not prefixed by their parent, so nested scopes with equal
+        content resolve identically and share one resolved scope; repeating
+        their cross-scope port registrations would not change anything.
+        """
+        scope = _ResolvedScope()
+        if scope_key is None and root_links is not None:
+            scope.links = root_links
+        nodes = scope.nodes
 
         def register_node(
             label: str,
             node_type: str | None = None,
             node_id_override: str | None = None,
-            input_node: MinimalNodeIn | None = None,
         ) -> _NodeRecord:
             node_id_source = node_id_override or label
             node_id = sanitize_id(node_id_source)
             if node_id in nodes:
                 raise ValueError(f"Duplicate node id '{node_id}' derived from '{node_id_source}'")
-            node_type_norm = (node_type or settings.node_defaults.type).lower()
-            aliases = _candidate_aliases(label)
-            if node_id_override:
-                aliases.extend(_candidate_aliases(node_id_override))
-            aliases = list(dict.fromkeys(aliases))
-            record = _NodeRecord(
-                id=node_id,
-                label=label,
-                type=node_type_norm,
-                aliases=aliases,
-                input_node=input_node,
-            )
+            node_type_norm = (node_type or compiled.default_node_type).lower()
+            record = _NodeRecord(id=node_id, label=label, type=node_type_norm)
             nodes[node_id] = record
-            for alias in record.aliases:
-                alias_index.setdefault(alias, node_id)
-            alias_index.setdefault(node_id, node_id)
             return record
 
+        nested: List[Tuple[str, MinimalNodeIn]] = []
         for node_raw in graph_data.nodes:
             node = _as_node(node_raw)
-            register_node(
+            record = register_node(
                 label=node.name,
                 node_type=node.type,
                 node_id_override=node.id,
-                input_node=node,
             )
+            if node.nodes or node.links:
+                nested.append((record.id, node))
 
-        def ensure_node(node_token: str) -> tuple[_NodeRecord, bool]:
+        def ensure_node(node_token: str) -> tuple[str, bool]:
             token_norm = sanitize_id(node_token)
-            if token_norm in alias_index:
-                node_id = alias_index[token_norm]
-                return nodes[node_id], True
+            local_id = alias_index.local(scope_key, token_norm)
+            if local_id is not None:
+                return local_id, True
 
-            global_matches = global_alias_candidates.get(token_norm, [])
+            global_matches = alias_index.matches(token_norm)
             if len(global_matches) == 1:
-                return (
-                    _NodeRecord(
-                        id=global_matches[0],
-                        label=node_token,
-                        type=settings.node_defaults.type,
-                        aliases=[token_norm],
-                    ),
-                    False,
-                )
+                return global_matches[0], False
             if len(global_matches) > 1:
                 unique_matches = sorted(dict.fromkeys(global_matches))
                 raise ValueError(
                     f"Ambiguous node '{node_token}' referenced by edge; matches node ids: "
                     f"{', '.join(unique_matches)}"
                 )
-            if not settings.auto_create_missing_nodes:
+            if not compiled.auto_create_missing_nodes:
                 raise ValueError(f"Unknown node '{node_token}' referenced by edge")
-            return register_node(label=node_token), True
+            node_id = register_node(label=node_token).id
+            alias_index.add_local(scope_key, node_id, node_token)
+            return node_id, True
+
+        def resolve_endpoint(node_part: str, port_part: str | None) -> _Endpoint:
+            node_id, is_local = ensure_node(node_part)
+            if port_part is None:
+                return _Endpoint(node_id, None, is_local)
+            port_store = scope.ports if is_local else cross_scope_ports
+            port_id = _ensure_port(port_store, node_id=node_id, port_name=port_part)
+            return _Endpoint(node_id, port_id, is_local)
 
         for edge_raw in graph_data.links:
             edge = _as_edge(edge_raw)
-            for endpoint in (edge.source, edge.target):
-                node_part, port_part = split_endpoint(endpoint)
-                node_rec, is_local_node = ensure_node(node_part)
-                if port_part is None:
-                    continue
-                port_store = ports if is_local_node else cross_scope_ports
-                ensure_port(port_store, node_id=node_rec.id, port_name=port_part)
-
-        def build_node(node_rec: _NodeRecord) -> Node:
-            child_nodes: List[Node] = []
-            child_edges: List[Edge] = []
-            if node_rec.input_node and (node_rec.input_node.nodes or node_rec.input_node.links):
-                child_nodes, child_edges = build_scope(
-                    MinimalGraphIn(
-                        nodes=node_rec.input_node.nodes,
-                        links=node_rec.input_node.links,
-                    )
-                )
+            source_parts, target_parts = _edge_endpoints(edge)
+            source = resolve_endpoint(*source_parts)
+            target = resolve_endpoint(*target_parts)
+            scope.links.append(_ResolvedLink(edge, source, target))
+
+        for node_id, node in nested:
+            key = subtree_keys.key(node)
+            child_scope = resolved_subtrees.get(key)
+            if child_scope is None:
+                child_scope = resolve_scope(_scope_view(node), key)
+                resolved_subtrees[key] = child_scope
+            scope.children[node_id] = child_scope
+        return scope
+
+    root = resolve_scope(_scope_view(data), None)
+    return _ResolvedGraph(root=root, cross_scope_ports=cross_scope_ports)
+
+
+_NodePath = Tuple[str, ...]
+
+
+def _first_node_paths(root: _ResolvedScope) -> Dict[str, _NodePath]:
+    """Id path of the first node (in pre-order) carrying each node id.
+
+    Cross-scope endpoints only resolve to nodes with a unique alias, so this
+    is where a cross-scope ``_Endpoint`` points.
+    """
+    paths: Dict[str, _NodePath] = {}
+
+    def visit(scope: _ResolvedScope, prefix: _NodePath) -> None:
+        for node_id in scope.nodes:
+            path = prefix + (node_id,)
+            paths.setdefault(node_id, path)
+            child_scope = scope.children.get(node_id)
+            if child_scope is not None:
+                visit(child_scope, path)
+
+    visit(root, ())
+    return paths
+
+
+def _endpoint_path(endpoint: _Endpoint, prefix: _NodePath, paths: Dict[str, _NodePath]) -> _NodePath:
+    if endpoint.is_local:
+        return prefix + (endpoint.node_id,)
+    return paths[endpoint.node_id]
+
+
+def _collapse_graph(graph: _ResolvedGraph, max_depth: int) -> _ResolvedGraph:
+    """Cut a resolved graph below ``max_depth`` levels of nesting.
+
+    Top-level nodes are at depth 1.  Subgraph nodes at ``max_depth`` lose
+    their contents and become summary leaves carrying their child and
+    descendant node counts.  Endpoints inside a collapsed subgraph are rewired
+    to it: links declared inside one that reach outside are hoisted into the
+    collapsed node's scope, and links with both ends in the same collapsed
+    subgraph are dropped.
+    """
+    if max_depth < 1:
+        raise ValueError("max_depth must be at least 1.")
+    paths = _first_node_paths(graph.root)
+
+    def rewire(link: _ResolvedLink, declared_in: _NodePath, scope_prefix: _NodePath) -> _ResolvedLink | None:
+        endpoints = []
+        collapsed = []
+        for endpoint in (link.source, link.target):
+            path = _endpoint_path(endpoint, declared_in, paths)
+            if len(path) <= max_depth:
+                endpoints.append(endpoint)
+                continue
+            container = path[:max_depth]
+            collapsed.append(container)
+            endpoints.append(_Endpoint(container[-1], None, container[:-1] == scope_prefix))
+        if not collapsed:
+            return link
+        if len(collapsed) == 2 and collapsed[0] == collapsed[1]:
+            return None
+        return _ResolvedLink(link.edge, endpoints[0], endpoints[1])
+
+    def hoist(scope: _ResolvedScope, prefix: _NodePath, target: _ResolvedScope, target_prefix: _NodePath) -> int:
+        """Move the links of a hidden subtree into ``target``; return its node count."""
+        count = len(scope.nodes)
+        for link in scope.links:
+            rewired = rewire(link, prefix, target_prefix)
+            if rewired is not None:
+                target.links.append(rewired)
+        for node_id, child_scope in scope.children.items():
+            count += hoist(child_scope, prefix + (node_id,), target, target_prefix)
+        return count
+
+    def collapse(scope: _ResolvedScope, prefix: _NodePath) -> _ResolvedScope:
+        result = _ResolvedScope(nodes=scope.nodes, ports=scope.ports)
+        for link in scope.links:
+            rewired = rewire(link, prefix, prefix)
+            if rewired is not None:
+                result.links.append(rewired)
+        for node_id, child_scope in scope.children.items():
+            path = prefix + (node_id,)
+            if len(path) < max_depth:
+                result.children[node_id] = collapse(child_scope, path)
+                continue
+            descendants = hoist(child_scope, path, result, prefix)
+            result.summaries[node_id] = {
+                COLLAPSED_CHILDREN_KEY: len(child_scope.nodes),
+                COLLAPSED_DESCENDANTS_KEY: descendants,
+            }
+        return result
 
-            is_subgraph = bool(child_nodes or child_edges)
-            effective_type = "subgraph" if is_subgraph else node_rec.type
-            role_defaults = settings.subgraph_defaults if is_subgraph else settings.node_defaults
-            if role_defaults is None:
-                role_defaults = settings.node_defaults
-            defaults = type_overrides_lc.get(effective_type) or role_defaults
-            icon = type_icon_map_lc.get(effective_type, defaults.icon)
-
-            node_ports: List[Port] = []
-            merged_port_map: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
-            for port_key, port_data in ports.get(node_rec.id, OrderedDict()).items():
-                merged_port_map[port_key] = port_data
-            for port_key, port_data in cross_scope_ports.get(node_rec.id, OrderedDict()).items():
-                merged_port_map.setdefault(port_key, port_data)
-            for port_data in merged_port_map.values():
-                port_defaults = defaults.port
-                port_label_properties = _merge_properties(
-                    Properties(**port_defaults.label.properties),
-                    {},
-                )
-                port_label_width, port_label_height = _estimate_label_dimensions(
-                    text=port_data["label"],
-                    width=port_defaults.label.width,
-                    height=port_defaults.label.height,
-                    properties=port_label_properties,
-                    settings=settings,
-                )
-                port_label = PortLabel(
-                    text=port_data["label"],
-                    width=port_label_width,
-                    height=port_label_height,
-                    properties=port_label_properties,
-                )
-                node = Port(
-                    id=port_data["id"],
-                    width=port_defaults.width,
-                    height=port_defaults.height,
-                    labels=[port_label],
-                    properties=_merge_properties(
-                        Properties(**port_defaults.properties),
-                        {},
-                    ),
-                )
-                node_ports.append(node)
+    return _ResolvedGraph(root=collapse(graph.root, ()), cross_scope_ports=graph.cross_scope_ports)
+
+
+def _unique_edge_id(base_edge_id: str, edge_ids: Dict[str, int], used_ids: set[str]) -> str:
+    """Suffix repeated edge ids with an occurrence counter (``dup``, ``dup_2``, ...)."""
+    edge_id = base_edge_id
+    if edge_id in used_ids:
+        count = edge_ids.get(base_edge_id, 1)
+        while edge_id in used_ids:
+            count += 1
+            edge_id = f"{base_edge_id}_{count}"
+        edge_ids[base_edge_id] = count
+    used_ids.add(edge_id)
+    return edge_id
+
+
+class _ModelFactory:
+    """Creates the typed output models for :class:`_CanvasEmitter`.
+
+    By default models are created with ``model_construct``: every value comes
+    from validated settings or input and the emitter already guarantees the
+    uniqueness and sizing invariants checked by :class:`Node` and
+    :class:`Canvas`.  ``validate=True`` runs the full pydantic validators
+    instead, which is useful to cross-check the trusted path while debugging.
+    """
 
-            node_label_properties = _merge_properties(
-                Properties(**defaults.label.properties),
-                {},
+    def __init__(self, *, validate: bool = False) -> None:
+        self.validate = validate
+
+    def _create(self, model_cls: type[BaseModel], **fields: Any) -> Any:
+        if self.validate:
+            return model_cls(**fields)
+        return model_cls.model_construct(**fields)
+
+    def properties(self, values: Dict[str, Any]) -> Properties:
+        return self._create(Properties, **values)
+
+    @staticmethod
+    def clone(element: BaseModel) -> Any:
+        return element.model_copy(deep=True)
+
+    def node_label(self, text: str, width: float, height: float, properties: Dict[str, Any]) -> NodeLabel:
+        return self._create(
+            NodeLabel, text=text, width=width, height=height, properties=self.properties(properties)
+        )
+
+    def port_label(self, text: str, width: float, height: float, properties: Dict[str, Any]) -> PortLabel:
+        return self._create(
+            PortLabel, text=text, width=width, height=height, properties=self.properties(properties)
+        )
+
+    def edge_label(self, text: str, width: float, height: float, properties: Dict[str, Any]) -> EdgeLabel:
+        return self._create(
+            EdgeLabel, text=text, width=width, height=height, properties=self.properties(properties)
+        )
+
+    def port(
+        self,
+        *,
+        id: str,
+        width: float,
+        height: float,
+        labels: List[PortLabel],
+        properties: Dict[str, Any],
+    ) -> Port:
+        return self._create(
+            Port, id=id, width=width, height=height, labels=labels, properties=self.properties(properties)
+        )
+
+    def node(
+        self,
+        *,
+        id: str,
+        type: str,
+        icon: str | None,
+        width: float | None,
+        height: float | None,
+        labels: List[NodeLabel],
+        ports: List[Port],
+        children: List[Node],
+        edges: List[Edge],
+        properties: Dict[str, Any],
+    ) -> Node:
+        node_kwargs: Dict[str, Any] = {
+            "id": id,
+            "type": type,
+            "icon": icon,
+            "labels": labels,
+            "ports": ports,
+            "children": children,
+            "edges": edges,
+            "properties": self.properties(properties),
+        }
+        if width is not None or height is not None:
+            node_kwargs["width"] = width
+            node_kwargs["height"] = height
+        return self._create(Node, **node_kwargs)
+
+    def edge(
+        self,
+        *,
+        id: str,
+        type: str | None,
+        sources: List[str],
+        targets: List[str],
+        labels: List[EdgeLabel],
+        properties: Dict[str, Any],
+    ) -> Edge:
+        return self._create(
+            Edge,
+            id=id,
+            type=type,
+            sources=sources,
+            targets=targets,
+            labels=labels,
+            properties=self.properties(properties),
+        )
+
+    def canvas(self, *, layout_options: LayoutOptions, children: List[Node], edges: List[Edge]) -> Canvas:
+        return self._create(
+            Canvas,
+            id="canvas",
+            layoutOptions=layout_options.model_copy(),
+            children=children,
+            edges=edges,
+        )
+
+
+class _DictFactory:
+    """Creates plain ELK JSON dicts, matching ``model_dump(by_alias=True, exclude_none=True)``."""
+
+    @staticmethod
+    def properties(values: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in values.items() if value is not None}
+
+    @classmethod
+    def clone(cls, element: Any) -> Any:
+        """Copy the dicts and lists of an emitted element; leaves are immutable."""
+        if isinstance(element, dict):
+            return {key: cls.clone(value) for key, value in element.items()}
+        if isinstance(element, list):
+            return [cls.clone(value) for value in element]
+        return element
+
+    def label(self, text: str, width: float, height: float, properties: Dict[str, Any]) -> Dict[str, Any]:
+        return {"text": text, "width": width, "height": height, "properties": self.properties(properties)}
+
+    node_label = port_label = edge_label = label
+
+    def port(
+        self,
+        *,
+        id: str,
+        width: float,
+        height: float,
+        labels: List[Dict[str, Any]],
+        properties: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        return {
+            "id": id,
+            "width": width,
+            "height": height,
+            "labels": labels,
+            "properties": self.properties(properties),
+        }
+
+    def node(
+        self,
+        *,
+        id: str,
+        type: str,
+        icon: str | None,
+        width: float | None,
+        height: float | None,
+        labels: List[Dict[str, Any]],
+        ports: List[Dict[str, Any]],
+        children: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        properties: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        node: Dict[str, Any] = {"id": id, "type": type}
+        if icon is not None:
+            node["icon"] = icon
+        if width is not None:
+            node["width"] = width
+        if height is not None:
+            node["height"] = height
+        node["labels"] = labels
+        node["ports"] = ports
+        node["children"] = children
+        node["edges"] = edges
+        node["properties"] = self.properties(properties)
+        return node
+
+    def edge(
+        self,
+        *,
+        id: str,
+        type: str | None,
+        sources: List[str],
+        targets: List[str],
+        labels: List[Dict[str, Any]],
+        properties: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        edge: Dict[str, Any] = {"id": id}
+        if type is not None:
+            edge["type"] = type
+        edge["sources"] = sources
+        edge["targets"] = targets
+        edge["labels"] = labels
+        edge["properties"] = self.properties(properties)
+        return edge
+
+    def canvas(
+        self,
+        *,
+        layout_options: LayoutOptions,
+        children: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        return {
+            "id": "canvas",
+            "layoutOptions": layout_options.model_dump(by_alias=True, exclude_none=True),
+            "children": children,
+            "edges": edges,
+        }
+
+
+def _repeated_scopes(root: _ResolvedScope) -> Dict[int, int]:
+    """How often each shared scope is requested while emitting ``root``'s subtree.
+
+    Every distinct scope is emitted once (repeats are cloned), so a scope is
+    requested once per reference from a distinct parent scope.  Only scopes
+    requested more than once are returned.
+    """
+    references: Dict[int, int] = {}
+    seen = {id(root)}
+    pending = [root]
+    while pending:
+        scope = pending.pop()
+        for child in scope.children.values():
+            references[id(child)] = references.get(id(child), 0) + 1
+            if id(child) not in seen:
+                seen.add(id(child))
+                pending.append(child)
+    return {key: count for key, count in references.items() if count > 1}
+
+
+class _CanvasEmitter:
+    """Emission stage: turns a resolved graph into output objects via a factory."""
+
+    def __init__(
+        self,
+        graph: _ResolvedGraph,
+        compiled: CompiledSettings,
+        factory: "_ModelFactory | _DictFactory",
+    ) -> None:
+        self.graph = graph
+        self.compiled = compiled
+        self.factory = factory
+        self._repeats = _repeated_scopes(graph.root)
+        # Output of repeated scopes still to be handed out: (children, edges), occurrences left.
+        self._emitted: Dict[int, List[Any]] = {}
+
+    def canvas(self) -> Any:
+        children, edges = self.scope(self.graph.root)
+        return self.factory.canvas(
+            layout_options=self.compiled.layout_options,
+            children=children,
+            edges=edges,
+        )
+
+    def restrict(self, root: _ResolvedScope) -> None:
+        """Only emit ``root``'s subtree from now on (process pool workers)."""
+        self._repeats = _repeated_scopes(root)
+        self._emitted = {}
+
+    def scope(self, scope: _ResolvedScope) -> tuple[List[Any], List[Any]]:
+        """Children and edges of a scope.
+
+        A scope shared by repeated subtrees is emitted once; every occurrence
+        but the last gets a clone, and the last one takes the cached elements,
+        which releases them.
+        """
+        key = id(scope)
+        entry = self._emitted.get(key)
+        if entry is None:
+            emitted = (list(self.iter_nodes(scope)), list(self.iter_edges(scope)))
+            occurrences = self._repeats.get(key, 1)
+            if occurrences == 1:
+                return emitted
+            entry = self._emitted[key] = [emitted, occurrences]
+        entry[1] -= 1
+        children, edges = entry[0]
+        if entry[1] == 0:
+            del self._emitted[key]
+            return children, edges
+        clone = self.factory.clone
+        return [clone(child) for child in children], [clone(edge) for edge in edges]
+
+    def iter_nodes(self, scope: _ResolvedScope) -> Iterator[Any]:
+        for node_rec in scope.nodes.values():
+            yield self.node(node_rec, scope)
+
+    def node(self, node_rec: _NodeRecord, scope: _ResolvedScope) -> Any:
+        compiled = self.compiled
+        factory = self.factory
+        child_nodes: List[Any] = []
+        child_edges: List[Any] = []
+        child_scope = scope.children.get(node_rec.id)
+        if child_scope is not None:
+            child_nodes, child_edges = self.scope(child_scope)
+
+        is_subgraph = bool(child_nodes or child_edges)
+        template = compiled.node_template(node_rec.type, is_subgraph=is_subgraph)
+        port_template = template.port
+
+        node_ports: List[Any] = []
+        for port in self.node_ports(node_rec, scope):
+            port_label_width, port_label_height = _label_dimensions(
+                port_template.label, port.label, compiled
             )
-            node_label_width, node_label_height = _estimate_label_dimensions(
-                text=node_rec.label,
-                width=defaults.label.width,
-                height=defaults.label.height,
-                properties=node_label_properties,
-                settings=settings,
+            port_label = factory.port_label(
+                port.label,
+                port_label_width,
+                port_label_height,
+                port_template.label.properties,
             )
-            node_label = NodeLabel(
-                text=node_rec.label,
-                width=node_label_width,
-                height=node_label_height,
-                properties=node_label_properties,
+            node_ports.append(
+                factory.port(
+                    id=port.id,
+                    width=port_template.width,
+                    height=port_template.height,
+                    labels=[port_label],
+                    properties=port_template.properties,
+                )
             )
 
-            node_kwargs: Dict[str, Any] = {
-                "id": node_rec.id,
-                "type": effective_type,
-                "icon": icon,
-                "labels": [node_label],
-                "ports": node_ports,
-                "children": child_nodes,
-                "edges": child_edges,
-                "properties": _merge_properties(
-                    Properties(**defaults.properties),
-                    {},
-                ),
-            }
-            if not is_subgraph:
-                node_kwargs["width"] = defaults.width
-                node_kwargs["height"] = defaults.height
-            return Node(**node_kwargs)
-
-        scope_children: List[Node] = [build_node(node) for node in nodes.values()]
+        node_label_width, node_label_height = _label_dimensions(
+            template.label, node_rec.label, compiled
+        )
+        node_label = factory.node_label(
+            node_rec.label,
+            node_label_width,
+            node_label_height,
+            template.label.properties,
+        )
+        properties = template.properties
+        summary = scope.summaries.get(node_rec.id)
+        if summary is not None:
+            properties = {**properties, **summary}
+        return factory.node(
+            id=node_rec.id,
+            type=template.type,
+            icon=template.icon,
+            width=template.width,
+            height=template.height,
+            labels=[node_label],
+            ports=node_ports,
+            children=child_nodes,
+            edges=child_edges,
+            properties=properties,
+        )
 
+    def node_ports(self, node_rec: _NodeRecord, scope: _ResolvedScope) -> Collection[_Port]:
+        """Ports of a node: scope-local ports first, then cross-scope ones.
+
+        The registry's own collections are returned when only one of them has
+        ports for the node, so the common case copies nothing.
+        """
+        local = scope.ports.get(node_rec.id)
+        cross = self.graph.cross_scope_ports.get(node_rec.id)
+        if not cross:
+            return local.values() if local else ()
+        if not local:
+            return cross.values()
+        return [*local.values(), *(port for port_key, port in cross.items() if port_key not in local)]
+
+    def fallback_edge_id(self, scope: _ResolvedScope, link: _ResolvedLink) -> str:
+        """Id source for a link that has neither an ``id`` nor a ``label``.
+
+        With ``deterministic_edge_ids`` the id is derived from the resolved
+        endpoints (``edge_<source>_<target>``); repeated links between the same
+        endpoints get the usual occurrence suffix from :func:`_unique_edge_id`.
+        """
+        if self.compiled.deterministic_edge_ids:
+            return f"edge_{link.source.ref}_{link.target.ref}"
+        return _gen_id("edge")
+
+    def iter_edges(self, scope: _ResolvedScope) -> Iterator[Any]:
+        links = scope.links
         edge_ids: Dict[str, int] = {}
-        scope_edges: List[Edge] = []
-        for edge_raw in graph_data.links:
-            edge = _as_edge(edge_raw)
-            sources: List[str] = []
-            targets: List[str] = []
-            for endpoint, bucket in ((edge.source, sources), (edge.target, targets)):
-                node_part, port_part = split_endpoint(endpoint)
-                node_rec, is_local_node = ensure_node(node_part)
-                if port_part is None:
-                    bucket.append(node_rec.id)
-                    continue
-                port_store = ports if is_local_node else cross_scope_ports
-                port_id = ensure_port(port_store, node_id=node_rec.id, port_name=port_part)
-                bucket.append(port_id)
-
-            edge_id_source = edge.id or edge.label or _gen_id("edge")
-            base_edge_id = sanitize_id(edge_id_source)
-            if base_edge_id in edge_ids:
-                edge_ids[base_edge_id] += 1
-                edge_id = f"{base_edge_id}_{edge_ids[base_edge_id]}"
+        used_edge_ids: set[str] = set()
+
+        def edge_id(link: _ResolvedLink) -> str:
+            edge = link.edge
+            edge_id_source = edge.id or edge.label or self.fallback_edge_id(scope, link)
+            return _unique_edge_id(sanitize_id(edge_id_source), edge_ids, used_edge_ids)
+
+        if not self.compiled.bundles_edges:
+            # One pass, so ``scope.links`` may be a spilled sequence (see streaming.py).
+            for link in links:
+                yield self.edge(link, edge_id(link))
+            return
+        link_edge_ids = [edge_id(link) for link in links]
+        for members in self.edge_bundles(links):
+            first = members[0]
+            if len(members) == 1:
+                yield self.edge(links[first], link_edge_ids[first])
             else:
-                edge_ids[base_edge_id] = 1
-                edge_id = base_edge_id
-
-            edge_type_norm = (edge.type or "").strip().lower()
-            edge_defaults = edge_type_overrides_lc.get(edge_type_norm) or settings.edge_defaults
-            edge_labels: List[EdgeLabel] = []
-            if edge.label is not None:
-                edge_label_properties = _merge_properties(
-                    Properties(**edge_defaults.label.properties),
-                    {},
-                )
-                edge_label_width, edge_label_height = _estimate_label_dimensions(
-                    text=edge.label,
-                    width=edge_defaults.label.width,
-                    height=edge_defaults.label.height,
-                    properties=edge_label_properties,
-                    settings=settings,
-                )
-                edge_labels.append(
-                    EdgeLabel(
-                        text=edge.label,
-                        width=edge_label_width,
-                        height=edge_label_height,
-                        properties=edge_label_properties,
-                    )
-                )
-            scope_edges.append(
-                Edge(
-                    id=edge_id,
-                    type=edge.type,
-                    sources=sources,
-                    targets=targets,
-                    labels=edge_labels,
-                    properties=Properties(
-                        **normalize_graphrapids_edge_properties(
-                            _merge_properties(
-                                Properties(**edge.properties),
-                                edge_defaults.properties,
-                            ).model_dump(),
-                            apply_defaults=True,
-                        )
-                    ),
+                yield self.edge(links[first], link_edge_ids[first], [link_edge_ids[i] for i in members])
+
+    def edge_bundles(self, links: List[_ResolvedLink]) -> List[List[int]]:
+        """Group parallel links by their type's bundling rule.
+
+        Returns the link indices emitted as each edge, ordered by first member;
+        links without a rule, or in groups below ``min_members``, stay alone.
+        """
+        compiled = self.compiled
+        groups: Dict[Hashable, List[int]] = {}
+        bundles: List[List[int]] = []
+        for index, link in enumerate(links):
+            edge, source, target = link
+            rule = compiled.edge_template(edge.type).bundling
+            if rule is None:
+                bundles.append([index])
+                continue
+            edge_type = (edge.type or "").strip().lower()
+            if rule.match == "node":
+                key: Hashable = (edge_type, source.node_id, target.node_id)
+            else:
+                key = (edge_type, source.ref, target.ref)
+            members = groups.get(key)
+            if members is None:
+                members = groups[key] = []
+                bundles.append(members)
+            members.append(index)
+        result: List[List[int]] = []
+        for members in bundles:
+            rule = compiled.edge_template(links[members[0]].edge.type).bundling
+            if rule is not None and len(members) < rule.min_members:
+                result.extend([index] for index in members)
+            else:
+                result.append(members)
+        result.sort(key=lambda members: members[0])
+        return result
+
+    def edge(self, link: _ResolvedLink, edge_id: str, bundle: List[str] | None = None) -> Any:
+        """Emit one link, or a bundle of parallel links with member ids ``bundle``."""
+        compiled = self.compiled
+        factory = self.factory
+        edge, source, target = link
+        edge_template = compiled.edge_template(edge.type)
+        edge_labels: List[Any] = []
+        if edge.label is not None:
+            edge_label_width, edge_label_height = _label_dimensions(
+                edge_template.label, edge.label, compiled
+            )
+            edge_labels.append(
+                factory.edge_label(
+                    edge.label,
+                    edge_label_width,
+                    edge_label_height,
+                    edge_template.label.properties,
                 )
             )
+        if edge.properties:
+            # Both sides were validated already (settings and input models),
+            # so only the GraphRapids defaults remain to be filled in.
+            edge_properties = apply_graphrapids_edge_defaults(
+                {**edge_template.properties, **_edge_elk_properties(edge)}
+            )
+        else:
+            edge_properties = edge_template.default_properties
+        source_ref, target_ref = source.ref, target.ref
+        if bundle is not None:
+            edge_properties = {
+                **edge_properties,
+                BUNDLE_COUNT_KEY: len(bundle),
+                BUNDLE_MEMBERS_KEY: bundle,
+            }
+            if edge_template.bundling is not None and edge_template.bundling.match == "node":
+                source_ref, target_ref = source.node_id, target.node_id
+        return factory.edge(
+            id=edge_id,
+            type=edge.type,
+            sources=[source_ref],
+            targets=[target_ref],
+            labels=edge_labels,
+            properties=edge_properties,
+        )
 
-        return scope_children, scope_edges
 
-    canvas_children, canvas_edges = build_scope(data)
+_worker_emitter: "_CanvasEmitter | None" = None
+
+
+def _init_emit_worker(
+    graph: _ResolvedGraph,
+    compiled: CompiledSettings,
+    factory: "_ModelFactory | _DictFactory",
+) -> None:
+    global _worker_emitter
+    _worker_emitter = _CanvasEmitter(graph, compiled, factory)
+
+
+def _emit_subgraph(node_id: str) -> tuple[List[Any], List[Any]]:
+    """Pool task: emit the contents of one top-level subgraph."""
+    assert _worker_emitter is not None
+    scope = _worker_emitter.graph.root.children[node_id]
+    _worker_emitter.restrict(scope)
+    return _worker_emitter.scope(scope)
+
+
+class _ParallelEmitter(_CanvasEmitter):
+    """Emitter that builds the contents of top-level subgraphs in worker processes.
+
+    Resolution, including aliases and cross-scope ports, is finished before
+    the pool starts and every worker holds the resolved graph, so a task is
+    just a top-level node id.  The parent process emits the top-level nodes
+    and edges themselves, in declaration order, as subgraph results arrive.
+    """
+
+    def __init__(
+        self,
+        graph: _ResolvedGraph,
+        compiled: CompiledSettings,
+        factory: "_ModelFactory | _DictFactory",
+        executor: Executor,
+    ) -> None:
+        super().__init__(graph, compiled, factory)
+        self.executor = executor
+
+    def iter_nodes(self, scope: _ResolvedScope) -> Iterator[Any]:
+        if scope is not self.graph.root:
+            yield from super().iter_nodes(scope)
+            return
+        pending: Dict[int, Future] = {}
+        for node_id, child_scope in scope.children.items():
+            if id(child_scope) not in pending and id(child_scope) not in self._emitted:
+                pending[id(child_scope)] = self.executor.submit(_emit_subgraph, node_id)
+        for node_rec in scope.nodes.values():
+            child_scope = scope.children.get(node_rec.id)
+            if child_scope is not None and id(child_scope) in pending:
+                occurrences = self._repeats.get(id(child_scope), 1)
+                self._emitted[id(child_scope)] = [pending.pop(id(child_scope)).result(), occurrences]
+            yield self.node(node_rec, scope)
+
+
+@contextmanager
+def _canvas_emitter(
+    graph: _ResolvedGraph,
+    compiled: CompiledSettings,
+    factory: "_ModelFactory | _DictFactory",
+    max_workers: int | None,
+) -> Iterator[_CanvasEmitter]:
+    if max_workers is None or not graph.root.children:
+        yield _CanvasEmitter(graph, compiled, factory)
+        return
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_emit_worker,
+        initargs=(graph, compiled, factory),
+    ) as executor:
+        yield _ParallelEmitter(graph, compiled, factory, executor)
+
+
+def build_canvas(
+    data: MinimalGraphIn,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    validate: bool = False,
+    max_workers: int | None = None,
+    max_depth: int | None = None,
+) -> Canvas:
+    """Enrich a minimal graph into a typed ELK :class:`Canvas`.
+
+    Args:
+        data: Validated minimal input graph.
+        settings: Settings or pre-compiled settings; defaults to
+            :func:`sample_settings`.
+        validate: Run the full pydantic validators on every emitted model
+            instead of the trusted fast-construction path.  Both paths produce
+            the same canvas; this flag is meant for debugging.
+        max_workers: Emit the contents of top-level subgraphs in a process
+            pool of this size.  ``None`` (the default) builds everything in
+            the calling process.  Input resolution always runs in the calling
+            process first, so parallelism only pays off for graphs with
+            several large top-level subgraphs.  Workers use the default
+            :mod:`multiprocessing` start method of the platform.
+        max_depth: Only emit this many levels of nesting (top-level nodes are
+            level 1).  Deeper subgraphs are collapsed into summary leaf nodes
+            with ``graphloom.collapsed.children`` and
+            ``graphloom.collapsed.descendants`` counts, and links into them
+            are rewired to the collapsed node.  Expand one with
+            :func:`graphloom.expand_canvas`.
+
+    Raises:
+        ValueError: If node ids collide within a scope, an edge references an
+            ambiguous or (with auto-creation disabled) unknown node, or
+            ``max_depth`` is below 1.
+    """
+    compiled = _compiled_settings(settings)
+    graph = _resolve_graph(data, compiled)
+    if max_depth is not None:
+        graph = _collapse_graph(graph, max_depth)
+    with _canvas_emitter(graph, compiled, _ModelFactory(validate=validate), max_workers) as emitter:
+        return emitter.canvas()
+
+
+def build_canvas_dict(
+    data: MinimalGraphIn,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    max_workers: int | None = None,
+    max_depth: int | None = None,
+) -> Dict[str, Any]:
+    """Enrich a minimal graph directly into ELK JSON made of plain dicts and lists.
+
+    Produces the same payload as
+    ``build_canvas(data, settings).model_dump(by_alias=True, exclude_none=True)``
+    without creating the intermediate pydantic models.  ``max_workers`` and
+    ``max_depth`` work as in :func:`build_canvas`.
+    """
+    compiled = _compiled_settings(settings)
+    graph = _resolve_graph(data, compiled)
+    if max_depth is not None:
+        graph = _collapse_graph(graph, max_depth)
+    with _canvas_emitter(graph, compiled, _DictFactory(), max_workers) as emitter:
+        return emitter.canvas()
+
+
+_worker_batch: "Tuple[CompiledSettings, _ModelFactory | _DictFactory, int | None] | None" = None
+
+
+def _build_one(
+    data: MinimalGraphIn,
+    compiled: CompiledSettings,
+    factory: "_ModelFactory | _DictFactory",
+    max_depth: int | None,
+) -> Any:
+    graph = _resolve_graph(data, compiled)
+    if max_depth is not None:
+        graph = _collapse_graph(graph, max_depth)
+    return _CanvasEmitter(graph, compiled, factory).canvas()
+
+
+def _init_batch_worker(
+    compiled: CompiledSettings, factory: "_ModelFactory | _DictFactory", max_depth: int | None
+) -> None:
+    global _worker_batch
+    _worker_batch = (compiled, factory, max_depth)
+
+
+def _build_in_worker(data: MinimalGraphIn) -> Any:
+    """Pool task: build one graph of a batch with the worker's compiled settings."""
+    assert _worker_batch is not None
+    return _build_one(data, *_worker_batch)
+
+
+def _build_batch(
+    graphs: Iterable[MinimalGraphIn],
+    settings: ElkSettings | CompiledSettings | None,
+    factory: "_ModelFactory | _DictFactory",
+    max_workers: int | None,
+    max_depth: int | None,
+) -> List[Any]:
+    compiled = _compiled_settings(settings)
+    if max_workers is None:
+        return [_build_one(data, compiled, factory, max_depth) for data in graphs]
+    graphs = list(graphs)
+    if not graphs:
+        return []
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_batch_worker,
+        initargs=(compiled, factory, max_depth),
+    ) as executor:
+        chunksize = max(1, len(graphs) // (max_workers * 4))
+        return list(executor.map(_build_in_worker, graphs, chunksize=chunksize))
+
+
+def build_canvases(
+    graphs: Iterable[MinimalGraphIn],
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    validate: bool = False,
+    max_workers: int | None = None,
+    max_depth: int | None = None,
+) -> List[Canvas]:
+    """Build many graphs with one settings compilation.
+
+    Equivalent to ``[build_canvas(g, settings, validate=validate, max_depth=max_depth)
+    for g in graphs]`` except that ``settings`` is compiled once up front.
+
+    Args:
+        graphs: Validated minimal input graphs.
+        settings: Settings or pre-compiled settings shared by every graph.
+        validate: See :func:`build_canvas`.
+        max_workers: Build the graphs in a process pool of this size instead
+            of the calling process.  Results keep the input order.
+        max_depth: See :func:`build_canvas`.
+
+    Raises:
+        ValueError: As :func:`build_canvas`, for the first failing graph.
+    """
+    return _build_batch(graphs, settings, _ModelFactory(validate=validate), max_workers, max_depth)
+
+
+def build_canvas_dicts(
+    graphs: Iterable[MinimalGraphIn],
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    max_workers: int | None = None,
+    max_depth: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Like :func:`build_canvases`, producing :func:`build_canvas_dict` payloads."""
+    return _build_batch(graphs, settings, _DictFactory(), max_workers, max_depth)
+
+
+def _json_fragment(value: Any, indent: int | None, level: int) -> str:
+    text = codec.dumps(value, indent=indent)
+    if indent is None or level == 0:
+        return text
+    # JSON strings never contain raw newlines, so re-indenting line starts is safe.
+    return text.replace("\n", "\n" + " " * (indent * level))
+
+
+def _write_json_array(fp: TextIO, items: Iterable[Any], indent: int | None, level: int) -> None:
+    item_prefix = "\n" + " " * (indent * (level + 1)) if indent is not None else ""
+    wrote_item = False
+    for item in items:
+        if wrote_item:
+            fp.write(",")
+        else:
+            fp.write("[")
+            wrote_item = True
+        fp.write(item_prefix)
+        fp.write(_json_fragment(item, indent, level + 1))
+    if not wrote_item:
+        fp.write("[]")
+        return
+    if indent is not None:
+        fp.write("\n" + " " * (indent * level))
+    fp.write("]")
+
+
+def write_canvas_json(
+    data: MinimalGraphIn,
+    fp: TextIO,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    indent: int | None = 2,
+    max_workers: int | None = None,
+    max_depth: int | None = None,
+) -> None:
+    """Stream enriched ELK JSON to ``fp`` while the canvas is being built.
+
+    Each top-level child and edge is built as a plain dict, written and
+    released before the next one is built, so peak memory follows the largest
+    top-level scope instead of the whole payload.  The written text is
+    identical to ``graphloom.codec.dumps(build_canvas_dict(data, settings), indent=indent)``
+    (compact for ``indent=None``).
+    ``max_workers`` and ``max_depth`` work as in :func:`build_canvas`;
+    top-level children are still written in declaration order.
+    """
+    compiled = _compiled_settings(settings)
+    graph = _resolve_graph(data, compiled)
+    if max_depth is not None:
+        graph = _collapse_graph(graph, max_depth)
+    with _canvas_emitter(graph, compiled, _DictFactory(), max_workers) as emitter:
+        _write_canvas(fp, emitter, indent)
+
+
+def _write_canvas(fp: TextIO, emitter: _CanvasEmitter, indent: int | None) -> None:
+    graph = emitter.graph
+    layout_options = emitter.compiled.layout_options.model_dump(by_alias=True, exclude_none=True)
+
+    newline = "\n" + " " * indent if indent is not None else ""
+    colon = ": " if indent is not None else ":"
+    fp.write("{" + newline + '"id"' + colon + codec.dumps("canvas"))
+    fp.write("," + newline + '"layoutOptions"' + colon + _json_fragment(layout_options, indent, 1))
+    fp.write("," + newline + '"children"' + colon)
+    _write_json_array(fp, emitter.iter_nodes(graph.root), indent, 1)
+    fp.write("," + newline + '"edges"' + colon)
+    _write_json_array(fp, emitter.iter_edges(graph.root), indent, 1)
+    fp.write(("\n" if indent is not None else "") + "}")
+
+
+def _write_output(path: str | None, write: Callable[[IO[Any]], None], *, binary: bool = False) -> None:
+    """Call ``write`` with the output file, or stdout; ``binary`` opens the file in binary mode."""
+    if path:
+        with open(path, "wb") if binary else open(path, "w", encoding="utf-8") as f:
+            write(f)
+    else:
+        write(sys.stdout)
+        sys.stdout.write("\n")
 
-    return Canvas(
-        id="canvas",
-        layoutOptions=parent_layout,
-        children=canvas_children,
-        edges=canvas_edges,
-    )
 
 def _load_settings(path: str | None) -> ElkSettings:
     if not path:
@@ -670,8 +1608,8 @@ def _load_settings(path: str | None) -> ElkSettings:
         with open(path, "rb") as f:
             data = tomllib.load(f)
     elif path.endswith(".json"):
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = codec.loads(f.read())
     else:
         raise ValueError("Unsupported settings format; use .toml or .json")
     if "layout_options" in data and isinstance(data["layout_options"], dict):
@@ -707,11 +1645,27 @@ def _flatten_properties_blocks(config: Any) -> Any:
     return config
 
 
-def _load_input(path: str) -> MinimalGraphIn:
+def _yaml_loader(yaml: Any) -> Any:
+    """libyaml's ``CSafeLoader`` when PyYAML was built with it, else the pure-Python ``SafeLoader``."""
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_inputs(path: str, nodes: str | None = None) -> List[MinimalGraphIn]:
+    """Load the graphs in an input file: one per JSON file, YAML document or edge table.
+
+    ``nodes`` is an optional node table for CSV/TSV edge-list input.
+    """
+    from .tabular import TABLE_SUFFIXES, read_edge_table
+
+    if path.lower().endswith(TABLE_SUFFIXES):
+        return [read_edge_table(path, nodes=nodes)]
+    if nodes:
+        raise ValueError("A node table can only be combined with .csv or .tsv edge-list input")
+
     if path.endswith(".json"):
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return MinimalGraphIn.model_validate(data)
+        with open(path, "rb") as f:
+            data = codec.loads(f.read())
+        return [MinimalGraphIn.model_validate(data)]
 
     if path.endswith(".yaml") or path.endswith(".yml"):
         try:
@@ -721,22 +1675,144 @@ def _load_input(path: str) -> MinimalGraphIn:
                 "PyYAML is required for YAML input. Install dependencies with 'pip install -e .'."
             ) from exc
         with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        return MinimalGraphIn.model_validate(data)
+            documents = [doc for doc in yaml.load_all(f, Loader=_yaml_loader(yaml)) if doc is not None]
+        return [MinimalGraphIn.model_validate(doc) for doc in documents or [{}]]
+
+    raise ValueError("Unsupported input format; use .json, .yaml, .yml, .csv, or .tsv")
+
+
+def _load_input(path: str, nodes: str | None = None) -> MinimalGraphIn:
+    graphs = _load_inputs(path, nodes)
+    if len(graphs) > 1:
+        raise ValueError(f"Expected one graph in '{path}', found {len(graphs)} YAML documents")
+    return graphs[0]
 
-    raise ValueError("Unsupported input format; use .json, .yaml, or .yml")
+
+def _copy_to_output(output: str | None, path: str) -> None:
+    def copy(fp: TextIO) -> None:
+        with open(path, "r", encoding="utf-8") as src:
+            shutil.copyfileobj(src, fp)
+
+    _write_output(output, copy)
+
+
+def _main_batch(graphs: List[MinimalGraphIn], settings: ElkSettings, args: Any) -> int:
+    """CLI path for multi-document input: write a JSON array with one canvas per graph."""
+    compiled = compile_settings(settings)
+
+    def enriched() -> Iterator[Dict[str, Any]]:
+        if args.jobs is not None:
+            # One pool for the whole batch, building whole graphs in parallel.
+            if args.validate:
+                canvases = build_canvases(
+                    graphs, compiled, validate=True, max_workers=args.jobs, max_depth=args.max_depth
+                )
+                yield from (canvas.model_dump(by_alias=True, exclude_none=True) for canvas in canvases)
+            else:
+                yield from build_canvas_dicts(graphs, compiled, max_workers=args.jobs, max_depth=args.max_depth)
+            return
+        for data in graphs:
+            if args.validate:
+                canvas = build_canvas(data, compiled, validate=True, max_depth=args.max_depth)
+                yield canvas.model_dump(by_alias=True, exclude_none=True)
+            else:
+                yield build_canvas_dict(data, compiled, max_depth=args.max_depth)
+
+    if not args.layout:
+        if not args.enriched_output:
+            _write_output(args.output, lambda fp: _write_json_array(fp, enriched(), 2, 0))
+            return 0
+        with open(args.enriched_output, "w", encoding="utf-8") as f:
+            _write_json_array(f, enriched(), 2, 0)
+        _copy_to_output(args.output, args.enriched_output)
+        return 0
+
+    payloads = list(enriched())
+    if args.enriched_output:
+        with open(args.enriched_output, "wb") as f:
+            codec.dump(payloads, f, indent=2)
+    payloads = [
+        layout_with_elkjs(payload, mode=args.elkjs_mode, node_cmd=args.node_cmd) for payload in payloads
+    ]
+    _write_output(args.output, lambda fp: codec.dump(payloads, fp, indent=2), binary=True)
+    return 0
+
+
+def _main_stream(settings: ElkSettings, args: Any) -> int:
+    """CLI path for ``--stream``: build a large JSON input without loading it whole."""
+    from .streaming import write_canvas_json_stream
+
+    def write(fp: TextIO) -> None:
+        with open(args.input, "r", encoding="utf-8") as source:
+            write_canvas_json_stream(source, fp, settings)
+
+    if not args.enriched_output:
+        _write_output(args.output, write)
+        return 0
+    with open(args.enriched_output, "w", encoding="utf-8") as f:
+        write(f)
+    _copy_to_output(args.output, args.enriched_output)
+    return 0
 
 
 def main(argv: List[str] | None = None) -> int:
     import argparse
     parser = argparse.ArgumentParser(description="Enrich minimal graph JSON/YAML into ELK JSON.")
-    parser.add_argument("input", help="Path to minimal input JSON or YAML")
+    parser.add_argument(
+        "input",
+        help=(
+            "Path to minimal input JSON or YAML (multi-document YAML writes a JSON array of canvases), "
+            "or a CSV/TSV edge list"
+        ),
+    )
+    parser.add_argument(
+        "--nodes",
+        help="Node table (CSV/TSV with name, type, id columns) for edge-list input.",
+    )
     parser.add_argument("-o", "--output", help="Where to write ELK JSON (default: stdout)")
     parser.add_argument(
         "--enriched-output",
         help="Where to write enriched ELK JSON before optional --layout processing.",
     )
     parser.add_argument("-s", "--settings", help="Path to settings TOML/JSON (optional)")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read a JSON input incrementally and spill links to disk, for inputs too large for memory.",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Run full pydantic validation on every emitted model (debug aid; slower).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Build top-level subgraphs in this many worker processes (default: in-process).",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Collapse subgraphs nested deeper than this many levels into summary nodes.",
+    )
+    parser.add_argument(
+        "--seed",
+        action="append",
+        default=[],
+        help="Only build the view around this node name/id (repeatable).",
+    )
+    parser.add_argument(
+        "--hops",
+        type=int,
+        default=0,
+        help="Number of links to follow outward from --seed nodes (default: 0).",
+    )
+    parser.add_argument(
+        "--node-type",
+        action="append",
+        help="Only build nodes of this type, plus their containers (repeatable).",
+    )
     parser.add_argument(
         "--layout",
         action="store_true",
@@ -754,27 +1830,77 @@ def main(argv: List[str] | None = None) -> int:
         help="Node.js executable used by --layout (default: node).",
     )
     args = parser.parse_args(argv)
+    if args.hops and not args.seed:
+        parser.error("--hops requires --seed")
+    if args.stream:
+        if not args.input.endswith(".json"):
+            parser.error("--stream requires a .json input")
+        conflicts = [
+            flag
+            for flag, used in (
+                ("--layout", args.layout),
+                ("--validate", args.validate),
+                ("--jobs", args.jobs is not None),
+                ("--max-depth", args.max_depth is not None),
+                ("--seed", bool(args.seed)),
+                ("--node-type", bool(args.node_type)),
+                ("--nodes", bool(args.nodes)),
+            )
+            if used
+        ]
+        if conflicts:
+            parser.error(f"--stream cannot be combined with {', '.join(conflicts)}")
+        return _main_stream(_load_settings(args.settings), args)
 
-    data = _load_input(args.input)
+    graphs = _load_inputs(args.input, args.nodes)
     settings = _load_settings(args.settings)
-    canvas = build_canvas(data, settings)
-    enriched_payload = canvas.model_dump(by_alias=True, exclude_none=True)
-    if args.enriched_output:
+    if args.seed or args.node_type:
+        from .views import extract_view
+
+        graphs = [
+            extract_view(data, settings, seeds=args.seed, hops=args.hops, node_types=args.node_type)
+            for data in graphs
+        ]
+    if len(graphs) > 1:
+        return _main_batch(graphs, settings, args)
+    data = graphs[0]
+
+    if not args.layout and not args.validate:
+        # Nothing needs the whole payload in memory: stream it straight out.
+        if not args.enriched_output:
+            _write_output(
+                args.output,
+                lambda fp: write_canvas_json(
+                    data, fp, settings, max_workers=args.jobs, max_depth=args.max_depth
+                ),
+            )
+            return 0
         with open(args.enriched_output, "w", encoding="utf-8") as f:
-            f.write(json.dumps(enriched_payload, indent=2))
+            write_canvas_json(data, f, settings, max_workers=args.jobs, max_depth=args.max_depth)
+        _copy_to_output(args.output, args.enriched_output)
+        return 0
+
+    if args.validate:
+        canvas = build_canvas(
+            data, settings, validate=True, max_workers=args.jobs, max_depth=args.max_depth
+        )
+        payload = canvas.model_dump(by_alias=True, exclude_none=True)
+    else:
+        payload = build_canvas_dict(data, settings, max_workers=args.jobs, max_depth=args.max_depth)
+    if args.enriched_output:
+        with open(args.enriched_output, "wb") as f:
+            codec.dump(payload, f, indent=2)
 
-    payload = enriched_payload
     if args.layout:
         payload = layout_with_elkjs(payload, mode=args.elkjs_mode, node_cmd=args.node_cmd)
-    output = json.dumps(payload, indent=2)
-
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output)
-    else:
-        print(output)
+    _write_output(args.output, lambda fp: codec.dump(payload, fp, indent=2), binary=True)
     return 0
 
 
 if __name__ == "__main__":  # pragma: no cover
-    raise SystemExit(main())
+    # ``python -m graphloom.builder`` runs this file as ``__main__``; run the
+    # importable module instead, whose classes the other modules share
+    # (e.g. ``_EdgeRow`` rows from ``graphloom.tabular``).
+    from graphloom.builder import main as _main
+
+    raise SystemExit(_main())
@@ -0,0 +1,186 @@
+"""JSON encoding and decoding through the fastest installed backend.
+
+``orjson`` is preferred, then ``msgspec``, then the standard library.  Every
+backend writes the text of ``json.dumps`` (ASCII, ``\\uXXXX`` escapes) in one
+of two layouts:
+
+- compact (``indent=None``): no whitespace, ``separators=(",", ":")``;
+- indented: ``json.dumps(value, indent=indent)`` layout.
+
+The fast backends only encode; their output is checked and the standard
+library is used instead whenever it could differ: for non-ASCII text,
+``null`` (also written for NaN and Infinity), floats that ``repr`` writes
+with an exponent, and values a backend cannot encode at all (integers beyond
+64 bits, non-string keys, ``indent`` other than 2 for orjson, any indent for
+msgspec).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import re
+from typing import IO, Any, Callable
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+JSONDecodeError = json.JSONDecodeError
+
+_Encode = Callable[[Any, "int | None", bool], "bytes | None"]
+_Loads = Callable[["str | bytes"], Any]
+
+# Values in fast-backend output that ``json.dumps`` writes differently:
+# ``null`` (also NaN/Infinity), numbers with an exponent and decimals that
+# ``repr`` writes with one (orjson writes 1e-5 as ``0.00001``).  Candidates
+# are found with literal-led searches, which stay fast on large outputs, and
+# only count at the start of a value (after ``[``, ``,``, ``:`` or nothing),
+# so ids such as ``edge_cb0467e9`` never trigger the fallback.
+_EXPONENTS = (re.compile(rb"e[-+0-9]"), re.compile(rb"E[-+0-9]"))
+_NULL = re.compile(rb"null")
+_TINY = re.compile(rb"0\.0000")
+_NUMBER_BYTES = frozenset(b"-+.0123456789")
+_VALUE_STARTS = frozenset(b"[,:")
+
+
+def _starts_value(data: bytes, pos: int) -> bool:
+    pos -= 1
+    while pos >= 0 and data[pos] in b" \n":
+        pos -= 1
+    return pos < 0 or data[pos] in _VALUE_STARTS
+
+
+def _has_unsafe_value(data: bytes) -> bool:
+    for pattern in _EXPONENTS:
+        for match in pattern.finditer(data):
+            end = start = match.start()
+            while start and data[start - 1] in _NUMBER_BYTES:
+                start -= 1
+            if start < end and _starts_value(data, start):
+                return True
+    for match in _TINY.finditer(data):
+        start = match.start()
+        if start and data[start - 1] == ord("-"):
+            start -= 1
+        if _starts_value(data, start):
+            return True
+    return any(_starts_value(data, match.start()) for match in _NULL.finditer(data))
+
+
+def _separators(indent: int | None) -> tuple[str, str] | None:
+    return (",", ":") if indent is None else None
+
+
+def _json_dumps(value: Any, indent: int | None, sort_keys: bool) -> str:
+    return json.dumps(value, indent=indent, sort_keys=sort_keys, separators=_separators(indent))
+
+
+def _checked(data: bytes) -> bytes | None:
+    # ``json.dumps`` escapes non-ASCII characters and DEL.
+    if not data.isascii() or b"\x7f" in data or _has_unsafe_value(data):
+        return None
+    return data
+
+
+def _orjson_encode(value: Any, indent: int | None, sort_keys: bool) -> bytes | None:
+    if indent not in (None, 2):
+        return None
+    option = orjson.OPT_SORT_KEYS if sort_keys else 0
+    if indent == 2:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return _checked(orjson.dumps(value, option=option))
+    except TypeError:
+        return None
+
+
+def _msgspec_encode(value: Any, indent: int | None, sort_keys: bool) -> bytes | None:
+    if indent is not None:
+        return None
+    try:
+        return _checked(msgspec.json.encode(value, order="sorted" if sort_keys else None))
+    except (TypeError, OverflowError, msgspec.EncodeError):
+        return None
+
+
+def _msgspec_loads(data: str | bytes) -> Any:
+    try:
+        return msgspec.json.decode(data)
+    except msgspec.DecodeError as exc:
+        text = data if isinstance(data, str) else data.decode("utf-8", "replace")
+        raise JSONDecodeError(str(exc), text, 0) from exc
+
+
+_BACKENDS: dict[str, tuple[_Encode | None, _Loads]] = {"json": (None, json.loads)}
+if msgspec is not None:
+    _BACKENDS["msgspec"] = (_msgspec_encode, _msgspec_loads)
+if orjson is not None:
+    _BACKENDS["orjson"] = (_orjson_encode, orjson.loads)
+
+_PREFERENCE = ("orjson", "msgspec", "json")
+
+backend = "json"
+_encode, _loads = _BACKENDS[backend]
+
+
+def set_backend(name: str | None = None) -> str:
+    """Select the JSON backend by name, or the preferred installed one for ``None``.
+
+    Returns the selected backend name.
+
+    Raises:
+        ValueError: If ``name`` is not installed.
+    """
+    global backend, _encode, _loads
+    if name is None:
+        name = next(candidate for candidate in _PREFERENCE if candidate in _BACKENDS)
+    if name not in _BACKENDS:
+        available = ", ".join(sorted(_BACKENDS))
+        raise ValueError(f"JSON backend '{name}' is not available; installed: {available}")
+    backend = name
+    _encode, _loads = _BACKENDS[name]
+    return name
+
+
+set_backend()
+
+
+def dumps(value: Any, *, indent: int | None = None, sort_keys: bool = False) -> str:
+    """Encode ``value`` as JSON text, compact unless ``indent`` is given."""
+    data = _encode(value, indent, sort_keys) if _encode is not None else None
+    if data is None:
+        return _json_dumps(value, indent, sort_keys)
+    return data.decode("ascii")
+
+
+def dump(value: Any, fp: IO[Any], *, indent: int | None = None, sort_keys: bool = False) -> None:
+    """Write ``dumps(value, ...)`` to a text or binary stream ``fp``.
+
+    Binary streams receive the fast backends' bytes as-is, without an
+    intermediate ``str``; the standard library writes text streams in chunks.
+    """
+    binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase))
+    data = _encode(value, indent, sort_keys) if _encode is not None else None
+    if data is not None:
+        fp.write(data if binary else data.decode("ascii"))
+    elif binary:
+        fp.write(_json_dumps(value, indent, sort_keys).encode("ascii"))
+    else:
+        json.dump(value, fp, indent=indent, sort_keys=sort_keys, separators=_separators(indent))
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode JSON text or UTF-8 bytes.
+
+    Raises:
+        JSONDecodeError: If ``data`` is not valid JSON (``json.JSONDecodeError``
+            for every backend).
+    """
+    return _loads(data)
@@ -0,0 +1,291 @@
+"""Settings compiled into ready-to-emit node, port and edge templates.
+
+Everything :func:`graphloom.builder.build_canvas` needs from
+:class:`~graphloom.settings.ElkSettings` only depends on the settings plus the
+node or edge type.  :func:`compile_settings` resolves ``type_overrides``,
+``subgraph_defaults``, ``edge_type_overrides`` and ``type_icon_map`` once per
+role and type so the builder does not repeat the same merge for every element.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Tuple
+
+from pydantic import BaseModel
+
+from .edge_properties import normalize_graphrapids_edge_properties
+from .options import (
+    EdgeLayoutOptions,
+    LabelLayoutOptions,
+    LayoutOptions,
+    NodeLayoutOptions,
+    ParentLayoutOptions,
+    PortLayoutOptions,
+)
+from .settings import EdgeBundling, EdgeDefaults, ElkSettings, LabelDefaults, NodeDefaults, PortDefaults, SubgraphDefaults
+
+FONT_NAME_KEY = "org.eclipse.elk.font.name"
+FONT_SIZE_KEY = "org.eclipse.elk.font.size"
+
+
+def _layout_aliases(model_cls: type[BaseModel]) -> set[str]:
+    return {f.alias or name for name, f in model_cls.model_fields.items()}
+
+
+def _elk_option_identifiers() -> set[str]:
+    return {
+        *_layout_aliases(ParentLayoutOptions),
+        *_layout_aliases(NodeLayoutOptions),
+        *_layout_aliases(EdgeLayoutOptions),
+        *_layout_aliases(PortLayoutOptions),
+        *_layout_aliases(LabelLayoutOptions),
+    }
+
+
+_ELK_OPTION_IDENTIFIERS = _elk_option_identifiers()
+
+
+def _normalize_properties(data: Dict[str, Any]) -> Dict[str, Any]:
+    if not data:
+        return {}
+    normalized: Dict[str, Any] = {}
+
+    # Preserve long-form keys first
+    for key, value in data.items():
+        if key.startswith("org.eclipse.elk."):
+            normalized[key] = value
+
+    # Map short-form keys to long-form when possible
+    for key, value in data.items():
+        if key.startswith("org.eclipse.elk."):
+            continue
+        long_key = f"org.eclipse.elk.{key}"
+        if long_key in _ELK_OPTION_IDENTIFIERS:
+            normalized.setdefault(long_key, value)
+        else:
+            normalized[key] = value
+
+    return normalized
+
+
+def _canvas_layout_options(options: Dict[str, Any]) -> LayoutOptions:
+    disallowed = sorted(key for key in options if key not in _ELK_OPTION_IDENTIFIERS)
+    if disallowed:
+        disallowed_list = ", ".join(disallowed)
+        raise ValueError(f"Unknown layout option identifiers: {disallowed_list}")
+    return LayoutOptions(**options)
+
+
+def _label_font(properties: Mapping[str, Any]) -> Tuple[str, float] | None:
+    """Return ``(font name, font size)`` when both are usable for size estimation."""
+    font_name = properties.get(FONT_NAME_KEY)
+    font_size_value = properties.get(FONT_SIZE_KEY)
+    if not isinstance(font_name, str) or not font_name.strip():
+        return None
+
+    try:
+        font_size = float(font_size_value)
+    except (TypeError, ValueError):
+        return None
+    if font_size <= 0:
+        return None
+    return font_name, font_size
+
+
+@dataclass(frozen=True)
+class LabelTemplate:
+    width: float
+    height: float
+    properties: Dict[str, Any]
+    font: Tuple[str, float] | None = None
+
+
+@dataclass(frozen=True)
+class PortTemplate:
+    width: float
+    height: float
+    label: LabelTemplate
+    properties: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class NodeTemplate:
+    """Resolved defaults for one node role and type.
+
+    ``width`` and ``height`` are ``None`` for subgraph templates because
+    subgraph nodes are sized by ELK from their children.
+    """
+
+    type: str
+    icon: str | None
+    width: float | None
+    height: float | None
+    label: LabelTemplate
+    port: PortTemplate
+    properties: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class EdgeTemplate:
+    """Resolved defaults for one edge type.
+
+    ``properties`` is the normalized merge base for links that carry their own
+    properties; ``default_properties`` is the final payload for links that do not.
+    ``bundling`` is the parallel-edge rule for the type, if any.
+    """
+
+    label: LabelTemplate
+    properties: Dict[str, Any]
+    default_properties: Dict[str, Any]
+    bundling: EdgeBundling | None = None
+
+
+def _compile_label(defaults: LabelDefaults) -> LabelTemplate:
+    properties = _normalize_properties(dict(defaults.properties))
+    return LabelTemplate(
+        width=defaults.width,
+        height=defaults.height,
+        properties=properties,
+        font=_label_font(properties),
+    )
+
+
+def _compile_port(defaults: PortDefaults) -> PortTemplate:
+    return PortTemplate(
+        width=defaults.width,
+        height=defaults.height,
+        label=_compile_label(defaults.label),
+        properties=_normalize_properties(dict(defaults.properties)),
+    )
+
+
+def _compile_edge(defaults: EdgeDefaults) -> EdgeTemplate:
+    properties = _normalize_properties(dict(defaults.properties))
+    return EdgeTemplate(
+        label=_compile_label(defaults.label),
+        properties=properties,
+        default_properties=normalize_graphrapids_edge_properties(properties, apply_defaults=True),
+        bundling=defaults.bundling,
+    )
+
+
+@dataclass(frozen=True)
+class CompiledSettings:
+    """:class:`ElkSettings` resolved once into per-role and per-type templates.
+
+    Build one with :func:`compile_settings` and pass it to ``build_canvas`` in
+    place of the settings to reuse the templates across builds.  The compiled
+    object is a snapshot: it keeps a deep copy of the settings, so later
+    changes to the source settings are not picked up, neither by the flags
+    nor by templates resolved on first use.
+
+    Attributes:
+        settings: Private copy of the source settings; treat as read-only.
+        layout_options: Validated canvas-level layout options.
+    """
+
+    settings: ElkSettings
+    layout_options: LayoutOptions
+    _type_overrides: Dict[str, NodeDefaults] = field(repr=False)
+    _type_icon_map: Dict[str, str] = field(repr=False)
+    _edge_type_overrides: Dict[str, EdgeDefaults] = field(repr=False)
+    _node_templates: Dict[Tuple[bool, str], NodeTemplate] = field(default_factory=dict, repr=False)
+    _edge_templates: Dict[str, EdgeTemplate] = field(default_factory=dict, repr=False)
+
+    @property
+    def default_node_type(self) -> str:
+        return self.settings.node_defaults.type
+
+    @property
+    def auto_create_missing_nodes(self) -> bool:
+        return self.settings.auto_create_missing_nodes
+
+    @property
+    def estimate_label_size_from_font(self) -> bool:
+        return self.settings.estimate_label_size_from_font
+
+    @property
+    def deterministic_edge_ids(self) -> bool:
+        return self.settings.deterministic_edge_ids
+
+    @property
+    def bundles_edges(self) -> bool:
+        """Whether any edge type has a parallel-edge bundling rule."""
+        return self.settings.edge_defaults.bundling is not None or any(
+            defaults.bundling is not None for defaults in self._edge_type_overrides.values()
+        )
+
+    def node_template(self, node_type: str, *, is_subgraph: bool) -> NodeTemplate:
+        """Return the template for a lowercased node type in the given role.
+
+        Subgraph nodes always use the ``"subgraph"`` type; ``node_type`` is only
+        consulted for leaf nodes.
+        """
+        effective_type = "subgraph" if is_subgraph else node_type
+        key = (is_subgraph, effective_type)
+        template = self._node_templates.get(key)
+        if template is None:
+            template = self._compile_node(effective_type, is_subgraph=is_subgraph)
+            self._node_templates[key] = template
+        return template
+
+    def edge_template(self, edge_type: str | None) -> EdgeTemplate:
+        edge_type_norm = (edge_type or "").strip().lower()
+        template = self._edge_templates.get(edge_type_norm)
+        if template is None:
+            defaults = self._edge_type_overrides.get(edge_type_norm) or self.settings.edge_defaults
+            template = _compile_edge(defaults)
+            self._edge_templates[edge_type_norm] = template
+        return template
+
+    def _compile_node(self, effective_type: str, *, is_subgraph: bool) -> NodeTemplate:
+        role_defaults: NodeDefaults | SubgraphDefaults | None = (
+            self.settings.subgraph_defaults if is_subgraph else self.settings.node_defaults
+        )
+        if role_defaults is None:
+            role_defaults = self.settings.node_defaults
+        defaults = self._type_overrides.get(effective_type) or role_defaults
+        return NodeTemplate(
+            type=effective_type,
+            icon=self._type_icon_map.get(effective_type, defaults.icon),
+            width=None if is_subgraph else defaults.width,
+            height=None if is_subgraph else defaults.height,
+            label=_compile_label(defaults.label),
+            port=_compile_port(defaults.port),
+            properties=_normalize_properties(dict(defaults.properties)),
+        )
+
+
+def compile_settings(settings: ElkSettings) -> CompiledSettings:
+    """Resolve ``settings`` into a :class:`CompiledSettings`.
+
+    ``settings`` is deep-copied first.  Templates for the default node type,
+    every overridden or icon-mapped node type, the subgraph role and every
+    edge type override are resolved eagerly; other types are resolved on first
+    use from the copy and cached.
+
+    Raises:
+        ValueError: If ``layout_options`` contains unknown identifiers or edge
+            defaults carry invalid GraphRapids edge properties.
+    """
+    settings = settings.model_copy(deep=True)
+    compiled = CompiledSettings(
+        settings=settings,
+        layout_options=_canvas_layout_options(settings.layout_options),
+        _type_overrides={k.lower(): v for k, v in settings.type_overrides.items()},
+        _type_icon_map={k.lower(): v for k, v in settings.type_icon_map.items()},
+        _edge_type_overrides={k.lower(): v for k, v in settings.edge_type_overrides.items()},
+    )
+    leaf_types = {
+        settings.node_defaults.type.lower(),
+        *compiled._type_overrides,
+        *compiled._type_icon_map,
+    }
+    for leaf_type in leaf_types:
+        compiled.node_template(leaf_type, is_subgraph=False)
+    compiled.node_template("subgraph", is_subgraph=True)
+    compiled.edge_template(None)
+    for edge_type in compiled._edge_type_overrides:
+        compiled.edge_template(edge_type)
+    return compiled
@@ -9,6 +9,14 @@ EDGE_MARKER_END_KEY = "graphrapids.edge.marker_end"
 EDGE_STYLE_KEY = "graphrapids.edge.style"
 
 
+def apply_graphrapids_edge_defaults(properties: dict[str, Any]) -> dict[str, Any]:
+    """Fill in missing GraphRapids marker/style keys in place, without re-validating."""
+    properties.setdefault(EDGE_MARKER_START_KEY, EdgeMarker.NONE.value)
+    properties.setdefault(EDGE_MARKER_END_KEY, EdgeMarker.NONE.value)
+    properties.setdefault(EDGE_STYLE_KEY, EdgeStyle.SOLID.value)
+    return properties
+
+
 def normalize_graphrapids_edge_properties(
     properties: dict[str, Any] | None,
     *,
@@ -17,9 +25,7 @@ def normalize_graphrapids_edge_properties(
     normalized = dict(properties or {})
 
     if apply_defaults:
-        normalized.setdefault(EDGE_MARKER_START_KEY, EdgeMarker.NONE.value)
-        normalized.setdefault(EDGE_MARKER_END_KEY, EdgeMarker.NONE.value)
-        normalized.setdefault(EDGE_STYLE_KEY, EdgeStyle.SOLID.value)
+        apply_graphrapids_edge_defaults(normalized)
 
     _validate_and_normalize_enum_value(normalized, EDGE_MARKER_START_KEY, EdgeMarker)
     _validate_and_normalize_enum_value(normalized, EDGE_MARKER_END_KEY, EdgeMarker)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 import subprocess
 from pathlib import Path
 from typing import Any, Dict
 
+from . import codec
+
 _ELKJS_NPM_SPEC = "elkjs@0.11.0"
 
 _ELKJS_LAYOUT_SCRIPT = r"""
@@ -52,8 +53,8 @@ def _installed_elkjs_version(module_dir: Path) -> str:
     if not package_json.exists():
         return ""
     try:
-        data = json.loads(package_json.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+        data = codec.loads(package_json.read_text(encoding="utf-8"))
+    except codec.JSONDecodeError:
         return ""
     version = data.get("version")
     return str(version) if version else ""
@@ -66,7 +67,7 @@ def _ensure_elkjs_npm_workspace() -> Path:
     package_json = workspace / "package.json"
     if not package_json.exists():
         package_json.write_text(
-            json.dumps(
+            codec.dumps(
                 {
                     "name": "graphloom-elkjs-cache",
                     "private": True,
@@ -89,6 +90,7 @@ def _ensure_elkjs_npm_workspace() -> Path:
             cwd=str(workspace),
             capture_output=True,
             text=True,
+            encoding="utf-8",
             check=False,
         )
     except FileNotFoundError as exc:
@@ -133,7 +135,7 @@ def layout_with_elkjs(
     run_cwd: str | None = None
     if mode in {"npm", "npx"}:
         run_cwd = str(_ensure_elkjs_npm_workspace())
-    payload = json.dumps(graph)
+    payload = codec.dumps(graph)
     try:
         proc = subprocess.run(
             cmd,
@@ -141,6 +143,7 @@ def layout_with_elkjs(
             input=payload,
             capture_output=True,
             text=True,
+            encoding="utf-8",
             check=False,
         )
     except FileNotFoundError as exc:
@@ -159,7 +162,7 @@ def layout_with_elkjs(
         )
 
     try:
-        raw = json.loads(proc.stdout)
-    except json.JSONDecodeError as exc:
+        raw = codec.loads(proc.stdout)
+    except codec.JSONDecodeError as exc:
         raise RuntimeError("elkjs returned non-JSON output.") from exc
     return _strip_elkjs_internal_fields(raw)
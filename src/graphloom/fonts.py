@@ -0,0 +1,101 @@
+"""Per-glyph advance widths for label size estimation.
+
+Widths are the ``WX`` advances (1/1000 em) of the printable ASCII glyphs in
+Adobe's Core14 AFM files ``Helvetica.afm``, ``Times-Roman.afm`` and
+``Courier.afm`` (Copyright (c) 1985-1997 Adobe Systems Incorporated; see
+THIRD_PARTY_NOTICES.md for the notices and license).  Arial and its
+metric-compatible clones share Helvetica's advances, Times New Roman shares
+Times-Roman's, and Courier is monospaced.  Fonts that are not listed here
+keep the flat per-character estimate used by the builder.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+
+_FIRST_CODEPOINT = 0x20
+
+# Advances for U+0020..U+007E, 16 code points per row.
+_HELVETICA_WIDTHS: Tuple[int, ...] = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,  # 0x20
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,  # 0x30
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,  # 0x40
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,  # 0x50
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,  # 0x60
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,  # 0x70
+)
+
+_TIMES_WIDTHS: Tuple[int, ...] = (
+    250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333, 250, 278,  # 0x20
+    500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 278, 278, 564, 564, 564, 444,  # 0x30
+    921, 722, 667, 667, 722, 611, 556, 722, 722, 333, 389, 722, 611, 889, 722, 722,  # 0x40
+    556, 722, 667, 556, 611, 722, 722, 944, 722, 722, 611, 333, 278, 333, 469, 500,  # 0x50
+    333, 444, 500, 444, 500, 444, 333, 500, 500, 278, 278, 500, 278, 778, 500, 500,  # 0x60
+    500, 500, 333, 389, 278, 500, 500, 722, 500, 500, 444, 480, 200, 480, 541,  # 0x70
+)
+
+_COURIER_WIDTHS: Tuple[int, ...] = (600,) * len(_HELVETICA_WIDTHS)
+
+# Glyphs outside the tables (non-ASCII text) use the legacy flat estimate.
+_FALLBACK_ADVANCE = 0.6
+
+
+@dataclass(frozen=True)
+class FontMetrics:
+    """Advance widths of one font, in em units."""
+
+    advances: Dict[str, float]
+    fallback_advance: float = _FALLBACK_ADVANCE
+
+    def text_width(self, line: str) -> float:
+        """Width of a single line of text in em units."""
+        advances = self.advances
+        fallback = self.fallback_advance
+        return sum(advances.get(char, fallback) for char in line)
+
+
+def _metrics(widths: Tuple[int, ...]) -> FontMetrics:
+    return FontMetrics(
+        advances={chr(_FIRST_CODEPOINT + offset): width / 1000 for offset, width in enumerate(widths)}
+    )
+
+
+_HELVETICA = _metrics(_HELVETICA_WIDTHS)
+_TIMES = _metrics(_TIMES_WIDTHS)
+_COURIER = _metrics(_COURIER_WIDTHS)
+
+_FONT_FAMILIES: Dict[str, FontMetrics] = {
+    "arial": _HELVETICA,
+    "arimo": _HELVETICA,
+    "helvetica": _HELVETICA,
+    "liberation sans": _HELVETICA,
+    "sans-serif": _HELVETICA,
+    "times": _TIMES,
+    "times new roman": _TIMES,
+    "times-roman": _TIMES,
+    "liberation serif": _TIMES,
+    "tinos": _TIMES,
+    "serif": _TIMES,
+    "courier": _COURIER,
+    "courier new": _COURIER,
+    "cousine": _COURIER,
+    "liberation mono": _COURIER,
+    "monospace": _COURIER,
+}
+
+
+@lru_cache(maxsize=256)
+def font_metrics(font_name: str) -> FontMetrics | None:
+    """Return metrics for a font name or CSS-style family list, if known.
+
+    ``"Arial"``, ``"'Segoe UI', Arial, sans-serif"`` and similar names
+    resolve to the first listed family with a table; unknown fonts return
+    ``None``.
+    """
+    for family in font_name.split(","):
+        metrics = _FONT_FAMILIES.get(family.strip().strip("'\"").lower())
+        if metrics is not None:
+            return metrics
+    return None
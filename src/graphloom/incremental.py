@@ -0,0 +1,198 @@
+"""Incremental canvas rebuilds from an input diff.
+
+:func:`rebuild_canvas` re-resolves the old and new input (cheap compared to
+emitting the output), compares per-node subtree signatures and only emits the
+parts of the canvas whose inputs, resolved endpoints or ports changed.
+Untouched node subtrees and edge lists are reused from the previous canvas.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Tuple, TypeVar
+
+from .builder import (
+    BUNDLE_MEMBERS_KEY,
+    MinimalGraphIn,
+    _CanvasEmitter,
+    _DictFactory,
+    _ModelFactory,
+    _NodeRecord,
+    _ResolvedGraph,
+    _ResolvedLink,
+    _ResolvedScope,
+    _compiled_settings,
+    _resolve_graph,
+)
+from .canvas import Canvas
+from .compiled import CompiledSettings
+from .settings import ElkSettings
+
+CanvasT = TypeVar("CanvasT", Canvas, Dict[str, Any])
+
+
+def _field(element: Any, name: str) -> Any:
+    if isinstance(element, dict):
+        return element[name]
+    return getattr(element, name)
+
+
+def _edge_member_ids(edge: Any, members: List[int]) -> List[str]:
+    """Ids of the links emitted as ``edge``: its own id, or its bundle's member ids."""
+    if len(members) == 1:
+        return [_field(edge, "id")]
+    properties = _field(edge, "properties")
+    if not isinstance(properties, dict):
+        properties = properties.model_extra or {}
+    ids = properties.get(BUNDLE_MEMBERS_KEY)
+    if not isinstance(ids, list) or len(ids) != len(members):
+        raise ValueError("Previous canvas does not match the old input graph.")
+    return ids
+
+
+def _link_key(link: _ResolvedLink) -> Hashable:
+    edge = link.edge
+    return (edge.id, edge.label, edge.type, repr(edge.properties), link.source, link.target)
+
+
+class _SignatureIndex:
+    """Hashable, memoized signatures of the resolved scopes of one graph.
+
+    Two node subtrees with equal signatures produce identical output, apart
+    from random fallback edge ids, so the previous output can be reused.
+    """
+
+    def __init__(self, emitter: _CanvasEmitter) -> None:
+        self._emitter = emitter
+        self._scopes: Dict[int, Hashable] = {}
+
+    def links(self, scope: _ResolvedScope) -> Hashable:
+        return tuple(_link_key(link) for link in scope.links)
+
+    def node(self, node_rec: _NodeRecord, scope: _ResolvedScope) -> Hashable:
+        ports = tuple(self._emitter.node_ports(node_rec, scope))
+        child_scope = scope.children.get(node_rec.id)
+        child = self.scope(child_scope) if child_scope is not None else None
+        return (node_rec.id, node_rec.label, node_rec.type, ports, child)
+
+    def scope(self, scope: _ResolvedScope) -> Hashable:
+        signature = self._scopes.get(id(scope))
+        if signature is None:
+            nodes = tuple(self.node(node_rec, scope) for node_rec in scope.nodes.values())
+            signature = (nodes, self.links(scope))
+            self._scopes[id(scope)] = signature
+        return signature
+
+
+class _IncrementalEmitter(_CanvasEmitter):
+    """Emitter that reuses unchanged subtrees and edge lists of a previous canvas."""
+
+    def __init__(
+        self,
+        graph: _ResolvedGraph,
+        compiled: CompiledSettings,
+        factory: "_ModelFactory | _DictFactory",
+        *,
+        old_graph: _ResolvedGraph,
+        previous: Any,
+    ) -> None:
+        super().__init__(graph, compiled, factory)
+        self._old_emitter = _CanvasEmitter(old_graph, compiled, factory)
+        self._old_signatures = _SignatureIndex(self._old_emitter)
+        self._new_signatures = _SignatureIndex(self)
+        self._previous: Dict[int, Tuple[_ResolvedScope, List[Any], List[Any]]] = {
+            id(graph.root): (old_graph.root, _field(previous, "children"), _field(previous, "edges"))
+        }
+        self._fallback_ids: Dict[int, Dict[Hashable, Deque[str]]] = {}
+        self.reused_nodes = 0
+        self.reused_edge_lists = 0
+
+    def scope(self, scope: _ResolvedScope) -> tuple[List[Any], List[Any]]:
+        match = self._previous.pop(id(scope), None)
+        if match is None:
+            return super().scope(scope)
+        old_scope, previous_children, previous_edges = match
+        # With bundling, one previous edge stands for each bundle of old links.
+        if self.compiled.bundles_edges:
+            old_edges = self._old_emitter.edge_bundles(old_scope.links)
+        else:
+            old_edges = [[index] for index in range(len(old_scope.links))]
+        if len(previous_children) != len(old_scope.nodes) or len(previous_edges) != len(old_edges):
+            raise ValueError("Previous canvas does not match the old input graph.")
+
+        previous_nodes: Dict[str, Tuple[_NodeRecord, Any]] = {}
+        for old_rec, previous_node in zip(old_scope.nodes.values(), previous_children):
+            if _field(previous_node, "id") != old_rec.id:
+                raise ValueError("Previous canvas does not match the old input graph.")
+            previous_nodes[old_rec.id] = (old_rec, previous_node)
+
+        children: List[Any] = []
+        for node_rec in scope.nodes.values():
+            previous = previous_nodes.get(node_rec.id)
+            if previous is not None:
+                old_rec, previous_node = previous
+                if self._new_signatures.node(node_rec, scope) == self._old_signatures.node(old_rec, old_scope):
+                    children.append(previous_node)
+                    self.reused_nodes += 1
+                    continue
+                old_child = old_scope.children.get(node_rec.id)
+                new_child = scope.children.get(node_rec.id)
+                if old_child is not None and new_child is not None:
+                    self._previous[id(new_child)] = (
+                        old_child,
+                        _field(previous_node, "children"),
+                        _field(previous_node, "edges"),
+                    )
+            children.append(self.node(node_rec, scope))
+
+        if self._new_signatures.links(scope) == self._old_signatures.links(old_scope):
+            self.reused_edge_lists += 1
+            return children, list(previous_edges)
+
+        if self.compiled.deterministic_edge_ids:
+            # Derived ids are recomputed, so the result matches a fresh build.
+            return children, list(self.iter_edges(scope))
+        fallback_ids: Dict[Hashable, Deque[str]] = {}
+        for members, previous_edge in zip(old_edges, previous_edges):
+            for index, edge_id in zip(members, _edge_member_ids(previous_edge, members)):
+                link = old_scope.links[index]
+                if link.edge.id is None and link.edge.label is None:
+                    fallback_ids.setdefault(_link_key(link), deque()).append(edge_id)
+        self._fallback_ids[id(scope)] = fallback_ids
+        return children, list(self.iter_edges(scope))
+
+    def fallback_edge_id(self, scope: _ResolvedScope, link: _ResolvedLink) -> str:
+        candidates = self._fallback_ids.get(id(scope), {}).get(_link_key(link))
+        if candidates:
+            return candidates.popleft()
+        return super().fallback_edge_id(scope, link)
+
+
+def rebuild_canvas(
+    previous: CanvasT,
+    old: MinimalGraphIn,
+    new: MinimalGraphIn,
+    settings: ElkSettings | CompiledSettings | None = None,
+) -> CanvasT:
+    """Rebuild ``previous`` for ``new``, re-emitting only what changed since ``old``.
+
+    ``previous`` must be the output of ``build_canvas`` (a :class:`Canvas`) or
+    ``build_canvas_dict`` (a dict) for ``old`` with the same settings; the
+    result has the same type.  Node subtrees and per-scope edge lists whose
+    input, resolved endpoints and ports are unchanged are reused as-is, and
+    links without ``id`` or ``label`` that survive the change keep their
+    previously generated edge ids, unless ``deterministic_edge_ids`` is set:
+    then ids are derived again and the result equals a fresh build.  With edge bundling, previous edges are
+    matched to the old bundles and the member ids of a bundle count as the
+    generated ids of its links.
+
+    Raises:
+        ValueError: If ``previous`` does not correspond to ``old``, or ``new``
+            fails endpoint resolution.
+    """
+    compiled = _compiled_settings(settings)
+    old_graph = _resolve_graph(old, compiled)
+    new_graph = _resolve_graph(new, compiled)
+    factory = _DictFactory() if isinstance(previous, dict) else _ModelFactory()
+    emitter = _IncrementalEmitter(new_graph, compiled, factory, old_graph=old_graph, previous=previous)
+    return emitter.canvas()
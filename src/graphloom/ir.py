@@ -0,0 +1,327 @@
+"""Columnar intermediate representation between the minimal input and ELK output.
+
+:func:`build_graph_ir` resolves a :class:`~graphloom.builder.MinimalGraphIn`
+into integer-indexed node, port and edge tables backed by :mod:`array`
+columns.  Nodes are stored in pre-order, so the subtree of node ``row`` is the
+contiguous slice ``row : row + node_subtree_size[row]`` and per-subtree
+statistics, partitioning or hashing can work on column slices instead of
+recursing through ``Node.children``.
+
+The IR is lowered back to a :class:`~graphloom.canvas.Canvas`, plain ELK JSON
+or streamed JSON with :func:`canvas_from_ir`, :func:`canvas_dict_from_ir` and
+:func:`write_ir_json`; the output matches building the input graph directly
+with the same settings.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, TextIO, Tuple
+
+from .builder import (
+    MinimalEdgeIn,
+    MinimalGraphIn,
+    _CanvasEmitter,
+    _compiled_settings,
+    _DictFactory,
+    _EdgeRow,
+    _Endpoint,
+    _ModelFactory,
+    _NodeRecord,
+    _Port,
+    _PortStore,
+    _resolve_graph,
+    _ResolvedGraph,
+    _ResolvedLink,
+    _ResolvedScope,
+    _write_canvas,
+)
+from .canvas import Canvas
+from .compiled import CompiledSettings
+from .settings import ElkSettings
+
+# Index columns are signed 32-bit; -1 marks "none" (root scope, no port, no label).
+_INDEX = "i"
+NO_INDEX = -1
+
+
+def _column() -> array:
+    return array(_INDEX)
+
+
+@dataclass
+class GraphIR:
+    """Resolved graph as parallel columns.
+
+    Strings (ids, labels, port names) are interned in ``strings`` and node and
+    edge types in ``types``; columns hold indices into those tables.
+
+    Attributes:
+        node_parent: Row of the enclosing subgraph node, or ``-1`` at the top level.
+        node_id, node_label: String indices.
+        node_type: Index into ``types`` (lowercased node type).
+        node_subtree_size: Number of rows in the node's subtree, itself included.
+        node_port_start, node_port_count: The node's scope-local ports, which
+            are the contiguous port rows ``start : start + count``.
+        node_cross_port_start, node_cross_port_count: Likewise, the
+            cross-scope ports for the node's id (start ``-1`` if there are none).
+        port_node: Owning node row for scope-local ports; ``-1`` for cross-scope
+            ports, which are emitted on every node whose id is ``port_node_id``.
+        port_node_id, port_id, port_label: String indices.
+        edge_scope: Row of the subgraph node that owns the edge, or ``-1``.
+        edge_source_node, edge_target_node: Endpoint node rows.  Cross-scope
+            endpoints point at the first row carrying the referenced node id.
+        edge_source_port, edge_target_port: Port rows, or ``-1`` for node endpoints.
+        edge_label: String index, or ``-1`` for unlabeled edges.
+        edge_type: Index into ``types``, or ``-1`` for untyped edges.
+        edge_inputs: The source :class:`MinimalEdgeIn` (or edge-table row) of
+            each edge row, which carries explicit ids and per-link properties.
+    """
+
+    strings: List[str] = field(default_factory=list)
+    types: List[str] = field(default_factory=list)
+    node_parent: array = field(default_factory=_column)
+    node_id: array = field(default_factory=_column)
+    node_label: array = field(default_factory=_column)
+    node_type: array = field(default_factory=_column)
+    node_subtree_size: array = field(default_factory=_column)
+    node_port_start: array = field(default_factory=_column)
+    node_port_count: array = field(default_factory=_column)
+    node_cross_port_start: array = field(default_factory=_column)
+    node_cross_port_count: array = field(default_factory=_column)
+    port_node: array = field(default_factory=_column)
+    port_node_id: array = field(default_factory=_column)
+    port_id: array = field(default_factory=_column)
+    port_label: array = field(default_factory=_column)
+    edge_scope: array = field(default_factory=_column)
+    edge_source_node: array = field(default_factory=_column)
+    edge_target_node: array = field(default_factory=_column)
+    edge_source_port: array = field(default_factory=_column)
+    edge_target_port: array = field(default_factory=_column)
+    edge_label: array = field(default_factory=_column)
+    edge_type: array = field(default_factory=_column)
+    edge_inputs: List[MinimalEdgeIn | _EdgeRow] = field(default_factory=list)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_id)
+
+    @property
+    def port_count(self) -> int:
+        return len(self.port_id)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_scope)
+
+    def subtree(self, row: int) -> range:
+        """Rows of ``row`` and all of its descendants."""
+        return range(row, row + self.node_subtree_size[row])
+
+    def node_ports(self, row: int) -> List[int]:
+        """Port rows emitted on a node: its local ports, then unshadowed cross-scope ones."""
+        start = self.node_port_start[row]
+        local = range(start, start + self.node_port_count[row])
+        cross_start = self.node_cross_port_start[row]
+        cross = range(cross_start, cross_start + self.node_cross_port_count[row])
+        if not cross:
+            return list(local)
+        strings = self.strings
+        port_id = self.port_id
+        keys = {strings[port_id[port]] for port in local}
+        return [*local, *(port for port in cross if strings[port_id[port]] not in keys)]
+
+
+class _IRBuilder:
+    """Flattens a resolved graph into a :class:`GraphIR` in pre-order."""
+
+    def __init__(self, graph: _ResolvedGraph) -> None:
+        self.graph = graph
+        self.ir = GraphIR()
+        self._strings: Dict[str, int] = {}
+        self._types: Dict[str, int] = {}
+        self._first_row: Dict[str, int] = {}
+        self._cross_ports: Dict[str, int] = {}
+        # Node id -> (first row, count) of its cross-scope ports.
+        self._cross_port_rows: Dict[str, Tuple[int, int]] = {}
+        # (edge row, scope node rows, link) for endpoint rows filled in after flattening.
+        self._pending: List[Tuple[int, Dict[str, int], Dict[str, int], _ResolvedLink]] = []
+
+    def string(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self.ir.strings)
+            self.ir.strings.append(value)
+        return index
+
+    def type_code(self, value: str | None) -> int:
+        if value is None:
+            return NO_INDEX
+        code = self._types.get(value)
+        if code is None:
+            code = self._types[value] = len(self.ir.types)
+            self.ir.types.append(value)
+        return code
+
+    def build(self) -> GraphIR:
+        ir = self.ir
+        for node_id, ports in self.graph.cross_scope_ports.items():
+            start = ir.port_count
+            for port in ports.values():
+                self._cross_ports[port.id] = ir.port_count
+                self._add_port(NO_INDEX, node_id, port)
+            self._cross_port_rows[node_id] = (start, ir.port_count - start)
+        self._scope(self.graph.root, NO_INDEX)
+        for edge_row, node_rows, port_rows, link in self._pending:
+            ir.edge_source_node[edge_row] = self._node_row(link.source, node_rows)
+            ir.edge_target_node[edge_row] = self._node_row(link.target, node_rows)
+            ir.edge_source_port[edge_row] = self._port_row(link.source, port_rows)
+            ir.edge_target_port[edge_row] = self._port_row(link.target, port_rows)
+        return ir
+
+    def _add_port(self, node_row: int, node_id: str, port: _Port) -> int:
+        ir = self.ir
+        ir.port_node.append(node_row)
+        ir.port_node_id.append(self.string(node_id))
+        ir.port_id.append(self.string(port.id))
+        ir.port_label.append(self.string(port.label))
+        return ir.port_count - 1
+
+    def _scope(self, scope: _ResolvedScope, owner_row: int) -> None:
+        ir = self.ir
+        node_rows: Dict[str, int] = {}
+        port_rows: Dict[str, int] = {}
+        for node_rec in scope.nodes.values():
+            row = ir.node_count
+            node_rows[node_rec.id] = row
+            self._first_row.setdefault(node_rec.id, row)
+            ir.node_parent.append(owner_row)
+            ir.node_id.append(self.string(node_rec.id))
+            ir.node_label.append(self.string(node_rec.label))
+            ir.node_type.append(self.type_code(node_rec.type))
+            ir.node_subtree_size.append(1)
+            ports_start = ir.port_count
+            for port in scope.ports.get(node_rec.id, {}).values():
+                port_rows[port.id] = self._add_port(row, node_rec.id, port)
+            ir.node_port_start.append(ports_start)
+            ir.node_port_count.append(ir.port_count - ports_start)
+            cross_start, cross_count = self._cross_port_rows.get(node_rec.id, (NO_INDEX, 0))
+            ir.node_cross_port_start.append(cross_start)
+            ir.node_cross_port_count.append(cross_count)
+            child_scope = scope.children.get(node_rec.id)
+            if child_scope is not None:
+                self._scope(child_scope, row)
+                ir.node_subtree_size[row] = ir.node_count - row
+        for link in scope.links:
+            edge = link.edge
+            ir.edge_scope.append(owner_row)
+            ir.edge_label.append(NO_INDEX if edge.label is None else self.string(edge.label))
+            ir.edge_type.append(self.type_code(edge.type))
+            for column in (ir.edge_source_node, ir.edge_target_node, ir.edge_source_port, ir.edge_target_port):
+                column.append(NO_INDEX)
+            ir.edge_inputs.append(edge)
+            self._pending.append((ir.edge_count - 1, node_rows, port_rows, link))
+
+    def _node_row(self, endpoint: _Endpoint, node_rows: Dict[str, int]) -> int:
+        if endpoint.is_local:
+            return node_rows[endpoint.node_id]
+        return self._first_row[endpoint.node_id]
+
+    def _port_row(self, endpoint: _Endpoint, port_rows: Dict[str, int]) -> int:
+        if endpoint.port_id is None:
+            return NO_INDEX
+        if endpoint.is_local:
+            return port_rows[endpoint.port_id]
+        return self._cross_ports[endpoint.port_id]
+
+
+def build_graph_ir(
+    data: MinimalGraphIn,
+    settings: ElkSettings | CompiledSettings | None = None,
+) -> GraphIR:
+    """Resolve ``data`` into a :class:`GraphIR`.
+
+    ``settings`` only matter for resolution (default node type and node
+    auto-creation); pass the same settings when lowering the IR.
+
+    Raises:
+        ValueError: As :func:`graphloom.build_canvas` for invalid references.
+    """
+    compiled = _compiled_settings(settings)
+    return _IRBuilder(_resolve_graph(data, compiled)).build()
+
+
+def _resolved_graph(ir: GraphIR) -> _ResolvedGraph:
+    strings = ir.strings
+    types = ir.types
+    root = _ResolvedScope()
+    scopes: Dict[int, _ResolvedScope] = {NO_INDEX: root}
+
+    def scope_of(row: int) -> _ResolvedScope:
+        scope = scopes.get(row)
+        if scope is None:
+            scope = scopes[row] = _ResolvedScope()
+            scope_of(ir.node_parent[row]).children[strings[ir.node_id[row]]] = scope
+        return scope
+
+    for row in range(ir.node_count):
+        node_id = strings[ir.node_id[row]]
+        record = _NodeRecord(id=node_id, label=strings[ir.node_label[row]], type=types[ir.node_type[row]])
+        scope_of(ir.node_parent[row]).nodes[node_id] = record
+
+    cross_scope_ports: _PortStore = {}
+    for port in range(ir.port_count):
+        node_id = strings[ir.port_node_id[port]]
+        port_id = strings[ir.port_id[port]]
+        owner = ir.port_node[port]
+        store = cross_scope_ports if owner == NO_INDEX else scope_of(ir.node_parent[owner]).ports
+        store.setdefault(node_id, {})[port_id[len(node_id) + 1 :]] = _Port(
+            id=port_id, label=strings[ir.port_label[port]]
+        )
+
+    def endpoint(edge: int, node_row: int, port_row: int) -> _Endpoint:
+        return _Endpoint(
+            strings[ir.node_id[node_row]],
+            None if port_row == NO_INDEX else strings[ir.port_id[port_row]],
+            ir.node_parent[node_row] == ir.edge_scope[edge],
+        )
+
+    for edge in range(ir.edge_count):
+        source = endpoint(edge, ir.edge_source_node[edge], ir.edge_source_port[edge])
+        target = endpoint(edge, ir.edge_target_node[edge], ir.edge_target_port[edge])
+        scope_of(ir.edge_scope[edge]).links.append(_ResolvedLink(ir.edge_inputs[edge], source, target))
+
+    return _ResolvedGraph(root=root, cross_scope_ports=cross_scope_ports)
+
+
+def canvas_from_ir(
+    ir: GraphIR,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    validate: bool = False,
+) -> Canvas:
+    """Lower ``ir`` to a :class:`Canvas`, like :func:`graphloom.build_canvas`."""
+    compiled = _compiled_settings(settings)
+    return _CanvasEmitter(_resolved_graph(ir), compiled, _ModelFactory(validate=validate)).canvas()
+
+
+def canvas_dict_from_ir(
+    ir: GraphIR,
+    settings: ElkSettings | CompiledSettings | None = None,
+) -> Dict[str, Any]:
+    """Lower ``ir`` to plain ELK JSON, like :func:`graphloom.build_canvas_dict`."""
+    compiled = _compiled_settings(settings)
+    return _CanvasEmitter(_resolved_graph(ir), compiled, _DictFactory()).canvas()
+
+
+def write_ir_json(
+    ir: GraphIR,
+    fp: TextIO,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    indent: int | None = 2,
+) -> None:
+    """Stream ``ir`` as ELK JSON to ``fp``, like :func:`graphloom.write_canvas_json`."""
+    compiled = _compiled_settings(settings)
+    _write_canvas(fp, _CanvasEmitter(_resolved_graph(ir), compiled, _DictFactory()), indent)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Mapping
 
+from . import codec
 from .canvas import Canvas
 from .settings import ElkSettings
 
@@ -35,9 +35,7 @@ def resolve_profile_elk_settings(bundle: Mapping[str, Any]) -> ResolvedProfileEl
         raise ValueError("Profile bundle field 'elkSettings' must be an object.")
 
     # Canonicalize key order to keep downstream JSON dumps deterministic.
-    canonical_settings = json.loads(
-        json.dumps(elk_settings, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-    )
+    canonical_settings = codec.loads(codec.dumps(elk_settings, sort_keys=True))
     settings = ElkSettings.model_validate(canonical_settings)
 
     return ResolvedProfileElkSettings(
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -39,9 +39,22 @@ class SubgraphDefaults(BaseModel):
     properties: Dict[str, Any] = Field(default_factory=dict)
 
 
+class EdgeBundling(BaseModel):
+    """Collapse parallel edges of one type into a single edge.
+
+    ``match="node"`` bundles links between the same source and target nodes
+    (e.g. LAG members on different ports) into a node-to-node edge;
+    ``match="port"`` only bundles links between the same endpoint ports.
+    """
+
+    match: Literal["node", "port"] = "node"
+    min_members: int = Field(default=2, ge=2)
+
+
 class EdgeDefaults(BaseModel):
     label: LabelDefaults
     properties: Dict[str, Any] = Field(default_factory=dict)
+    bundling: EdgeBundling | None = None
 
     @model_validator(mode="after")
     def validate_and_apply_graphrapids_edge_defaults(self) -> "EdgeDefaults":
@@ -72,6 +85,7 @@ class ElkSettings(BaseSettings):
     edge_type_overrides: Dict[str, EdgeDefaults] = Field(default_factory=dict)
     auto_create_missing_nodes: bool = True
     estimate_label_size_from_font: bool = False
+    deterministic_edge_ids: bool = False
 
     @model_validator(mode="after")
     def ensure_subgraph_defaults(self) -> "ElkSettings":
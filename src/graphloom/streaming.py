@@ -0,0 +1,320 @@
+"""Streaming build for minimal JSON inputs too large to load at once.
+
+:func:`write_canvas_json_stream` reads the input document incrementally:
+``nodes[]`` and ``links[]`` items are decoded one at a time with
+:meth:`json.JSONDecoder.raw_decode` over fixed-size chunks and validated as
+they arrive.  Nodes are kept (every link needs the complete alias index), but
+top-level links never are: links that precede the ``nodes`` array are
+spilled to a temporary file until the nodes are known, and resolved links
+are spilled again until the children have been written, because ports
+registered by links appear on the nodes written before the edges.
+
+Peak memory therefore follows the node list, the port registry and the set
+of emitted edge ids instead of the input size.  A top-level subgraph node is
+still decoded and validated as one item.
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+import re
+import tempfile
+from contextlib import ExitStack
+from typing import Any, Callable, Iterator, List, TextIO, Tuple
+
+from .builder import (
+    MinimalEdgeIn,
+    MinimalNodeIn,
+    _CanvasEmitter,
+    _compiled_settings,
+    _DictFactory,
+    _EdgeRow,
+    _edge_endpoints,
+    _Endpoint,
+    _normalize_link_entry,
+    _resolve_graph,
+    _ResolvedLink,
+    _ScopeView,
+    _write_canvas,
+)
+from .compiled import CompiledSettings
+from .settings import ElkSettings
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_END = object()  # end of a section in ``_iter_sections``
+# Longest token whose truncation is reported at its start or inside it: ``-Infinity``.
+_MAX_PARTIAL = len("-Infinity")
+
+
+class _JsonReader:
+    """Incremental JSON tokenizer over a text stream, one value at a time.
+
+    Only the unread tail of the last chunk is kept.  A value cut off by the
+    chunk boundary is decoded again after reading more, with the read size
+    doubling on every retry so large values stay linear overall.  Errors
+    report their position in the whole input, like :func:`json.loads`.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        # Characters, newlines and the start of the current line in the
+        # part of the input already dropped from the buffer.
+        self._offset = 0
+        self._lines = 0
+        self._line_start = 0
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fp.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        dropped = self._pos
+        newlines = self._buffer.count("\n", 0, dropped)
+        if newlines:
+            self._lines += newlines
+            self._line_start = self._offset + self._buffer.rfind("\n", 0, dropped) + 1
+        self._offset += dropped
+        self._buffer = self._buffer[dropped:] + chunk
+        self._pos = 0
+        return True
+
+    def _error_at(self, message: str, pos: int) -> json.JSONDecodeError:
+        exc = json.JSONDecodeError(message, self._buffer, pos)
+        exc.pos = self._offset + pos
+        exc.lineno = self._lines + self._buffer.count("\n", 0, pos) + 1
+        last_newline = self._buffer.rfind("\n", 0, pos)
+        line_start = self._offset + last_newline + 1 if last_newline >= 0 else self._line_start
+        exc.colno = exc.pos - line_start + 1
+        exc.args = (f"{message}: line {exc.lineno} column {exc.colno} (char {exc.pos})",)
+        return exc
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return self._error_at(message, self._pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or ``""`` at the end of the input."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                # Only an unterminated string or an error in the last few
+                # characters can be a value cut off by the chunk boundary;
+                # anything else is invalid whatever follows.
+                truncated = exc.msg.startswith("Unterminated string")
+                if not (truncated or exc.pos > len(self._buffer) - _MAX_PARTIAL) or not self._fill(size):
+                    raise self._error_at(exc.msg, exc.pos) from None
+                size *= 2
+                continue
+            # A number or literal ending at the buffer edge may continue in the next chunk.
+            if end == len(self._buffer) and self._fill(size):
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_sections(reader: _JsonReader) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(key, item)`` for every ``nodes``/``links`` item, then ``(key, _END)``."""
+    reader.expect("{")
+    seen = set()
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise reader.error("Expecting property name enclosed in double quotes")
+            if key not in ("nodes", "links"):
+                raise ValueError(f"Unexpected input key '{key}'; expected 'nodes' and 'links'")
+            if key in seen:
+                raise ValueError(f"Duplicate input key '{key}'")
+            seen.add(key)
+            reader.expect(":")
+            if reader.peek() == "[":
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.expect("]")
+                else:
+                    while True:
+                        yield key, reader.value()
+                        if reader.peek() != ",":
+                            reader.expect("]")
+                            break
+                        reader.expect(",")
+            elif reader.value() is not None:
+                raise ValueError(f"'{key}' must be a list")
+            yield key, _END
+            if reader.peek() != ",":
+                reader.expect("}")
+                break
+            reader.expect(",")
+    if reader.peek():
+        raise reader.error("Extra data")
+
+
+class _Spill:
+    """Append-only sequence of records pickled to an anonymous temporary file.
+
+    Records are pickled one by one (no shared memo), so neither writing nor
+    reading them back keeps earlier records alive.  ``pack`` and ``unpack``
+    convert records to plain tuples and back, which pickle much faster than
+    named tuples.  Iterate only after the last append.
+    """
+
+    def __init__(self, pack: Callable[[Any], Any], unpack: Callable[[Any], Any]) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._count = 0
+        self._pack = pack
+        self._unpack = unpack
+
+    def append(self, record: Any) -> None:
+        self._file.write(pickle.dumps(self._pack(record), pickle.HIGHEST_PROTOCOL))
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        spill = self._file
+        spill.seek(0)
+        try:
+            unpack = self._unpack
+            for _ in range(self._count):
+                yield unpack(pickle.load(spill))
+        finally:
+            spill.seek(0, 2)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _edge_row_spill() -> _Spill:
+    return _Spill(tuple, _EdgeRow._make)
+
+
+def _pack_link(link: _ResolvedLink) -> Tuple[tuple, tuple, tuple]:
+    edge, source, target = link
+    return tuple(edge), tuple(source), tuple(target)
+
+
+def _unpack_link(packed: Tuple[tuple, tuple, tuple]) -> _ResolvedLink:
+    edge, source, target = packed
+    return _ResolvedLink(_EdgeRow._make(edge), _Endpoint._make(source), _Endpoint._make(target))
+
+
+def _validated(key: str, index: int, validate: Any) -> Any:
+    try:
+        return validate()
+    except ValueError as exc:
+        raise ValueError(f"Invalid item {index} of '{key}': {exc}") from exc
+
+
+def _as_edge_row(item: Any) -> _EdgeRow:
+    edge = MinimalEdgeIn.model_validate(_normalize_link_entry(item))
+    source, target = _edge_endpoints(edge)
+    return _EdgeRow(source, target, edge.id, edge.label, edge.type, edge.properties)
+
+
+def _as_node_model(item: Any) -> MinimalNodeIn:
+    return MinimalNodeIn.model_validate({"name": item} if isinstance(item, str) else item)
+
+
+class _StreamedInput:
+    """Validated nodes of a streamed input, plus its links as a one-shot iterator.
+
+    Reading stops after the ``nodes`` array; links decoded before it are
+    spilled and replayed first, the rest are decoded while being resolved.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int, early_links: _Spill) -> None:
+        self.nodes: List[MinimalNodeIn] = []
+        self.link_count = 0
+        self._sections = _iter_sections(_JsonReader(fp, chunk_size))
+        self._early_links = early_links
+        for key, item in self._sections:
+            if key == "nodes":
+                if item is _END:
+                    break
+                self.nodes.append(_validated(key, len(self.nodes), lambda: _as_node_model(item)))
+            elif item is not _END:
+                early_links.append(self._link(item))
+
+    def _link(self, item: Any) -> _EdgeRow:
+        row = _validated("links", self.link_count, lambda: _as_edge_row(item))
+        self.link_count += 1
+        return row
+
+    def links(self) -> Iterator[_EdgeRow]:
+        yield from self._early_links
+        for _key, item in self._sections:
+            if item is not _END:
+                yield self._link(item)
+
+
+def write_canvas_json_stream(
+    source: TextIO,
+    fp: TextIO,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    indent: int | None = 2,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """Build the minimal JSON input read from ``source`` and stream ELK JSON to ``fp``.
+
+    The written text is identical to :func:`graphloom.write_canvas_json` for
+    the same input loaded with ``MinimalGraphIn.model_validate``, but the
+    input is never held in memory as a whole (see the module docstring).
+    With edge bundling enabled, top-level links are kept in memory instead of
+    being spilled, since bundles group links from anywhere in the list.
+
+    Args:
+        source: Text stream with one minimal input JSON object.
+        fp: Output text stream.
+        settings: Settings or pre-compiled settings, as for
+            :func:`graphloom.build_canvas`.
+        indent: As for :func:`graphloom.write_canvas_json`.
+        chunk_size: Number of characters read from ``source`` at a time.
+
+    Raises:
+        ValueError: If the input is not valid JSON, has keys other than
+            ``nodes`` and ``links``, an item fails validation (reported with
+            its index) or references are invalid.  Nothing is written to
+            ``fp`` before the input has been read completely.
+    """
+    compiled = _compiled_settings(settings)
+    with ExitStack() as stack:
+        early_links = _edge_row_spill()
+        stack.callback(early_links.close)
+        streamed = _StreamedInput(source, chunk_size, early_links)
+        root_links: Any = []
+        if not compiled.bundles_edges:
+            root_links = _Spill(_pack_link, _unpack_link)
+            stack.callback(root_links.close)
+        graph = _resolve_graph(_ScopeView(streamed.nodes, streamed.links()), compiled, root_links)
+        if not streamed.nodes and not streamed.link_count:
+            raise ValueError("At least one node or one link must be defined.")
+        _write_canvas(fp, _CanvasEmitter(graph, compiled, _DictFactory()), indent)
@@ -0,0 +1,156 @@
+"""Edge-list tables (CSV/TSV) as builder input.
+
+:func:`read_edge_table` streams an edge list, one link per row, through
+:mod:`csv` and returns a :class:`~graphloom.builder.MinimalGraphIn` whose
+links are lightweight rows with their endpoints already split, so large
+exports feed the builder without a ``MinimalEdgeIn`` model per link.  Rows are
+checked with the same length and ``:`` rules as the minimal input format.
+
+Edge table columns (header row required, any order, case-insensitive):
+``source`` and ``target`` (required), ``source_port``, ``target_port``,
+``label``, ``type`` and ``id``.  An optional node table with ``name``
+(required), ``type`` and ``id`` columns declares nodes up front, e.g. to give
+them types; nodes only referenced by links are auto-created as usual.  Empty
+cells mean "not set".
+"""
+
+from __future__ import annotations
+
+import csv
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .builder import (
+    MinimalGraphIn,
+    MinimalNodeIn,
+    _EdgeRow,
+    _EndpointParts,
+    _validate_edge_label,
+    _validate_endpoint_parts,
+)
+
+EDGE_COLUMNS = ("source", "source_port", "target", "target_port", "label", "type", "id")
+NODE_COLUMNS = ("name", "type", "id")
+TABLE_SUFFIXES = (".csv", ".tsv")
+
+_DELIMITERS = {".csv": ",", ".tsv": "\t"}
+
+
+def _delimiter(path: str, delimiter: str | None) -> str:
+    if delimiter is not None:
+        return delimiter
+    for suffix, value in _DELIMITERS.items():
+        if path.lower().endswith(suffix):
+            return value
+    raise ValueError(f"Cannot infer the delimiter of '{path}'; use a .csv or .tsv file or pass delimiter")
+
+
+def _table_rows(
+    path: str,
+    delimiter: str,
+    columns: Sequence[str],
+    required: Sequence[str],
+) -> Iterator[Tuple[int, List[Optional[str]]]]:
+    """Yield ``(line number, cells)`` per data row, cells ordered like ``columns``.
+
+    Cells are stripped, and empty cells and absent columns are ``None``.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"'{path}' is empty; expected a header row")
+        names = [name.strip().lower() for name in header]
+        for name in names:
+            if name not in columns:
+                raise ValueError(f"Unknown column '{name}' in '{path}'; expected: {', '.join(columns)}")
+            if names.count(name) > 1:
+                raise ValueError(f"Duplicate column '{name}' in '{path}'")
+        for name in required:
+            if name not in names:
+                raise ValueError(f"Missing column '{name}' in '{path}'")
+        positions = [names.index(name) if name in names else None for name in columns]
+        width = len(names)
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue  # blank line
+            if len(row) != width:
+                raise ValueError(f"{path}, line {reader.line_num}: expected {width} fields, found {len(row)}")
+            yield reader.line_num, [None if i is None else (row[i].strip() or None) for i in positions]
+
+
+def _edge_rows(path: str, delimiter: str) -> List[_EdgeRow]:
+    # Endpoints repeat across rows (a node or port per many links): validate
+    # each distinct one once and share the parsed tuple between rows.
+    endpoints: Dict[Tuple[Optional[str], Optional[str]], _EndpointParts] = {}
+
+    def endpoint(column: str, node: str | None, port: str | None) -> _EndpointParts:
+        key = (node, port)
+        parts = endpoints.get(key)
+        if parts is None:
+            if node is None:
+                raise ValueError(f"Column '{column}' must not be empty.")
+            if ":" in node:
+                raise ValueError("Node name cannot contain ':' because edge endpoints use 'node:port' syntax.")
+            _validate_endpoint_parts(node, port)
+            parts = endpoints[key] = (node, port)
+        return parts
+
+    links: List[_EdgeRow] = []
+    for line, (source, source_port, target, target_port, label, edge_type, edge_id) in _table_rows(
+        path, delimiter, EDGE_COLUMNS, ("source", "target")
+    ):
+        try:
+            links.append(
+                _EdgeRow(
+                    endpoint("source", source, source_port),
+                    endpoint("target", target, target_port),
+                    edge_id,
+                    _validate_edge_label(label),
+                    edge_type,
+                )
+            )
+        except ValueError as exc:
+            raise ValueError(f"{path}, line {line}: {exc}") from exc
+    return links
+
+
+def _node_rows(path: str, delimiter: str) -> List[MinimalNodeIn]:
+    nodes: List[MinimalNodeIn] = []
+    for line, (name, node_type, node_id) in _table_rows(path, delimiter, NODE_COLUMNS, ("name",)):
+        if name is None:
+            raise ValueError(f"{path}, line {line}: Column 'name' must not be empty.")
+        try:
+            nodes.append(MinimalNodeIn.model_validate({"name": name, "type": node_type, "id": node_id}))
+        except ValueError as exc:
+            raise ValueError(f"{path}, line {line}: {exc}") from exc
+    return nodes
+
+
+def read_edge_table(
+    path: str,
+    *,
+    nodes: str | None = None,
+    delimiter: str | None = None,
+) -> MinimalGraphIn:
+    """Read a CSV/TSV edge list (and optional node table) as builder input.
+
+    Args:
+        path: Edge table; one link per row.
+        nodes: Optional node table, declared before any auto-created node.
+        delimiter: Field delimiter of both tables; by default ``,`` for
+            ``.csv`` and a tab for ``.tsv`` files.
+
+    Links keep row order.  The returned graph is built with
+    ``MinimalGraphIn.model_construct``: it is meant for the builders and
+    :mod:`graphloom.views`, not for re-validation or ``model_dump``.
+
+    Raises:
+        ValueError: On unknown, duplicate or missing columns, rows with the
+            wrong number of fields, values breaking the minimal input rules
+            (reported with file and line), or when both tables are empty.
+    """
+    node_models = _node_rows(nodes, _delimiter(nodes, delimiter)) if nodes else []
+    links = _edge_rows(path, _delimiter(path, delimiter))
+    if not node_models and not links:
+        raise ValueError("At least one node or one link must be defined.")
+    return MinimalGraphIn.model_construct(nodes=node_models, links=links)
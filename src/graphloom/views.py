@@ -0,0 +1,272 @@
+"""Focused views: build only the neighbourhood of a few nodes or selected types.
+
+:func:`extract_view` resolves the input once, indexes every node occurrence
+and the links between them in an adjacency index, and returns the induced
+sub-input for a seed set expanded by ``hops`` links and/or a node type
+filter.  The result is a regular :class:`~graphloom.builder.MinimalGraphIn`,
+so any builder (or ``--layout``) only pays for the view.
+
+:func:`expand_canvas` and :func:`expand_canvas_dict` build the contents of one
+subgraph node on demand, e.g. a node collapsed by ``max_depth`` in an
+overview build.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from .builder import (
+    MinimalGraphIn,
+    _as_node,
+    _CanvasEmitter,
+    _collapse_graph,
+    _compiled_settings,
+    _DictFactory,
+    _Endpoint,
+    _endpoint_path,
+    _first_node_paths,
+    _ModelFactory,
+    _node_names,
+    _NodePath,
+    _resolve_graph,
+    _ResolvedGraph,
+    _ResolvedScope,
+    _scope_view,
+    _ScopeView,
+    sanitize_id,
+)
+from .canvas import Canvas
+from .compiled import CompiledSettings
+from .settings import ElkSettings
+
+class _ViewIndex:
+    """Node occurrences of one resolved graph and the links between them.
+
+    Nodes are keyed by their id path, so every occurrence of a repeated nested
+    scope is a separate node.  Cross-scope endpoints point at the first
+    declared node with the referenced id, like the columnar IR does.
+    """
+
+    def __init__(self, data: MinimalGraphIn, compiled: CompiledSettings) -> None:
+        self.types: Dict[_NodePath, str] = {}
+        self.aliases: Dict[str, List[_NodePath]] = {}
+        self.adjacency: Dict[_NodePath, List[_NodePath]] = {}
+        # Endpoint paths of every link, per declaring scope path, in input order.
+        self.links: Dict[_NodePath, List[Tuple[_NodePath, _NodePath]]] = {}
+        self._first_path: Dict[str, _NodePath] = {}
+        self._pending: List[Tuple[_NodePath, _ResolvedScope]] = []
+
+        graph = _resolve_graph(data, compiled)
+        self._add_scope(_scope_view(data), graph.root, ())
+        for prefix, scope in self._pending:
+            endpoints = self.links[prefix] = []
+            for link in scope.links:
+                source = self._endpoint_path(link.source, prefix)
+                target = self._endpoint_path(link.target, prefix)
+                endpoints.append((source, target))
+                self.adjacency[source].append(target)
+                self.adjacency[target].append(source)
+
+    def _add_scope(self, view: _ScopeView, scope: _ResolvedScope, prefix: _NodePath) -> None:
+        declared = {}
+        for node_raw in view.nodes:
+            node = _as_node(node_raw)
+            declared[sanitize_id(node.id or node.name)] = node
+        for node_rec in scope.nodes.values():
+            path = prefix + (node_rec.id,)
+            node = declared.get(node_rec.id)
+            self.types[path] = node_rec.type
+            self.adjacency[path] = []
+            for alias in _node_names(node_rec.label, node_rec.id, node.id if node is not None else None):
+                self.aliases.setdefault(alias, []).append(path)
+            if node is None:
+                continue  # auto-created: only reachable through its scope's links
+            self._first_path.setdefault(node_rec.id, path)
+            child_scope = scope.children.get(node_rec.id)
+            if child_scope is not None:
+                self._add_scope(_scope_view(node), child_scope, path)
+        self._pending.append((prefix, scope))
+
+    def _endpoint_path(self, endpoint: _Endpoint, prefix: _NodePath) -> _NodePath:
+        if endpoint.is_local:
+            return prefix + (endpoint.node_id,)
+        return self._first_path[endpoint.node_id]
+
+    def select(self, seeds: Iterable[str], hops: int, node_types: Iterable[str] | None) -> Set[_NodePath]:
+        allowed = None if node_types is None else {node_type.lower() for node_type in node_types}
+
+        def candidate(path: _NodePath) -> bool:
+            return allowed is None or self.types[path] in allowed
+
+        seeds = list(seeds)
+        if not seeds:
+            return {path for path in self.types if candidate(path)}
+
+        frontier: List[_NodePath] = []
+        for seed in seeds:
+            paths = self.aliases.get(sanitize_id(seed))
+            if not paths:
+                raise ValueError(f"Unknown seed node '{seed}'")
+            frontier.extend(path for path in paths if candidate(path))
+        selected = set(frontier)
+        for _ in range(hops):
+            reached = []
+            for path in frontier:
+                for neighbour in self.adjacency[path]:
+                    if neighbour not in selected and candidate(neighbour):
+                        selected.add(neighbour)
+                        reached.append(neighbour)
+            if not reached:
+                break
+            frontier = reached
+        return selected
+
+
+def _induced_scope(
+    view: _ScopeView,
+    prefix: _NodePath,
+    selected: Set[_NodePath],
+    containers: Set[_NodePath],
+    kept_links: Dict[_NodePath, List[int]],
+) -> Tuple[List, List]:
+    nodes = []
+    for node_raw in view.nodes:
+        node = _as_node(node_raw)
+        path = prefix + (sanitize_id(node.id or node.name),)
+        if path in containers:
+            child_nodes, child_links = _induced_scope(_scope_view(node), path, selected, containers, kept_links)
+            nodes.append(node.model_copy(update={"nodes": child_nodes, "links": child_links}))
+        elif path in selected:
+            has_content = bool(node.nodes or node.links)
+            nodes.append(node.model_copy(update={"nodes": [], "links": []}) if has_content else node_raw)
+    links = [view.links[index] for index in kept_links.get(prefix, ())]
+    return nodes, links
+
+
+def extract_view(
+    data: MinimalGraphIn,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    seeds: Iterable[str] = (),
+    hops: int = 0,
+    node_types: Iterable[str] | None = None,
+) -> MinimalGraphIn:
+    """Return the part of ``data`` around ``seeds`` and/or of the given node types.
+
+    Args:
+        data: Full input graph.
+        settings: Settings used to resolve endpoints (default node type and
+            node auto-creation), as for :func:`graphloom.build_canvas`.
+        seeds: Node names, ids or aliases to start from; every node occurrence
+            answering to a seed is selected.  Without seeds all nodes that
+            pass ``node_types`` are selected.
+        hops: Number of links to follow outward from the seeds.
+        node_types: Only keep (and only traverse through) nodes of these
+            types, compared case-insensitively.
+
+    The view keeps the selected nodes, every link whose endpoints are both
+    selected and the subgraph containers enclosing them.  Nested subgraphs
+    are only kept with their selected contents; a selected subgraph without
+    any is emitted as a leaf.  Nodes auto-created by links are recreated by
+    the links that survive.
+
+    Raises:
+        ValueError: If ``hops`` is negative, a seed matches no node, or the
+            input has invalid references.
+    """
+    if hops < 0:
+        raise ValueError("hops must be zero or positive.")
+    index = _ViewIndex(data, _compiled_settings(settings))
+    selected = index.select(seeds, hops, node_types)
+
+    kept_links: Dict[_NodePath, List[int]] = {}
+    containers: Set[_NodePath] = set()
+    for prefix, endpoints in index.links.items():
+        kept = [i for i, (source, target) in enumerate(endpoints) if source in selected and target in selected]
+        if kept:
+            kept_links[prefix] = kept
+            containers.update(prefix[:depth] for depth in range(1, len(prefix) + 1))
+    for path in selected:
+        containers.update(path[:depth] for depth in range(1, len(path)))
+
+    nodes, links = _induced_scope(_scope_view(data), (), selected, containers, kept_links)
+    return data.model_copy(update={"nodes": nodes, "links": links})
+
+
+def _subtree_graph(graph: _ResolvedGraph, node_id: str) -> _ResolvedGraph:
+    """The contents of subgraph ``node_id`` as a graph of their own.
+
+    Links that reach outside the subtree are dropped; their endpoints are
+    not part of the expanded canvas.
+    """
+    paths = _first_node_paths(graph.root)
+    path = paths.get(node_id)
+    if path is None:
+        raise ValueError(f"Unknown node '{node_id}'")
+    parent = graph.root
+    for ancestor_id in path[:-1]:
+        parent = parent.children[ancestor_id]
+    subtree = parent.children.get(node_id)
+    if subtree is None:
+        raise ValueError(f"Node '{node_id}' is not a subgraph")
+
+    def inside(endpoint: _Endpoint, prefix: _NodePath) -> bool:
+        return _endpoint_path(endpoint, prefix, paths)[: len(path)] == path
+
+    def copy(scope: _ResolvedScope, prefix: _NodePath) -> _ResolvedScope:
+        result = _ResolvedScope(nodes=scope.nodes, ports=scope.ports)
+        result.links = [
+            link for link in scope.links if inside(link.source, prefix) and inside(link.target, prefix)
+        ]
+        for child_id, child_scope in scope.children.items():
+            result.children[child_id] = copy(child_scope, prefix + (child_id,))
+        return result
+
+    return _ResolvedGraph(root=copy(subtree, path), cross_scope_ports=graph.cross_scope_ports)
+
+
+def _expanded_graph(
+    data: MinimalGraphIn, node_id: str, compiled: CompiledSettings, max_depth: int | None
+) -> _ResolvedGraph:
+    graph = _subtree_graph(_resolve_graph(data, compiled), node_id)
+    if max_depth is not None:
+        graph = _collapse_graph(graph, max_depth)
+    return graph
+
+
+def expand_canvas(
+    data: MinimalGraphIn,
+    node_id: str,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    validate: bool = False,
+    max_depth: int | None = None,
+) -> Canvas:
+    """Build only the contents of subgraph node ``node_id`` as a :class:`Canvas`.
+
+    ``node_id`` is the emitted node id (the first node with that id in
+    declaration order).  The canvas children are the node's children, built
+    exactly as in a full build; links that leave the subgraph are left out.
+    ``max_depth`` counts levels from the node's children and works as in
+    :func:`graphloom.build_canvas`, so an overview can be drilled into one
+    level at a time.
+
+    Raises:
+        ValueError: If ``node_id`` is unknown or not a subgraph node, and as
+            :func:`graphloom.build_canvas`.
+    """
+    compiled = _compiled_settings(settings)
+    graph = _expanded_graph(data, node_id, compiled, max_depth)
+    return _CanvasEmitter(graph, compiled, _ModelFactory(validate=validate)).canvas()
+
+
+def expand_canvas_dict(
+    data: MinimalGraphIn,
+    node_id: str,
+    settings: ElkSettings | CompiledSettings | None = None,
+    *,
+    max_depth: int | None = None,
+) -> Dict[str, Any]:
+    """Like :func:`expand_canvas`, producing plain ELK JSON."""
+    compiled = _compiled_settings(settings)
+    return _CanvasEmitter(_expanded_graph(data, node_id, compiled, max_depth), compiled, _DictFactory()).canvas()
@@ -0,0 +1,11 @@
+import pytest
+
+from graphloom import sample_settings
+
+
+@pytest.fixture
+def deterministic_settings():
+    """Sample settings with content-derived edge ids, so equal builds give equal output."""
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    return settings
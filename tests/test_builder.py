@@ -517,6 +517,26 @@ def test_estimate_label_size_from_font_overrides_label_dimensions():
     canvas = build_canvas(minimal, settings)
     label = canvas.edges[0].labels[0]
 
+    # Arial advances: L 0.556 + i 0.222 + n 0.556 + k 0.5 em at 10pt, plus padding.
+    assert label.width == pytest.approx(19.34)
+    assert label.height == pytest.approx(13.0)
+
+
+def test_estimate_label_size_uses_flat_width_for_unknown_fonts():
+    minimal = MinimalGraphIn(
+        nodes=["A", "B"],
+        links=[{"label": "Link", "from": "A", "to": "B"}],
+    )
+    settings = sample_settings()
+    settings.estimate_label_size_from_font = True
+    settings.edge_defaults.label.properties = {
+        "org.eclipse.elk.font.name": "Unknown Sans",
+        "org.eclipse.elk.font.size": 10,
+    }
+
+    canvas = build_canvas(minimal, settings)
+    label = canvas.edges[0].labels[0]
+
     assert label.width == pytest.approx(25.0)
     assert label.height == pytest.approx(13.0)
 
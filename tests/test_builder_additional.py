@@ -1,4 +1,8 @@
+import io
+import itertools
 import json
+import re
+from types import SimpleNamespace
 
 import pytest
 from pydantic import ValidationError
@@ -6,6 +10,7 @@ from pydantic import ValidationError
 import graphloom.builder as builder_mod
 from graphloom import MinimalGraphIn, sample_settings
 from graphloom.base import Properties
+from graphloom.settings import EdgeBundling
 
 
 def _write_json(path, payload) -> None:
@@ -109,6 +114,83 @@ def test_load_input_supports_json_and_rejects_unsupported_extension(tmp_path):
         builder_mod._load_input(str(input_txt))
 
 
+_MULTI_DOCUMENT_YAML = """\
+nodes: [A, B]
+links: ["A -> B"]
+---
+nodes: [C]
+---
+"""
+
+
+def test_load_inputs_reads_every_yaml_document(tmp_path):
+    path = tmp_path / "graphs.yaml"
+    path.write_text(_MULTI_DOCUMENT_YAML, encoding="utf-8")
+
+    graphs = builder_mod._load_inputs(str(path))
+
+    assert [[node.name for node in graph.nodes] for graph in graphs] == [["A", "B"], ["C"]]
+    with pytest.raises(ValueError, match="Expected one graph .* found 2 YAML documents"):
+        builder_mod._load_input(str(path))
+
+
+def test_yaml_loader_prefers_libyaml_and_falls_back_to_pure_python():
+    yaml = pytest.importorskip("yaml")
+
+    assert builder_mod._yaml_loader(SimpleNamespace(SafeLoader=yaml.SafeLoader)) is yaml.SafeLoader
+    assert builder_mod._yaml_loader(yaml) is getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def test_main_writes_one_canvas_per_yaml_document(tmp_path):
+    input_path = tmp_path / "graphs.yaml"
+    output_path = tmp_path / "out.json"
+    enriched_path = tmp_path / "enriched.json"
+    input_path.write_text(_MULTI_DOCUMENT_YAML, encoding="utf-8")
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    settings_path = tmp_path / "settings.json"
+    _write_json(settings_path, settings.model_dump())
+
+    exit_code = builder_mod.main(
+        [str(input_path), "-s", str(settings_path), "--enriched-output", str(enriched_path), "-o", str(output_path)]
+    )
+
+    expected = [builder_mod.build_canvas_dict(graph, settings) for graph in builder_mod._load_inputs(str(input_path))]
+    assert exit_code == 0
+    assert output_path.read_text(encoding="utf-8") == json.dumps(expected, indent=2)
+    assert enriched_path.read_text(encoding="utf-8") == json.dumps(expected, indent=2)
+
+
+@pytest.mark.parametrize("extra", [[], ["--validate"]])
+def test_main_builds_a_yaml_batch_in_one_process_pool(tmp_path, monkeypatch, extra):
+    input_path = tmp_path / "graphs.yaml"
+    output_path = tmp_path / "out.json"
+    input_path.write_text(_MULTI_DOCUMENT_YAML + "nodes: [{name: G, nodes: [{name: H, nodes: [X]}]}]\n", encoding="utf-8")
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    settings_path = tmp_path / "settings.json"
+    _write_json(settings_path, settings.model_dump())
+    pools = []
+    executor_cls = builder_mod.ProcessPoolExecutor
+
+    def recording_executor(*args, **kwargs):
+        pools.append(kwargs["max_workers"])
+        return executor_cls(*args, **kwargs)
+
+    monkeypatch.setattr(builder_mod, "ProcessPoolExecutor", recording_executor)
+
+    exit_code = builder_mod.main(
+        [str(input_path), "-s", str(settings_path), "-j", "2", "--max-depth", "1", *extra, "-o", str(output_path)]
+    )
+
+    graphs = builder_mod._load_inputs(str(input_path))
+    expected = [builder_mod.build_canvas_dict(graph, settings, max_depth=1) for graph in graphs]
+    assert exit_code == 0
+    assert pools == [2]
+    assert json.loads(output_path.read_text(encoding="utf-8")) == expected
+    assert expected[2]["children"][0]["children"] == []
+
+
 def test_flatten_properties_blocks_handles_lists_recursively():
     config = {
         "items": [
@@ -318,3 +400,412 @@ def test_main_prints_output_when_no_output_path(tmp_path, capsys):
 
     assert exit_code == 0
     assert '"id": "canvas"' in captured.out
+
+
+def test_build_canvas_emits_cross_scope_ports_declared_after_target_node():
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "C", "type": "switch"},
+                {
+                    "name": "subgraph",
+                    "nodes": ["A"],
+                    "links": [{"from": "A:eth0", "to": "C:eth9"}],
+                },
+            ],
+            "links": [],
+        }
+    )
+
+    canvas = builder_mod.build_canvas(minimal, sample_settings())
+
+    node_c = canvas.children[0]
+    nested_edge = canvas.children[1].edges[0]
+    assert [port.id for port in node_c.ports] == ["c_eth9"]
+    assert nested_edge.sources == ["a_eth0"]
+    assert nested_edge.targets == ["c_eth9"]
+
+
+def test_build_canvas_recurses_nested_scopes_without_revalidating_graph_models(monkeypatch):
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {
+                    "name": "DC",
+                    "nodes": [{"name": "Pod", "nodes": [{"name": "Rack", "nodes": ["Dev"]}]}],
+                }
+            ],
+            "links": [],
+        }
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("nested scopes must not be wrapped in MinimalGraphIn")
+
+    monkeypatch.setattr(builder_mod, "MinimalGraphIn", fail)
+
+    canvas = builder_mod.build_canvas(minimal, sample_settings())
+
+    assert canvas.children[0].children[0].children[0].children[0].id == "dev"
+
+
+@pytest.mark.parametrize(
+    "example",
+    ["examples/example_01.json", "examples/subgraph.yaml", "examples/full-graph-nodes-ports-links.yaml"],
+)
+def test_trusted_build_matches_fully_validated_build(example, deterministic_settings):
+    data = builder_mod._load_input(example)
+    settings = builder_mod.compile_settings(deterministic_settings)
+
+    trusted = builder_mod.build_canvas(data, settings)
+    validated = builder_mod.build_canvas(data, settings, validate=True)
+
+    assert trusted.model_dump(by_alias=True, exclude_none=True, mode="json") == validated.model_dump(
+        by_alias=True, exclude_none=True, mode="json"
+    )
+
+
+def test_edge_id_suffixes_never_collide_with_explicit_ids():
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": ["A", "B"],
+            "links": [
+                {"label": "dup", "from": "A", "to": "B"},
+                {"label": "dup", "from": "B", "to": "A"},
+                {"id": "dup_2", "from": "A", "to": "B"},
+                {"label": "dup", "from": "A", "to": "B"},
+            ],
+        }
+    )
+
+    canvas = builder_mod.build_canvas(minimal, sample_settings(), validate=True)
+
+    assert [edge.id for edge in canvas.edges] == ["dup", "dup_2", "dup_2_2", "dup_3"]
+
+
+def test_repeated_nested_scopes_are_resolved_and_emitted_once(monkeypatch):
+    rack = {"nodes": ["Leaf", "Server"], "links": ["Leaf:eth1 -> Server:nic0", "Leaf:up -> Spine:down"]}
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "Rack1", **rack},
+                {"name": "Rack2", **rack},
+                {"name": "Rack3", "nodes": ["Leaf", "Server"], "links": ["Server:nic0 -> Leaf:eth1"]},
+                "Spine",
+            ],
+            "links": [],
+        }
+    )
+    settings = builder_mod.compile_settings(sample_settings())
+
+    resolved = builder_mod._resolve_graph(minimal, settings)
+    assert resolved.root.children["rack1"] is resolved.root.children["rack2"]
+    assert resolved.root.children["rack1"] is not resolved.root.children["rack3"]
+
+    calls = []
+    iter_nodes = builder_mod._CanvasEmitter.iter_nodes
+    monkeypatch.setattr(
+        builder_mod._CanvasEmitter,
+        "iter_nodes",
+        lambda self, scope: calls.append(id(scope)) or iter_nodes(self, scope),
+    )
+    payload = builder_mod.build_canvas_dict(minimal, settings)
+
+    assert len(calls) == 3
+    rack1, rack2, rack3, spine = payload["children"]
+    assert rack1["children"] == rack2["children"]
+    assert rack1["edges"] == rack2["edges"]
+    assert rack1["children"] is not rack2["children"]
+    assert [port["id"] for port in rack1["children"][0]["ports"]] == ["leaf_eth1", "leaf_up"]
+    assert rack1["edges"][1]["targets"] == ["spine_down"]
+    assert [port["id"] for port in spine["ports"]] == ["spine_down"]
+    assert rack3["edges"][0]["sources"] == ["server_nic0"]
+
+
+def test_repeated_scope_output_is_released_and_not_shared_between_occurrences():
+    rack = {"nodes": [{"name": "Shelf", "nodes": ["Disk"]}, "Leaf"], "links": ["Leaf -> Shelf"]}
+    minimal = MinimalGraphIn.model_validate(
+        {"nodes": [{"name": f"Rack{i}", **rack} for i in range(3)] + ["Spine"], "links": ["Spine -> Rack0"]}
+    )
+    compiled = builder_mod.compile_settings(sample_settings())
+    graph = builder_mod._resolve_graph(minimal, compiled)
+
+    emitter = builder_mod._CanvasEmitter(graph, compiled, builder_mod._DictFactory())
+    builder_mod._write_canvas(io.StringIO(), emitter, 2)
+    assert emitter._emitted == {}
+
+    emitter = builder_mod._CanvasEmitter(graph, compiled, builder_mod._ModelFactory())
+    canvas = emitter.canvas()
+    assert emitter._emitted == {}
+    racks = canvas.children[:3]
+    assert racks[0].model_dump(include={"children", "edges"}) == racks[2].model_dump(include={"children", "edges"})
+    racks[0].children[1].labels[0].text = "Edited"
+    racks[0].children[0].children[0].properties.extra = "x"
+    racks[0].edges[0].sources.append("extra")
+    for rack in racks[1:]:
+        assert rack.children[1].labels[0].text == "Leaf"
+        assert not hasattr(rack.children[0].children[0].properties, "extra")
+        assert rack.edges[0].sources == ["leaf"]
+
+
+def _regex_sanitize_id(value: str) -> str:
+    s = value.strip().lower()
+    s = re.sub(r"[\s:/@-]+", "_", s)
+    s = re.sub(r"[^a-z0-9_]", "_", s)
+    s = re.sub(r"_+", "_", s).strip("_")
+    return s or "id"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Router-1",
+        "core sw:eth0",
+        "ge-0/0/1",
+        "user@host.example",
+        "  __Spine__  ",
+        "a__b--c",
+        "   ",
+        "___",
+        "Été İstanbul",
+        "straße",
+        "x\u00a0y\tz",
+        "\u212a-node",
+        "٣rack",
+        "CamelCase123",
+    ],
+)
+def test_sanitize_id_matches_regex_reference(value):
+    assert builder_mod.sanitize_id(value) == _regex_sanitize_id(value)
+
+
+def test_sanitize_id_matches_regex_reference_for_generated_inputs():
+    alphabet = "aZ09 _-:/@.,ÉİßK\u00a0\t٣"
+    values = ["".join(chars) for chars in itertools.product(alphabet, repeat=3)]
+
+    assert [builder_mod.sanitize_id(value) for value in values] == [_regex_sanitize_id(value) for value in values]
+
+
+def test_candidate_aliases_are_deterministic():
+    assert builder_mod._candidate_aliases("Core Router 1") == ("core_router_1", "core_1")
+    assert builder_mod._candidate_aliases("Router") == ("router",)
+    assert builder_mod._candidate_aliases("Spine-1") == ("spine_1",)
+
+
+def test_alias_index_answers_local_cross_scope_and_ambiguous_tokens():
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "PodA", "nodes": ["Core Router", "Leaf"]},
+                {"name": "PodB", "nodes": ["Leaf", {"name": "Edge", "id": "edge-b"}]},
+            ],
+            "links": [],
+        }
+    )
+    subtree_keys = builder_mod._SubtreeKeys()
+    index = builder_mod._AliasIndex(minimal, subtree_keys)
+    pod_a = subtree_keys.key(minimal.nodes[0])
+    pod_b = subtree_keys.key(minimal.nodes[1])
+
+    assert index.local(pod_a, "core") == "core_router"
+    assert index.local(None, "core") is None
+    assert index.matches("core") == ["core_router"]
+    assert index.matches("leaf") == ["leaf", "leaf"]
+    assert index.local(pod_b, "edge") == "edge_b"
+    assert index.matches("edge_b") == ["edge_b"]
+
+    index.add_local(pod_a, "spine_1", "Spine 1")
+    assert index.local(pod_a, "spine_1") == "spine_1"
+    assert index.matches("spine_1") == []
+
+
+def test_build_canvas_keeps_auto_created_nodes_local_to_their_scope():
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "PodA", "nodes": ["A"], "links": ["A -> Ghost"]},
+                {"name": "PodB", "nodes": ["B"], "links": ["B -> Ghost", "B -> A"]},
+            ],
+            "links": [],
+        }
+    )
+
+    canvas = builder_mod.build_canvas(minimal, sample_settings())
+
+    pod_a, pod_b = canvas.children
+    assert [child.id for child in pod_a.children] == ["a", "ghost"]
+    assert [child.id for child in pod_b.children] == ["b", "ghost"]
+    assert pod_b.edges[1].targets == ["a"]
+
+
+def test_label_size_estimates_are_cached_per_text_and_font(monkeypatch):
+    calls = []
+    estimate = builder_mod._estimate_text_dimensions
+    monkeypatch.setattr(
+        builder_mod,
+        "_estimate_text_dimensions",
+        lambda text, font_size, metrics: calls.append((text, font_size)) or estimate(text, font_size, metrics),
+    )
+    builder_mod._estimate_label_size.cache_clear()
+    settings = sample_settings()
+    settings.estimate_label_size_from_font = True
+    minimal = MinimalGraphIn.model_validate(
+        {"nodes": ["A", "B", "C"], "links": ["A:eth0 -> B:eth0", "B:eth0 -> C:eth0", "C:eth0 -> A:eth0"]}
+    )
+
+    canvas = builder_mod.build_canvas(minimal, settings)
+
+    port_labels = [node.ports[0].labels[0] for node in canvas.children]
+    assert len({(label.width, label.height) for label in port_labels}) == 1
+    assert sorted(text for text, _ in calls) == ["A", "B", "C", "eth0"]
+
+
+def test_node_ports_reuse_the_port_registry_without_copying():
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": ["A", {"name": "Pod", "nodes": ["B"], "links": ["B:eth0 -> A:uplink"]}],
+            "links": ["A:eth0 -> Pod:eth1", "A:uplink -> Pod:eth2"],
+        }
+    )
+    compiled = builder_mod.compile_settings(sample_settings())
+    graph = builder_mod._resolve_graph(minimal, compiled)
+    emitter = builder_mod._CanvasEmitter(graph, compiled, builder_mod._DictFactory())
+    root = graph.root
+
+    pod_ports = emitter.node_ports(root.nodes["pod"], root)
+    a_ports = emitter.node_ports(root.nodes["a"], root)
+
+    assert [port.id for port in pod_ports] == ["pod_eth1", "pod_eth2"]
+    assert list(pod_ports) == list(root.ports["pod"].values())
+    assert type(pod_ports) is type({}.values())
+    assert a_ports == list(root.ports["a"].values())
+    assert [port.id for port in a_ports] == ["a_eth0", "a_uplink"]
+
+
+def test_deterministic_edge_ids_derive_from_endpoints():
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": ["A", "B", {"name": "Pod", "nodes": ["C"], "links": ["C -> A:eth0"]}],
+            "links": ["A:eth0 -> B:eth1", "A:eth0 -> B:eth1", "A -> B", {"id": "keep", "from": "A", "to": "B"}],
+        }
+    )
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+
+    first = json.dumps(builder_mod.build_canvas_dict(minimal, settings))
+    second = json.dumps(builder_mod.build_canvas_dict(minimal, settings))
+    payload = json.loads(first)
+
+    assert first == second
+    assert [edge["id"] for edge in payload["edges"]] == ["edge_a_eth0_b_eth1", "edge_a_eth0_b_eth1_2", "edge_a_b", "keep"]
+    assert payload["children"][2]["edges"][0]["id"] == "edge_c_a_eth0"
+
+
+def test_fallback_edge_ids_are_random_by_default():
+    minimal = MinimalGraphIn.model_validate({"nodes": ["A", "B"], "links": ["A -> B"]})
+
+    first = builder_mod.build_canvas_dict(minimal)["edges"][0]["id"]
+    second = builder_mod.build_canvas_dict(minimal)["edges"][0]["id"]
+
+    assert first.startswith("edge_") and first != second
+
+
+def _bundling_settings(**rule):
+    settings = sample_settings()
+    lag = settings.edge_defaults.model_copy(update={"bundling": EdgeBundling(**rule)})
+    settings.edge_type_overrides = {**settings.edge_type_overrides, "lag": lag}
+    return settings
+
+
+def _parallel_links_graph() -> MinimalGraphIn:
+    return MinimalGraphIn.model_validate(
+        {
+            "nodes": ["A", "B"],
+            "links": [
+                {"id": "m1", "type": "LAG", "from": "A:eth1", "to": "B:eth1"},
+                {"id": "plain", "from": "A:eth9", "to": "B:eth9"},
+                {"id": "m2", "type": "lag", "from": "A:eth2", "to": "B:eth2"},
+                {"id": "m3", "type": "lag", "from": "A:eth1", "to": "B:eth1"},
+                {"id": "back", "type": "lag", "from": "B:eth3", "to": "A:eth3"},
+                {"id": "plain2", "from": "A:eth9", "to": "B:eth9"},
+            ],
+        }
+    )
+
+
+def test_edge_bundling_collapses_parallel_links_per_node_pair():
+    payload = builder_mod.build_canvas_dict(_parallel_links_graph(), _bundling_settings())
+
+    edges = {edge["id"]: edge for edge in payload["edges"]}
+    assert list(edges) == ["m1", "plain", "back", "plain2"]
+    assert (edges["m1"]["sources"], edges["m1"]["targets"]) == (["a"], ["b"])
+    assert edges["m1"]["properties"][builder_mod.BUNDLE_COUNT_KEY] == 3
+    assert edges["m1"]["properties"][builder_mod.BUNDLE_MEMBERS_KEY] == ["m1", "m2", "m3"]
+    assert edges["back"]["sources"] == ["b_eth3"]
+    assert builder_mod.BUNDLE_COUNT_KEY not in edges["back"]["properties"]
+    assert [port["id"] for port in payload["children"][0]["ports"]] == ["a_eth1", "a_eth9", "a_eth2", "a_eth3"]
+
+
+def test_edge_bundling_by_port_and_min_members():
+    by_port = builder_mod.build_canvas_dict(_parallel_links_graph(), _bundling_settings(match="port"))
+    high_threshold = builder_mod.build_canvas_dict(_parallel_links_graph(), _bundling_settings(min_members=4))
+
+    edges = {edge["id"]: edge for edge in by_port["edges"]}
+    assert list(edges) == ["m1", "plain", "m2", "back", "plain2"]
+    assert (edges["m1"]["sources"], edges["m1"]["targets"]) == (["a_eth1"], ["b_eth1"])
+    assert edges["m1"]["properties"][builder_mod.BUNDLE_MEMBERS_KEY] == ["m1", "m3"]
+    assert [edge["id"] for edge in high_threshold["edges"]] == ["m1", "plain", "m2", "m3", "back", "plain2"]
+
+
+def test_edge_bundling_typed_model_output_matches_dict_output():
+    data = _parallel_links_graph()
+    settings = _bundling_settings()
+
+    canvas = builder_mod.build_canvas(data, settings, validate=True)
+
+    assert canvas.model_dump(by_alias=True, exclude_none=True) == builder_mod.build_canvas_dict(data, settings)
+
+
+def test_builder_reuses_endpoint_parts_and_properties_from_validation(monkeypatch):
+    graph = MinimalGraphIn.model_validate(
+        {
+            "nodes": ["A", "B"],
+            "links": [{"from": "A:eth0", "to": "B", "properties": {"edgeRouting": "ORTHOGONAL"}}],
+        }
+    )
+    edge = graph.links[0]
+    assert edge._endpoints[2:] == (("A", "eth0"), ("B", None))
+    assert edge._elk_properties[1] == {"org.eclipse.elk.edgeRouting": "ORTHOGONAL"}
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("validated values must not be parsed again")
+
+    monkeypatch.setattr(builder_mod, "_parse_endpoint", fail)
+    monkeypatch.setattr(builder_mod, "_normalize_properties", fail)
+    payload = builder_mod.build_canvas_dict(graph, sample_settings())
+    assert payload["edges"][0]["properties"]["org.eclipse.elk.edgeRouting"] == "ORTHOGONAL"
+
+
+def test_builder_parses_unvalidated_edges_on_first_use():
+    edge = builder_mod.MinimalEdgeIn.model_construct(source="A:eth0", target="B:eth1", properties={})
+    graph = MinimalGraphIn.model_construct(nodes=["A", "B"], links=[edge])
+    payload = builder_mod.build_canvas_dict(graph, sample_settings())
+    assert [(e["sources"], e["targets"]) for e in payload["edges"]] == [(["a_eth0"], ["b_eth1"])]
+    assert builder_mod._edge_endpoints(edge) == (("A", "eth0"), ("B", "eth1"))
+
+
+def test_builder_reparses_edges_changed_after_validation():
+    graph = MinimalGraphIn.model_validate({"nodes": ["A", "B", "C"], "links": ["A -> B"]})
+    edge = graph.links[0]
+    edge.target = "C:eth0"
+    edge.properties["edgeRouting"] = "POLYLINE"
+    copied = edge.model_copy(update={"source": "B", "properties": {}})
+    moved = graph.model_copy(update={"links": [edge, copied]})
+
+    payload = builder_mod.build_canvas_dict(moved, sample_settings())
+
+    first, second = payload["edges"]
+    assert (first["sources"], first["targets"]) == (["a"], ["c_eth0"])
+    assert first["properties"]["org.eclipse.elk.edgeRouting"] == "POLYLINE"
+    assert (second["sources"], second["targets"]) == (["b"], ["c_eth0"])
+    assert "org.eclipse.elk.edgeRouting" not in second["properties"]
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+import graphloom.builder as builder_mod
+from graphloom import MinimalGraphIn, build_canvas, build_canvas_dict, compile_settings
+
+
+def _payloads(data, settings):
+    reference = build_canvas(data, settings).model_dump(by_alias=True, exclude_none=True)
+    return build_canvas_dict(data, settings), reference
+
+
+@pytest.mark.parametrize(
+    "example",
+    [
+        "examples/example_01.json",
+        "examples/example_02.json",
+        "examples/subgraph.yaml",
+        "examples/full-graph-nodes-ports-links.yaml",
+        "examples/single-link-autonodes-with-ports.yaml",
+    ],
+)
+def test_build_canvas_dict_matches_model_dump_for_examples(example, deterministic_settings):
+    data = builder_mod._load_input(example)
+
+    payload, reference = _payloads(data, deterministic_settings)
+
+    assert payload == reference
+
+
+def test_build_canvas_dict_matches_model_dump_for_nested_cross_scope_graph(deterministic_settings):
+    data = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "C", "type": "Router"},
+                {
+                    "name": "Pod",
+                    "nodes": [
+                        {
+                            "name": "Rack",
+                            "nodes": [{"name": "A", "type": "switch"}, "B"],
+                            "links": [{"from": "A:eth0", "to": "B:eth0", "type": "100G"}],
+                        }
+                    ],
+                    "links": [{"from": "A:eth1", "to": "C:ge-0/0/1", "label": "Uplink"}],
+                },
+            ],
+            "links": [
+                {"from": "B", "to": "Z", "properties": {"graphrapids.edge.style": "DOT", "direction": "LEFT"}},
+            ],
+        }
+    )
+    deterministic_settings.node_defaults.properties["custom.none"] = None
+    compiled = compile_settings(deterministic_settings)
+
+    payload, reference = _payloads(data, compiled)
+
+    assert payload == reference
+    assert "custom.none" not in payload["children"][0]["properties"]
+    assert json.dumps(payload)
+
+
+def test_main_uses_dict_builder_for_enriched_output(tmp_path, monkeypatch):
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / "out.json"
+    input_path.write_text(json.dumps({"nodes": ["A", "B"], "links": ["A:eth0 -> B:eth1"]}), encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CLI should not build pydantic models without --validate")
+
+    monkeypatch.setattr(builder_mod, "build_canvas", fail)
+
+    assert builder_mod.main([str(input_path), "-o", str(output_path)]) == 0
+    output = json.loads(output_path.read_text(encoding="utf-8"))
+    assert output["edges"][0]["sources"] == ["a_eth0"]
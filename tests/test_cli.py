@@ -101,6 +101,24 @@ def test_builder_main_can_write_enriched_and_layout_outputs(tmp_path, monkeypatc
     assert laid_out["layoutApplied"] is True
 
 
+def test_builder_main_writes_json_dumps_text_for_non_ascii_labels(tmp_path, monkeypatch):
+    input_path = tmp_path / "input.json"
+    enriched_path = tmp_path / "enriched.json"
+    layout_path = tmp_path / "layout.json"
+    input_path.write_text(json.dumps({"nodes": ["Köln", "Zürich"], "links": ["Köln -> Zürich"]}), encoding="utf-8")
+    monkeypatch.setattr(builder_mod, "layout_with_elkjs", lambda payload, **_kwargs: payload)
+
+    exit_code = builder_mod.main(
+        [str(input_path), "--layout", "--enriched-output", str(enriched_path), "-o", str(layout_path)]
+    )
+
+    assert exit_code == 0
+    expected = json.dumps(json.loads(enriched_path.read_bytes()), indent=2).encode("ascii")
+    assert enriched_path.read_bytes() == expected
+    assert layout_path.read_bytes() == expected
+    assert b"K\\u00f6ln" in expected
+
+
 def test_dev_main_delegates_to_builder_main(monkeypatch):
     dev_main = _load_dev_main_module()
     captured: dict[str, object] = {}
@@ -138,3 +156,22 @@ def test_python_module_invocation_has_no_runtime_warning(tmp_path):
 
     assert proc.returncode == 0
     assert "RuntimeWarning" not in proc.stderr
+
+
+def test_python_module_invocation_reads_edge_tables(tmp_path):
+    input_path = tmp_path / "edges.csv"
+    output_path = tmp_path / "out.json"
+    input_path.write_text("source,target\nA,B\nB,C\n", encoding="utf-8")
+
+    for extra in ([], ["--seed", "B", "--hops", "1"]):
+        proc = subprocess.run(
+            [sys.executable, "-m", "graphloom.builder", str(input_path), *extra, "-o", str(output_path)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert proc.returncode == 0, proc.stderr
+        payload = json.loads(output_path.read_text(encoding="utf-8"))
+        assert [child["id"] for child in payload["children"]] == ["a", "b", "c"]
+        assert len(payload["edges"]) == 2
@@ -0,0 +1,114 @@
+import io
+import json
+
+import pytest
+
+from graphloom import MinimalGraphIn, build_canvas_dict, codec, sample_settings
+
+
+@pytest.fixture
+def restore_backend():
+    yield
+    codec.set_backend()
+
+
+def _payload() -> dict:
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    data = MinimalGraphIn.model_validate(
+        {
+            "nodes": ["Köln", {"name": "Pod", "nodes": ["Leaf"], "links": ["Leaf:up -> Köln:pod"]}],
+            "links": [{"label": "Ω link", "from": "Köln:eth0", "to": "Pod"}],
+        }
+    )
+    return build_canvas_dict(data, settings)
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_every_backend_writes_identical_text(indent, restore_backend):
+    payload = _payload()
+    reference = json.dumps(payload, indent=indent, separators=(",", ":") if indent is None else None)
+
+    for name in ("orjson", "msgspec", "json"):
+        try:
+            codec.set_backend(name)
+        except ValueError:
+            continue
+        assert codec.dumps(payload, indent=indent) == reference
+        assert codec.loads(reference) == payload
+        assert codec.loads(reference.encode("utf-8")) == payload
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_every_backend_matches_json_for_floats_and_escapes(indent, restore_backend):
+    value = {
+        "floats": [1e-7, 1e-5, 1e-4, 0.5, 1e15, 1e16, 1.5e300, 12345678901234567.0, -0.0, 5e-324],
+        "special": [float("nan"), float("inf"), -float("inf"), None],
+        "text": ["Ω", "\x7f", "\x00\x1f", "e1 null 0.00001"],
+    }
+    reference = json.dumps(value, indent=indent, separators=(",", ":") if indent is None else None)
+
+    for name in ("orjson", "msgspec", "json"):
+        try:
+            codec.set_backend(name)
+        except ValueError:
+            continue
+        assert codec.dumps(value, indent=indent) == reference
+        buffer = io.BytesIO()
+        codec.dump(value, buffer, indent=indent)
+        assert buffer.getvalue() == reference.encode("ascii")
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec"])
+def test_fast_backends_only_fall_back_for_unsafe_values(name, restore_backend, monkeypatch):
+    try:
+        codec.set_backend(name)
+    except ValueError:
+        pytest.skip(f"{name} is not installed")
+    json_dumps = codec._json_dumps
+    fallbacks = []
+    monkeypatch.setattr(codec, "_json_dumps", lambda *args: fallbacks.append(args[0]) or json_dumps(*args))
+    # Random fallback edge ids are hex, so they often contain "<digit>e<digit>".
+    safe = {"id": "edge_cb0467e9", "label": "null 1e5 0.00001", "sizes": [0.0001, 1e15, -2.5], "n": 10**18}
+    unsafe = [[1e-5], {"x": -1e-7}, [1e16], {"x": float("nan")}, [None], {"x": [0.5, -0.00002]}]
+
+    assert codec.dumps(safe) == json.dumps(safe, separators=(",", ":"))
+    assert fallbacks == []
+    for value in unsafe:
+        assert codec.dumps(value) == json.dumps(value, separators=(",", ":"))
+    assert fallbacks == unsafe
+
+
+def test_dumps_sorts_keys_and_falls_back_for_values_a_backend_cannot_encode():
+    assert codec.dumps({"b": 1, "a": [1, 2]}, sort_keys=True) == '{"a":[1,2],"b":1}'
+    assert codec.dumps({"big": 2**70}) == '{"big":1180591620717411303424}'
+    assert codec.dumps({1: "x"}) == '{"1":"x"}'
+
+
+def test_dump_writes_to_file_objects():
+    buffer = io.StringIO()
+
+    codec.dump({"a": [1]}, buffer, indent=2)
+
+    assert buffer.getvalue() == '{\n  "a": [\n    1\n  ]\n}'
+
+    binary = io.BytesIO()
+    codec.dump({"a": ["Köln"]}, binary)
+    assert binary.getvalue() == b'{"a":["K\\u00f6ln"]}'
+
+
+def test_loads_raises_json_decode_error_for_every_backend(restore_backend):
+    for name in ("orjson", "msgspec", "json"):
+        try:
+            codec.set_backend(name)
+        except ValueError:
+            continue
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads("{not json")
+
+
+def test_set_backend_rejects_unavailable_backends(restore_backend):
+    with pytest.raises(ValueError, match="JSON backend 'nope' is not available"):
+        codec.set_backend("nope")
+    assert codec.set_backend("json") == "json"
+    assert codec.backend == "json"
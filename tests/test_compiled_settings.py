@@ -0,0 +1,100 @@
+import pytest
+
+from graphloom import CompiledSettings, MinimalGraphIn, build_canvas, compile_settings, sample_settings
+
+
+def test_compile_settings_resolves_role_and_type_templates():
+    settings = sample_settings()
+    compiled = compile_settings(settings)
+
+    switch = compiled.node_template("switch", is_subgraph=False)
+    subgraph = compiled.node_template("router", is_subgraph=True)
+
+    assert switch.type == "switch"
+    assert switch.icon == "clarity:network-switch-line"
+    assert switch.width == settings.node_defaults.width
+    assert switch.label.font == ("Arial", 16.0)
+    assert subgraph.type == "subgraph"
+    assert subgraph.width is None and subgraph.height is None
+    assert subgraph.label.width == settings.subgraph_defaults.label.width
+    assert compiled.node_template("switch", is_subgraph=False) is switch
+
+
+def test_compile_settings_caches_unknown_types_on_first_use():
+    compiled = compile_settings(sample_settings())
+
+    template = compiled.node_template("patchpanel", is_subgraph=False)
+
+    assert template.type == "patchpanel"
+    assert template.icon is None
+    assert compiled.node_template("patchpanel", is_subgraph=False) is template
+
+
+def test_compiled_settings_ignore_later_changes_to_the_settings():
+    settings = sample_settings()
+    compiled = compile_settings(settings)
+    node_width = settings.node_defaults.width
+
+    settings.deterministic_edge_ids = not settings.deterministic_edge_ids
+    settings.auto_create_missing_nodes = not settings.auto_create_missing_nodes
+    settings.node_defaults.type = "changed"
+    settings.node_defaults.width = node_width + 10
+
+    assert compiled.deterministic_edge_ids is not settings.deterministic_edge_ids
+    assert compiled.auto_create_missing_nodes is not settings.auto_create_missing_nodes
+    assert compiled.default_node_type != "changed"
+    # Templates of types first used after the change still come from the snapshot.
+    assert compiled.node_template("patchpanel", is_subgraph=False).width == node_width
+
+
+def test_compile_settings_applies_type_and_edge_type_overrides():
+    settings = sample_settings()
+    node_override = settings.node_defaults.model_copy(deep=True)
+    node_override.width = 99
+    settings.type_overrides["Core"] = node_override
+    edge_override = settings.edge_defaults.model_copy(deep=True)
+    edge_override.properties["org.eclipse.elk.edge.thickness"] = 4
+    settings.edge_type_overrides["100G"] = edge_override
+
+    compiled = compile_settings(settings)
+
+    assert compiled.node_template("core", is_subgraph=False).width == 99
+    assert compiled.edge_template(" 100g ").default_properties["org.eclipse.elk.edge.thickness"] == 4
+    assert compiled.edge_template(None).default_properties["org.eclipse.elk.edge.thickness"] == 1
+    assert compiled.edge_template(None).default_properties["graphrapids.edge.style"] == "SOLID"
+
+
+def test_compile_settings_rejects_unknown_layout_option_identifier():
+    settings = sample_settings()
+    settings.layout_options["not.a.valid.option"] = "x"
+
+    with pytest.raises(ValueError, match="Unknown layout option identifiers"):
+        compile_settings(settings)
+
+
+def test_build_canvas_accepts_compiled_settings_and_matches_plain_settings():
+    minimal = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "Rack", "nodes": [{"name": "S1", "type": "switch"}, "S2"]},
+                {"name": "R1", "type": "Router"},
+            ],
+            "links": [
+                {"id": "l1", "label": "Uplink", "type": "100G", "from": "S1:eth0", "to": "R1:ge-0/0/1"},
+                {"id": "l2", "from": "S2", "to": "R1", "properties": {"direction": "LEFT"}},
+            ],
+        }
+    )
+    settings = sample_settings()
+    compiled = compile_settings(settings)
+
+    first = build_canvas(minimal, compiled)
+    second = build_canvas(minimal, compiled)
+    expected = build_canvas(minimal, settings)
+
+    assert isinstance(compiled, CompiledSettings)
+    dumped = first.model_dump(by_alias=True, exclude_none=True)
+    assert dumped == expected.model_dump(by_alias=True, exclude_none=True)
+    assert dumped == second.model_dump(by_alias=True, exclude_none=True)
+    assert first.layoutOptions is not second.layoutOptions
+    assert dumped["edges"][1]["properties"]["org.eclipse.elk.direction"] == "LEFT"
@@ -17,6 +17,7 @@ def test_layout_with_elkjs_node_mode_uses_node_command(monkeypatch):
         captured["input"] = kwargs["input"]
         assert kwargs["capture_output"] is True
         assert kwargs["text"] is True
+        assert kwargs["encoding"] == "utf-8"
         assert kwargs["check"] is False
         assert kwargs["cwd"] is None
         return subprocess.CompletedProcess(cmd, 0, '{"id":"canvas","x":12}', "")
@@ -3,6 +3,11 @@ import pytest
 import graphloom
 import graphloom.builder as builder_mod
 import graphloom.elkjs as elkjs_mod
+import graphloom.incremental as incremental_mod
+import graphloom.ir as ir_mod
+import graphloom.streaming as streaming_mod
+import graphloom.tabular as tabular_mod
+import graphloom.views as views_mod
 
 
 def test_lazy_builder_exports_are_available_via_module_getattr():
@@ -10,6 +15,10 @@ def test_lazy_builder_exports_are_available_via_module_getattr():
     assert graphloom.MinimalNodeIn is builder_mod.MinimalNodeIn
     assert graphloom.MinimalEdgeIn is builder_mod.MinimalEdgeIn
     assert graphloom.build_canvas is builder_mod.build_canvas
+    assert graphloom.build_canvas_dict is builder_mod.build_canvas_dict
+    assert graphloom.build_canvases is builder_mod.build_canvases
+    assert graphloom.build_canvas_dicts is builder_mod.build_canvas_dicts
+    assert graphloom.write_canvas_json is builder_mod.write_canvas_json
     assert graphloom.sanitize_id is builder_mod.sanitize_id
 
 
@@ -17,6 +26,32 @@ def test_lazy_elkjs_export_is_available_via_module_getattr():
     assert graphloom.layout_with_elkjs is elkjs_mod.layout_with_elkjs
 
 
+def test_lazy_incremental_export_is_available_via_module_getattr():
+    assert graphloom.rebuild_canvas is incremental_mod.rebuild_canvas
+
+
+def test_lazy_ir_exports_are_available_via_module_getattr():
+    assert graphloom.GraphIR is ir_mod.GraphIR
+    assert graphloom.build_graph_ir is ir_mod.build_graph_ir
+    assert graphloom.canvas_from_ir is ir_mod.canvas_from_ir
+    assert graphloom.canvas_dict_from_ir is ir_mod.canvas_dict_from_ir
+    assert graphloom.write_ir_json is ir_mod.write_ir_json
+
+
+def test_lazy_streaming_export_is_available_via_module_getattr():
+    assert graphloom.write_canvas_json_stream is streaming_mod.write_canvas_json_stream
+
+
+def test_lazy_tabular_export_is_available_via_module_getattr():
+    assert graphloom.read_edge_table is tabular_mod.read_edge_table
+
+
+def test_lazy_views_exports_are_available_via_module_getattr():
+    assert graphloom.extract_view is views_mod.extract_view
+    assert graphloom.expand_canvas is views_mod.expand_canvas
+    assert graphloom.expand_canvas_dict is views_mod.expand_canvas_dict
+
+
 def test_unknown_graphloom_attribute_raises_attribute_error():
     with pytest.raises(AttributeError, match="module 'graphloom' has no attribute 'not_real'"):
         getattr(graphloom, "not_real")
@@ -0,0 +1,20 @@
+import pytest
+
+from graphloom.fonts import font_metrics
+
+
+def test_font_metrics_resolve_known_families_case_insensitively():
+    assert font_metrics("Arial") is font_metrics("helvetica")
+    assert font_metrics("'Segoe UI', Arial, sans-serif") is font_metrics("Arial")
+    assert font_metrics("Times New Roman") is font_metrics("serif")
+    assert font_metrics("Wingdings") is None
+
+
+def test_text_width_sums_glyph_advances():
+    assert font_metrics("Arial").text_width("Link") == pytest.approx(1.834)
+    assert font_metrics("Times New Roman").text_width("Link") == pytest.approx(1.889)
+    assert font_metrics("Courier New").text_width("ge-0/0/1") == pytest.approx(4.8)
+
+
+def test_text_width_falls_back_to_flat_advance_for_unknown_glyphs():
+    assert font_metrics("Arial").text_width("é") == pytest.approx(0.6)
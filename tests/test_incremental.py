@@ -0,0 +1,133 @@
+import pytest
+
+from graphloom import MinimalGraphIn, build_canvas, build_canvas_dict, rebuild_canvas, sample_settings
+from graphloom.builder import BUNDLE_MEMBERS_KEY
+from graphloom.settings import EdgeBundling
+
+
+def _graph(extra_inner_link: bool = False, extra_node: bool = False) -> MinimalGraphIn:
+    inner_links = ["R1:ge0 -> R2:ge0"]
+    if extra_inner_link:
+        inner_links.append("R2:ge1 -> R1:ge1")
+    nodes = [
+        {"name": "DC1", "nodes": ["R1", "R2"], "links": inner_links},
+        {"name": "DC2", "nodes": ["S1", "S2"], "links": ["S1 -> S2"]},
+        "Edge",
+    ]
+    if extra_node:
+        nodes.append("Extra")
+    return MinimalGraphIn.model_validate(
+        {"nodes": nodes, "links": ["Edge:wan -> DC1/R1:uplink", {"from": "Edge", "to": "DC2"}]}
+    )
+
+
+def _without_edge_ids(value):
+    if isinstance(value, dict):
+        stripped = {key: _without_edge_ids(item) for key, item in value.items()}
+        if "edges" in stripped:
+            stripped["edges"] = [{k: v for k, v in edge.items() if k != "id"} for edge in stripped["edges"]]
+        return stripped
+    if isinstance(value, list):
+        return [_without_edge_ids(item) for item in value]
+    return value
+
+
+@pytest.mark.parametrize("as_dict", [False, True])
+def test_rebuild_matches_full_build_and_reuses_unchanged_subtrees(as_dict):
+    settings = sample_settings()
+    old = _graph()
+    new = _graph(extra_inner_link=True, extra_node=True)
+    previous = build_canvas_dict(old, settings) if as_dict else build_canvas(old, settings)
+
+    rebuilt = rebuild_canvas(previous, old, new, settings)
+
+    if as_dict:
+        children = {child["id"]: child for child in rebuilt["children"]}
+        previous_children = {child["id"]: child for child in previous["children"]}
+        payload = rebuilt
+        previous_payload = previous
+    else:
+        children = {child.id: child for child in rebuilt.children}
+        previous_children = {child.id: child for child in previous.children}
+        payload = rebuilt.model_dump(by_alias=True, exclude_none=True)
+        previous_payload = previous.model_dump(by_alias=True, exclude_none=True)
+
+    assert children["dc2"] is previous_children["dc2"]
+    assert children["edge"] is previous_children["edge"]
+    assert children["dc1"] is not previous_children["dc1"]
+    assert payload["edges"] == previous_payload["edges"]
+    # The surviving unlabeled link inside DC1 keeps its generated id.
+    assert payload["children"][0]["edges"][0] == previous_payload["children"][0]["edges"][0]
+    assert _without_edge_ids(payload) == _without_edge_ids(build_canvas_dict(new, settings))
+
+
+def test_rebuild_keeps_generated_edge_ids_of_surviving_links():
+    old = MinimalGraphIn.model_validate({"nodes": ["A", "B"], "links": ["A -> B"]})
+    new = MinimalGraphIn.model_validate({"nodes": ["A", "B", "C"], "links": ["A -> B", "B -> C"]})
+    previous = build_canvas_dict(old)
+
+    rebuilt = rebuild_canvas(previous, old, new)
+
+    assert rebuilt["edges"][0] == previous["edges"][0]
+    assert rebuilt["edges"][1]["id"] != previous["edges"][0]["id"]
+    assert [child["id"] for child in rebuilt["children"]] == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("as_dict", [False, True])
+def test_rebuild_with_edge_bundling_keeps_bundle_member_ids(as_dict):
+    settings = sample_settings()
+    settings.edge_defaults.bundling = EdgeBundling()
+    old = MinimalGraphIn.model_validate({"nodes": ["A", "B"], "links": ["A -> B", "A -> B", "B -> A"]})
+    new = MinimalGraphIn.model_validate(
+        {"nodes": ["A", "B", "C"], "links": ["A -> B", "B -> C", "A -> B", "B -> A"]}
+    )
+    previous = build_canvas_dict(old, settings) if as_dict else build_canvas(old, settings)
+
+    rebuilt = rebuild_canvas(previous, old, new, settings)
+
+    if not as_dict:
+        previous = previous.model_dump(by_alias=True, exclude_none=True)
+        rebuilt = rebuilt.model_dump(by_alias=True, exclude_none=True)
+    assert len(previous["edges"]) == 2
+    assert rebuilt["edges"][0] == previous["edges"][0]
+    assert rebuilt["edges"][2] == previous["edges"][1]
+    assert rebuild_canvas(previous, old, old, settings)["edges"] == previous["edges"]
+    expected = build_canvas_dict(new, settings)
+    for payload in (rebuilt, expected):
+        payload["edges"][0]["properties"].pop(BUNDLE_MEMBERS_KEY)
+    assert _without_edge_ids(rebuilt) == _without_edge_ids(expected)
+
+
+def test_rebuild_with_deterministic_edge_ids_matches_a_fresh_build():
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    old = MinimalGraphIn.model_validate(
+        {"nodes": ["FW"], "links": [{"from": "FW", "to": "FW", "properties": {"edgeRouting": "ORTHOGONAL"}}, "FW -> FW"]}
+    )
+    new = MinimalGraphIn.model_validate({"nodes": ["FW", "B"], "links": ["FW -> FW", "FW -> B"]})
+
+    rebuilt = rebuild_canvas(build_canvas_dict(old, settings), old, new, settings)
+
+    assert rebuilt == build_canvas_dict(new, settings)
+    assert [edge["id"] for edge in rebuilt["edges"]] == ["edge_fw_fw", "edge_fw_b"]
+
+
+def test_rebuild_reemits_nodes_whose_ports_changed():
+    old = MinimalGraphIn.model_validate({"nodes": ["A", "B"], "links": ["A:p1 -> B"]})
+    new = MinimalGraphIn.model_validate({"nodes": ["A", "B"], "links": ["A:p2 -> B"]})
+    previous = build_canvas_dict(old)
+
+    rebuilt = rebuild_canvas(previous, old, new)
+
+    assert rebuilt["children"][1] is previous["children"][1]
+    assert [port["id"] for port in rebuilt["children"][0]["ports"]] == ["a_p2"]
+    assert rebuilt["edges"][0]["sources"] == ["a_p2"]
+    assert rebuilt["edges"][0]["id"].startswith("edge_")
+
+
+def test_rebuild_rejects_previous_canvas_of_another_graph():
+    old = MinimalGraphIn.model_validate({"nodes": ["A", "B"], "links": ["A -> B"]})
+    other = build_canvas_dict(MinimalGraphIn.model_validate({"nodes": ["X", "Y"], "links": []}))
+
+    with pytest.raises(ValueError, match="does not match the old input graph"):
+        rebuild_canvas(other, old, old)
@@ -0,0 +1,105 @@
+import io
+import json
+
+import pytest
+
+import graphloom.builder as builder_mod
+from graphloom import (
+    MinimalGraphIn,
+    build_canvas,
+    build_canvas_dict,
+    build_graph_ir,
+    canvas_dict_from_ir,
+    canvas_from_ir,
+    write_ir_json,
+)
+from graphloom.ir import NO_INDEX
+
+
+@pytest.mark.parametrize(
+    "example",
+    [
+        "examples/example_01.json",
+        "examples/example_02.json",
+        "examples/subgraph.yaml",
+        "examples/full-graph-nodes-ports-links.yaml",
+        "examples/single-link-autonodes-with-ports.yaml",
+    ],
+)
+def test_lowered_ir_matches_direct_build(example, deterministic_settings):
+    data = builder_mod._load_input(example)
+    settings = builder_mod.compile_settings(deterministic_settings)
+    ir = build_graph_ir(data, settings)
+
+    expected = build_canvas_dict(data, settings)
+    assert canvas_dict_from_ir(ir, settings) == expected
+    assert canvas_from_ir(ir, settings).model_dump(by_alias=True, exclude_none=True) == build_canvas(
+        data, settings
+    ).model_dump(by_alias=True, exclude_none=True)
+    buffer = io.StringIO()
+    write_ir_json(ir, buffer, settings)
+    assert buffer.getvalue() == json.dumps(expected, indent=2)
+
+
+def test_graph_ir_columns_describe_the_resolved_graph():
+    data = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "DC", "nodes": ["R1", {"name": "Pod", "nodes": ["Leaf"]}], "links": ["R1:ge0 -> Leaf"]},
+                {"name": "Spine", "type": "Switch"},
+            ],
+            "links": [{"label": "uplink", "from": "Spine:p1", "to": "R1:up", "type": "100G"}],
+        }
+    )
+
+    ir = build_graph_ir(data)
+    ids = [ir.strings[index] for index in ir.node_id]
+
+    assert ids == ["dc", "r1", "pod", "leaf", "spine"]
+    assert list(ir.node_parent) == [NO_INDEX, 0, 0, 2, NO_INDEX]
+    assert [ir.types[code] for code in ir.node_type] == ["default", "default", "default", "default", "switch"]
+    assert [ids[row] for row in ir.subtree(0)] == ["dc", "r1", "pod", "leaf"]
+
+    assert ir.edge_count == 2
+    root_edge, dc_edge = sorted(range(ir.edge_count), key=lambda edge: ir.edge_scope[edge])
+    assert ir.edge_scope[dc_edge] == 0
+    assert (ir.edge_source_node[dc_edge], ir.edge_target_node[dc_edge]) == (1, 3)
+    assert ir.edge_target_port[dc_edge] == NO_INDEX
+    assert ir.strings[ir.port_id[ir.edge_source_port[dc_edge]]] == "r1_ge0"
+    assert ir.strings[ir.edge_label[root_edge]] == "uplink"
+    assert ir.types[ir.edge_type[root_edge]] == "100G"
+    assert (ir.edge_source_node[root_edge], ir.edge_target_node[root_edge]) == (4, 1)
+    assert [ir.strings[ir.port_id[port]] for port in ir.node_ports(1)] == ["r1_ge0", "r1_up"]
+    assert ir.port_node[ir.edge_target_port[root_edge]] == NO_INDEX
+
+
+def test_node_ports_use_the_per_node_port_columns():
+    data = MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "DC", "nodes": ["R1", "R2"], "links": ["R1:ge0 -> R2:ge0", "R1:up -> R2"]},
+                "Spine",
+            ],
+            "links": ["Spine:p1 -> R1:up", "Spine:p2 -> R2:up", "Spine:p3 -> R2:oob"],
+        }
+    )
+    ir = build_graph_ir(data)
+
+    def scanned(row):
+        strings = ir.strings
+        local = [port for port, owner in enumerate(ir.port_node) if owner == row]
+        keys = {strings[ir.port_id[port]] for port in local}
+        return local + [
+            port
+            for port, owner in enumerate(ir.port_node)
+            if owner == NO_INDEX
+            and ir.port_node_id[port] == ir.node_id[row]
+            and strings[ir.port_id[port]] not in keys
+        ]
+
+    expected = [scanned(row) for row in range(ir.node_count)]
+    ir.port_node = None  # node_ports must not scan the port table
+
+    assert [ir.node_ports(row) for row in range(ir.node_count)] == expected
+    r2 = [ir.strings[index] for index in ir.node_id].index("r2")
+    assert [ir.strings[ir.port_id[port]] for port in ir.node_ports(r2)] == ["r2_ge0", "r2_up", "r2_oob"]
@@ -0,0 +1,146 @@
+import io
+import json
+import multiprocessing
+
+import pytest
+
+import graphloom.builder as builder_mod
+from graphloom import MinimalGraphIn, build_canvas, build_canvas_dict, codec, sample_settings, write_canvas_json
+
+
+def _graph() -> MinimalGraphIn:
+    def rack(index: int, size: int) -> dict:
+        devices = [f"R{index}D{i}" for i in range(size)]
+        links = [
+            {"label": f"L{i}", "from": f"{devices[i]}:eth{i}", "to": f"{devices[i + 1]}:eth{i}"}
+            for i in range(size - 1)
+        ]
+        links.append({"label": "up", "from": f"{devices[0]}:up", "to": "Spine:down"})
+        return {"name": f"Rack{index}", "nodes": devices, "links": links}
+
+    pod = {"nodes": ["Leaf"], "links": [{"label": "uplink", "from": "Leaf:up", "to": "Spine:pod"}]}
+    return MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                rack(0, 4),
+                "Spine",
+                rack(1, 3),
+                {"name": "PodA", **pod},
+                {"name": "PodB", **pod},
+            ],
+            "links": [{"label": "core", "from": "Spine:p1", "to": "R1D2:core"}],
+        }
+    )
+
+
+def test_parallel_dict_build_matches_serial_build():
+    data = _graph()
+    settings = builder_mod.compile_settings(sample_settings())
+
+    assert build_canvas_dict(data, settings, max_workers=2) == build_canvas_dict(data, settings)
+
+
+def test_parallel_model_build_matches_serial_build():
+    data = _graph()
+    settings = builder_mod.compile_settings(sample_settings())
+
+    parallel = build_canvas(data, settings, max_workers=2)
+
+    assert parallel.model_dump(by_alias=True, exclude_none=True) == build_canvas(data, settings).model_dump(
+        by_alias=True, exclude_none=True
+    )
+
+
+@pytest.mark.parametrize("indent", [2, None])
+def test_parallel_stream_matches_serial_stream(indent):
+    data = _graph()
+    settings = sample_settings()
+    buffer = io.StringIO()
+
+    write_canvas_json(data, buffer, settings, indent=indent, max_workers=2)
+
+    assert buffer.getvalue() == codec.dumps(build_canvas_dict(data, settings), indent=indent)
+
+
+def test_parallel_build_skips_pool_without_top_level_subgraphs(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("no pool expected for a flat graph")
+
+    monkeypatch.setattr(builder_mod, "ProcessPoolExecutor", fail)
+    data = MinimalGraphIn.model_validate({"nodes": ["A", "B"], "links": ["A -> B"]})
+
+    payload = build_canvas_dict(data, max_workers=4)
+
+    assert [child["id"] for child in payload["children"]] == ["a", "b"]
+
+
+def test_main_accepts_jobs_option(tmp_path):
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / "out.json"
+    input_path.write_text(_graph().model_dump_json(by_alias=True), encoding="utf-8")
+
+    exit_code = builder_mod.main([str(input_path), "-j", "2", "-o", str(output_path)])
+
+    assert exit_code == 0
+    assert json.loads(output_path.read_text(encoding="utf-8")) == build_canvas_dict(_graph())
+
+
+def _small_graphs():
+    return [
+        MinimalGraphIn.model_validate(
+            {
+                "nodes": [f"A{i}", {"name": f"G{i}", "nodes": ["X"]}],
+                "links": [{"label": "l", "from": f"A{i}", "to": "X"}],
+            }
+        )
+        for i in range(6)
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_build_canvas_dicts_compiles_settings_once(max_workers, monkeypatch):
+    calls = []
+    compile_settings = builder_mod.compile_settings
+    monkeypatch.setattr(
+        builder_mod, "compile_settings", lambda settings: calls.append(settings) or compile_settings(settings)
+    )
+    graphs = _small_graphs()
+
+    payloads = builder_mod.build_canvas_dicts(graphs, sample_settings(), max_workers=max_workers)
+
+    assert len(calls) == 1
+    assert payloads == [build_canvas_dict(graph) for graph in graphs]
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_build_canvases_keeps_input_order(max_workers):
+    graphs = _small_graphs()
+
+    canvases = builder_mod.build_canvases(graphs, max_workers=max_workers)
+
+    assert [canvas.children[0].id for canvas in canvases] == [f"a{i}" for i in range(6)]
+    assert canvases[3].model_dump(by_alias=True, exclude_none=True) == build_canvas_dict(graphs[3])
+
+
+@pytest.fixture
+def spawn_start_method():
+    previous = multiprocessing.get_start_method()
+    multiprocessing.set_start_method("spawn", force=True)
+    yield
+    multiprocessing.set_start_method(previous, force=True)
+
+
+def test_parallel_builds_use_the_default_start_method(spawn_start_method, monkeypatch):
+    contexts = []
+    executor_cls = builder_mod.ProcessPoolExecutor
+
+    def recording_executor(*args, **kwargs):
+        contexts.append(kwargs.get("mp_context"))
+        return executor_cls(*args, **kwargs)
+
+    monkeypatch.setattr(builder_mod, "ProcessPoolExecutor", recording_executor)
+    graphs = _small_graphs()
+
+    assert build_canvas_dict(_graph(), max_workers=2) == build_canvas_dict(_graph())
+    assert builder_mod.build_canvas_dicts(graphs, max_workers=2) == [build_canvas_dict(graph) for graph in graphs]
+    assert contexts == [None, None]
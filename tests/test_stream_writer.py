@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+import graphloom.builder as builder_mod
+from graphloom import codec
+from graphloom import MinimalGraphIn, build_canvas_dict, sample_settings, write_canvas_json
+
+
+@pytest.mark.parametrize("indent", [2, None, 4])
+@pytest.mark.parametrize(
+    "example",
+    [
+        "examples/example_01.json",
+        "examples/subgraph.yaml",
+        "examples/single-node-no-type.yaml",
+    ],
+)
+def test_write_canvas_json_matches_codec_dumps_of_dict_payload(example, indent, deterministic_settings):
+    data = builder_mod._load_input(example)
+    settings = deterministic_settings
+    buffer = io.StringIO()
+
+    write_canvas_json(data, buffer, settings, indent=indent)
+
+    assert buffer.getvalue() == codec.dumps(build_canvas_dict(data, settings), indent=indent)
+
+
+def test_write_canvas_json_writes_top_level_children_incrementally(monkeypatch):
+    events = []
+    original_node = builder_mod._CanvasEmitter.node
+
+    def tracking_node(self, node_rec, scope):
+        if scope is self.graph.root:
+            events.append(("build", node_rec.id))
+        return original_node(self, node_rec, scope)
+
+    class TrackingBuffer(io.StringIO):
+        def write(self, text):
+            if '"id": "' in text and events and events[-1][0] == "build":
+                events.append(("write", events[-1][1]))
+            return super().write(text)
+
+    monkeypatch.setattr(builder_mod._CanvasEmitter, "node", tracking_node)
+    data = MinimalGraphIn.model_validate({"nodes": ["A", "B", "C"], "links": []})
+
+    write_canvas_json(data, TrackingBuffer(), sample_settings())
+
+    assert events == [
+        ("build", "a"),
+        ("write", "a"),
+        ("build", "b"),
+        ("write", "b"),
+        ("build", "c"),
+        ("write", "c"),
+    ]
+
+
+def test_main_streams_identical_enriched_and_final_output(tmp_path):
+    input_path = tmp_path / "input.json"
+    enriched_path = tmp_path / "enriched.json"
+    output_path = tmp_path / "out.json"
+    input_path.write_text(
+        json.dumps({"nodes": ["A", "B"], "links": ["A:eth0 -> B:eth1", "A -> B"]}),
+        encoding="utf-8",
+    )
+
+    exit_code = builder_mod.main(
+        [str(input_path), "--enriched-output", str(enriched_path), "-o", str(output_path)]
+    )
+
+    assert exit_code == 0
+    enriched_text = enriched_path.read_text(encoding="utf-8")
+    assert enriched_text == output_path.read_text(encoding="utf-8")
+    assert enriched_text == json.dumps(json.loads(enriched_text), indent=2)
@@ -0,0 +1,182 @@
+import io
+import json
+
+import pytest
+
+import graphloom.builder as builder_mod
+import graphloom.streaming as streaming_mod
+from graphloom import MinimalGraphIn, sample_settings, write_canvas_json
+from graphloom.settings import EdgeBundling
+from graphloom.streaming import write_canvas_json_stream
+
+
+def _settings():
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    return settings
+
+
+_GRAPH = {
+    "nodes": [
+        "Router A",
+        {"name": "Pod", "nodes": ["Leaf 1", "Leaf 2"], "links": ["Leaf 1:up -> Router A:down", "Leaf 1 -> Leaf 2"]},
+        {"name": "Switch B", "type": "switch", "id": "sb"},
+    ],
+    "links": [
+        "Router A:eth0 -> sb:ge0",
+        {"from": "Router A", "to": "Host C", "label": "mgmt", "properties": {"edgeRouting": "ORTHOGONAL"}},
+        {"from": "sb", "to": "Host C", "id": "e-3", "type": "data"},
+        "Router A:eth0 -> sb:ge0",
+        {"from": "Host C", "to": "Router A", "properties": {"graphrapids.edge.style": "DASH"}},
+        "Pod -> 1000",
+    ],
+}
+
+
+def _expected(document, settings, indent=2):
+    out = io.StringIO()
+    write_canvas_json(MinimalGraphIn.model_validate(document), out, settings, indent=indent)
+    return out.getvalue()
+
+
+def _streamed(text, settings, **kwargs):
+    out = io.StringIO()
+    write_canvas_json_stream(io.StringIO(text), out, settings, **kwargs)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 20])
+@pytest.mark.parametrize("keys", [("nodes", "links"), ("links", "nodes")])
+def test_stream_matches_write_canvas_json(chunk_size, keys):
+    document = {key: _GRAPH[key] for key in keys}
+    text = json.dumps(document, indent=1)
+    assert _streamed(text, _settings(), chunk_size=chunk_size) == _expected(document, _settings())
+
+
+def test_stream_matches_with_compact_output_bundling_and_missing_sections():
+    settings = _settings()
+    settings.edge_defaults.bundling = EdgeBundling()
+    document = {"links": _GRAPH["links"]}
+    text = json.dumps(document)
+    assert _streamed(text, settings, indent=None, chunk_size=7) == _expected(document, settings, indent=None)
+
+    document = {"nodes": ["A"], "links": None}
+    assert _streamed(json.dumps(document), _settings()) == _expected(document, _settings())
+
+
+def test_stream_spills_links_instead_of_keeping_them(monkeypatch):
+    spilled = []
+    spill_cls = streaming_mod._Spill
+
+    class RecordingSpill(spill_cls):
+        def append(self, record):
+            spilled.append(type(record).__name__)
+            super().append(record)
+
+    monkeypatch.setattr(streaming_mod, "_Spill", RecordingSpill)
+    text = json.dumps({"links": ["A -> B"], "nodes": ["A", "B"]})
+    _streamed(text, _settings())
+    # One raw link read before the nodes, then one resolved link per top-level link.
+    assert spilled == ["_EdgeRow", "_ResolvedLink"]
+
+
+@pytest.mark.parametrize(
+    ("text", "error", "message"),
+    [
+        ("{}", ValueError, "At least one node or one link"),
+        ('{"nodes": [], "links": []}', ValueError, "At least one node or one link"),
+        ('{"nodes": ["A"], "extra": 1}', ValueError, "Unexpected input key 'extra'"),
+        ('{"nodes": ["A"], "nodes": ["B"]}', ValueError, "Duplicate input key 'nodes'"),
+        ('{"nodes": "A"}', ValueError, "'nodes' must be a list"),
+        ('{"nodes": ["A", {"name": "B:1"}]}', ValueError, "Invalid item 1 of 'nodes'"),
+        ('{"nodes": ["A"], "links": ["A -> B", "A to B"]}', ValueError, "Invalid item 1 of 'links'"),
+        ('{"nodes": ["A"] "links": []}', json.JSONDecodeError, "Expecting '}'"),
+        ('{"nodes": ["A",]}', json.JSONDecodeError, "Expecting value"),
+        ('{"nodes": ["A"]} []', json.JSONDecodeError, "Extra data"),
+        ('{"nodes": ["A"]', json.JSONDecodeError, "Expecting '}'"),
+    ],
+)
+def test_stream_rejects_invalid_input_before_writing(text, error, message):
+    out = io.StringIO()
+    with pytest.raises(error, match=message):
+        write_canvas_json_stream(io.StringIO(text), out, _settings(), chunk_size=4)
+    assert out.getvalue() == ""
+
+
+class _CountingReader(io.StringIO):
+    def __init__(self, text):
+        super().__init__(text)
+        self.read_chars = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.read_chars += len(chunk)
+        return chunk
+
+
+def test_stream_reports_syntax_errors_without_reading_the_rest():
+    text = '{"nodes": ["A" "B"' + ', "X"' * 10000 + "]}"
+    source = _CountingReader(text)
+
+    with pytest.raises(json.JSONDecodeError) as excinfo:
+        write_canvas_json_stream(source, io.StringIO(), _settings(), chunk_size=64)
+
+    assert excinfo.value.pos == text.index('"B"')
+    assert source.read_chars == 64
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize(
+    "tail",
+    ['"Z" "Y"]}', '"Z", tru]}', '{"name": "Z", "id": 1.}]}', '"Z", "\\x"]}', '"Z",\n  -Infinit]}', '"Z" ]} x'],
+)
+def test_stream_reports_error_positions_like_json_loads(chunk_size, tail):
+    text = '{\n "nodes": [\n' + "".join(f'  "N{i}",\n' for i in range(40)) + "  " + tail
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+
+    with pytest.raises(json.JSONDecodeError) as excinfo:
+        write_canvas_json_stream(io.StringIO(text), io.StringIO(), _settings(), chunk_size=chunk_size)
+
+    error = excinfo.value
+    assert (error.pos, error.lineno, error.colno) == (
+        expected.value.pos,
+        expected.value.lineno,
+        expected.value.colno,
+    )
+    assert str(error).endswith(f": line {error.lineno} column {error.colno} (char {error.pos})")
+
+
+def test_main_stream_writes_the_regular_output(tmp_path):
+    input_path = tmp_path / "input.json"
+    input_path.write_text(json.dumps(_GRAPH), encoding="utf-8")
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(_settings().model_dump_json(by_alias=True, exclude_none=True), encoding="utf-8")
+    streamed = tmp_path / "streamed.json"
+    regular = tmp_path / "regular.json"
+
+    assert builder_mod.main([str(input_path), "--stream", "-s", str(settings_path), "-o", str(streamed)]) == 0
+    assert builder_mod.main([str(input_path), "-s", str(settings_path), "-o", str(regular)]) == 0
+
+    assert streamed.read_text(encoding="utf-8") == regular.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    ("extra", "message"),
+    [
+        (["--layout"], "--stream cannot be combined with --layout"),
+        (["--max-depth", "1", "--validate"], "--stream cannot be combined with --validate, --max-depth"),
+    ],
+)
+def test_main_stream_rejects_incompatible_options(tmp_path, capsys, extra, message):
+    input_path = tmp_path / "input.json"
+    input_path.write_text(json.dumps(_GRAPH), encoding="utf-8")
+    with pytest.raises(SystemExit):
+        builder_mod.main([str(input_path), "--stream", *extra])
+    assert message in capsys.readouterr().err
+
+    yaml_path = tmp_path / "input.yaml"
+    yaml_path.write_text("nodes: [A]\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        builder_mod.main([str(yaml_path), "--stream"])
+    assert "--stream requires a .json input" in capsys.readouterr().err
@@ -0,0 +1,123 @@
+import json
+import pickle
+
+import pytest
+
+import graphloom.builder as builder_mod
+from graphloom import MinimalGraphIn, build_canvas, build_canvas_dict, build_canvas_dicts, sample_settings
+from graphloom.tabular import read_edge_table
+
+
+def _settings():
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    return settings
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_edge_table_builds_like_the_equivalent_minimal_input(tmp_path):
+    edges = _write(
+        tmp_path / "edges.csv",
+        "source,source_port,target,target_port,label,type,id\n"
+        "Router A,eth0,Switch B,ge-0/0/1,uplink,,\n"
+        "Switch B,,Host C,,,,e1\n"
+        "\n"
+        "Router A,eth1,Host C,eth0,,,\n",
+    )
+    nodes = _write(tmp_path / "nodes.csv", "name,type,id\nRouter A,router,\nHost C,server,hc\n")
+
+    graph = read_edge_table(edges, nodes=nodes)
+    expected = MinimalGraphIn.model_validate(
+        {
+            "nodes": [{"name": "Router A", "type": "router"}, {"name": "Host C", "type": "server", "id": "hc"}],
+            "links": [
+                {"from": "Router A:eth0", "to": "Switch B:ge-0/0/1", "label": "uplink"},
+                {"from": "Switch B", "to": "Host C", "id": "e1"},
+                "Router A:eth1 -> Host C:eth0",
+            ],
+        }
+    )
+
+    assert build_canvas_dict(graph, _settings()) == build_canvas_dict(expected, _settings())
+    assert build_canvas(graph, _settings()).model_dump(by_alias=True, exclude_none=True) == build_canvas_dict(
+        graph, _settings()
+    )
+
+
+def test_edge_table_rows_share_endpoints_and_skip_edge_models(tmp_path, monkeypatch):
+    edges = _write(tmp_path / "edges.tsv", "target\tsource\nB\tA\nB\tA\n")
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("edge tables must not build MinimalEdgeIn models")
+
+    monkeypatch.setattr(builder_mod.MinimalEdgeIn, "model_validate", fail)
+    graph = read_edge_table(edges)
+
+    first, second = graph.links
+    assert first.source == ("A", None) and first.target == ("B", None)
+    assert first.source is second.source
+    payload = build_canvas_dict(graph, _settings())
+    assert [(edge["id"], edge["sources"], edge["targets"]) for edge in payload["edges"]] == [
+        ("edge_a_b", ["a"], ["b"]),
+        ("edge_a_b_2", ["a"], ["b"]),
+    ]
+
+
+def test_edge_table_graphs_build_in_a_process_pool(tmp_path):
+    edges = _write(tmp_path / "edges.csv", "source,source_port,target,label\nA,eth0,B,uplink\nB,,C,\n")
+    graph = read_edge_table(edges)
+
+    assert pickle.loads(pickle.dumps(graph)).links == graph.links
+    assert build_canvas_dicts([graph, graph], _settings(), max_workers=2) == [build_canvas_dict(graph, _settings())] * 2
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("", "expected a header row"),
+        ("source,to\nA,B\n", "Unknown column 'to'"),
+        ("source,source\nA,B\n", "Duplicate column 'source'"),
+        ("source,label\nA,x\n", "Missing column 'target'"),
+        ("source,target\nA,B,C\n", r"edges.csv, line 2: expected 2 fields, found 3"),
+        ("source,target\nA,B\n,B\n", r"line 3: Column 'source' must not be empty"),
+        ("source,target\nA:x,B\n", r"line 2: Node name cannot contain ':'"),
+        ("source,source_port,target\nA,port-name-too-long,B\n", r"line 2: Port name must be between"),
+        ("source,target,label\nA,B," + "x" * 41 + "\n", r"line 2: Edge name must be between"),
+    ],
+)
+def test_edge_table_rejects_invalid_tables(tmp_path, text, message):
+    edges = _write(tmp_path / "edges.csv", text)
+    with pytest.raises(ValueError, match=message):
+        read_edge_table(edges)
+
+
+def test_edge_table_requires_a_node_or_link_and_a_known_delimiter(tmp_path):
+    with pytest.raises(ValueError, match="At least one node or one link"):
+        read_edge_table(_write(tmp_path / "edges.csv", "source,target\n"))
+    with pytest.raises(ValueError, match="Cannot infer the delimiter"):
+        read_edge_table(_write(tmp_path / "edges.txt", "source;target\nA;B\n"))
+    graph = read_edge_table(_write(tmp_path / "edges.txt", "source;target\nA;B\n"), delimiter=";")
+    assert graph.links[0].target == ("B", None)
+
+
+def test_main_reads_edge_table_with_node_table(tmp_path):
+    edges = _write(tmp_path / "edges.csv", "source,target\nA,B\n")
+    nodes = _write(tmp_path / "nodes.csv", "name,type\nA,router\n")
+    output = tmp_path / "out.json"
+
+    assert builder_mod.main([edges, "--nodes", nodes, "-o", str(output)]) == 0
+
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert [child["id"] for child in payload["children"]] == ["a", "b"]
+    assert payload["children"][0]["type"] == "router"
+
+
+def test_node_table_requires_edge_table_input(tmp_path):
+    graph = _write(tmp_path / "graph.json", json.dumps({"nodes": ["A"]}))
+    nodes = _write(tmp_path / "nodes.csv", "name\nA\n")
+    with pytest.raises(ValueError, match="node table can only be combined"):
+        builder_mod._load_inputs(graph, nodes)
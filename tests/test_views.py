@@ -0,0 +1,213 @@
+import io
+import json
+
+import pytest
+
+import graphloom.builder as builder_mod
+from graphloom import (
+    MinimalGraphIn,
+    build_canvas_dict,
+    expand_canvas,
+    expand_canvas_dict,
+    extract_view,
+    sample_settings,
+)
+
+
+def _graph() -> MinimalGraphIn:
+    pod = {
+        "nodes": ["Leaf", {"name": "Srv", "type": "server"}],
+        "links": ["Leaf:up -> Spine:pod", "Srv -> Leaf"],
+    }
+    return MinimalGraphIn.model_validate(
+        {
+            "nodes": [
+                {"name": "Spine", "type": "router"},
+                {"name": "Edge", "type": "router"},
+                {"name": "PodA", **pod},
+                {"name": "PodB", **pod},
+                "Far",
+            ],
+            "links": ["Edge -> Spine", "Far -> Edge", "Far -> Ext"],
+        }
+    )
+
+
+def _dump(view: MinimalGraphIn) -> dict:
+    return view.model_dump(by_alias=True, exclude_defaults=True)
+
+
+def test_extract_view_keeps_seed_neighbourhood_and_containers():
+    view = extract_view(_graph(), seeds=["Spine"], hops=1)
+
+    assert _dump(view) == {
+        "nodes": [
+            {"name": "Spine", "type": "router"},
+            {"name": "Edge", "type": "router"},
+            {"name": "PodA", "nodes": [{"name": "Leaf"}], "links": [{"from": "Leaf:up", "to": "Spine:pod"}]},
+            {"name": "PodB", "nodes": [{"name": "Leaf"}], "links": [{"from": "Leaf:up", "to": "Spine:pod"}]},
+        ],
+        "links": [{"from": "Edge", "to": "Spine"}],
+    }
+
+
+def test_extract_view_follows_hops_from_nested_seeds():
+    view = extract_view(_graph(), seeds=["Srv"], hops=2)
+
+    assert [node["name"] for node in _dump(view)["nodes"]] == ["Spine", "PodA", "PodB"]
+    assert _dump(view)["nodes"][1]["links"] == [
+        {"from": "Leaf:up", "to": "Spine:pod"},
+        {"from": "Srv", "to": "Leaf"},
+    ]
+
+
+def test_extract_view_filters_by_node_type():
+    view = extract_view(_graph(), node_types=["Router"])
+
+    assert _dump(view) == {
+        "nodes": [{"name": "Spine", "type": "router"}, {"name": "Edge", "type": "router"}],
+        "links": [{"from": "Edge", "to": "Spine"}],
+    }
+
+
+def test_extract_view_only_traverses_allowed_types():
+    view = extract_view(_graph(), seeds=["Far"], hops=3, node_types=["default"])
+
+    assert _dump(view) == {"nodes": [{"name": "Far"}], "links": [{"from": "Far", "to": "Ext"}]}
+
+
+def test_extract_view_builds_like_the_matching_part_of_the_full_graph():
+    settings = sample_settings()
+    full = build_canvas_dict(_graph(), settings)
+    view = build_canvas_dict(extract_view(_graph(), settings, seeds=["Edge"], hops=1), settings)
+
+    full_children = {child["id"]: child for child in full["children"]}
+    assert [child["id"] for child in view["children"]] == ["spine", "edge", "far"]
+    assert view["children"][1] == full_children["edge"]
+    assert view["children"][2] == full_children["far"]
+    assert [(edge["sources"], edge["targets"]) for edge in view["edges"]] == [
+        (["edge"], ["spine"]),
+        (["far"], ["edge"]),
+    ]
+
+
+def test_extract_view_rejects_unknown_seeds_and_negative_hops():
+    with pytest.raises(ValueError, match="Unknown seed node 'Nope'"):
+        extract_view(_graph(), seeds=["Nope"])
+    with pytest.raises(ValueError, match="hops must be zero or positive"):
+        extract_view(_graph(), seeds=["Spine"], hops=-1)
+
+
+def test_main_builds_view_from_seed_options(tmp_path):
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / "out.json"
+    input_path.write_text(_graph().model_dump_json(by_alias=True), encoding="utf-8")
+
+    exit_code = builder_mod.main(
+        [str(input_path), "--seed", "Spine", "--hops", "1", "--node-type", "router", "-o", str(output_path)]
+    )
+
+    payload = json.loads(output_path.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert [child["id"] for child in payload["children"]] == ["spine", "edge"]
+    assert payload["edges"][0]["sources"] == ["edge"]
+
+
+def test_main_rejects_hops_without_seed(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        builder_mod.main([str(tmp_path / "input.json"), "--hops", "2"])
+
+    assert "--hops requires --seed" in capsys.readouterr().err
+
+
+def _nested_graph() -> MinimalGraphIn:
+    rack = {"name": "Rack", "nodes": ["S1", "S2"], "links": ["S1 -> S2", "S1:up -> Leaf:down"]}
+    return MinimalGraphIn.model_validate(
+        {
+            "nodes": ["Spine", {"name": "PodA", "nodes": ["Leaf", rack], "links": ["Leaf:up -> Spine:pod"]}],
+            "links": ["Spine -> Leaf"],
+        }
+    )
+
+
+def _stable_settings():
+    settings = sample_settings()
+    settings.deterministic_edge_ids = True
+    return settings
+
+
+def _edge_ends(payload: dict) -> list:
+    return [(edge["sources"], edge["targets"]) for edge in payload["edges"]]
+
+
+def test_max_depth_collapses_subgraphs_into_summary_leaves():
+    payload = build_canvas_dict(_nested_graph(), max_depth=1)
+
+    spine, pod = payload["children"]
+    assert pod["id"] == "poda" and pod["children"] == [] and "width" in pod
+    assert pod["properties"][builder_mod.COLLAPSED_CHILDREN_KEY] == 2
+    assert pod["properties"][builder_mod.COLLAPSED_DESCENDANTS_KEY] == 4
+    assert _edge_ends(payload) == [(["spine"], ["poda"]), (["poda"], ["spine_pod"])]
+
+
+def test_max_depth_keeps_levels_above_the_threshold():
+    settings = _stable_settings()
+    payload = build_canvas_dict(_nested_graph(), settings, max_depth=2)
+    full = build_canvas_dict(_nested_graph(), settings)
+
+    pod = payload["children"][1]
+    assert [child["id"] for child in pod["children"]] == ["leaf", "rack"]
+    assert pod["children"][0] == full["children"][1]["children"][0]
+    assert pod["children"][1]["properties"][builder_mod.COLLAPSED_DESCENDANTS_KEY] == 2
+    assert _edge_ends(pod) == [(["leaf_up"], ["spine_pod"]), (["rack"], ["leaf_down"])]
+    assert build_canvas_dict(_nested_graph(), settings, max_depth=3)["children"] == full["children"]
+
+
+def test_max_depth_matches_across_builders():
+    data = _nested_graph()
+    settings = builder_mod.compile_settings(sample_settings())
+    buffer = io.StringIO()
+
+    payload = build_canvas_dict(data, settings, max_depth=1)
+    builder_mod.write_canvas_json(data, buffer, settings, max_depth=1)
+    canvas = builder_mod.build_canvas(data, settings, validate=True, max_depth=1)
+
+    assert json.loads(buffer.getvalue())["children"] == payload["children"]
+    assert canvas.model_dump(by_alias=True, exclude_none=True)["children"] == payload["children"]
+    with pytest.raises(ValueError, match="max_depth must be at least 1"):
+        build_canvas_dict(data, max_depth=0)
+
+
+def test_expand_canvas_builds_one_subtree_on_demand():
+    data = _nested_graph()
+    settings = _stable_settings()
+    full = build_canvas_dict(data, settings)
+
+    expanded = expand_canvas_dict(data, "poda", settings)
+    collapsed = expand_canvas_dict(data, "poda", max_depth=1)
+    canvas = expand_canvas(data, "rack")
+
+    assert expanded["children"] == full["children"][1]["children"]
+    assert _edge_ends(expanded) == []
+    assert collapsed["children"][1]["properties"][builder_mod.COLLAPSED_CHILDREN_KEY] == 2
+    assert _edge_ends(collapsed) == [(["rack"], ["leaf_down"])]
+    assert [child.id for child in canvas.children] == ["s1", "s2"]
+    assert [edge.sources for edge in canvas.edges] == [["s1"]]
+
+
+def test_expand_canvas_rejects_unknown_and_leaf_nodes():
+    with pytest.raises(ValueError, match="Unknown node 'nope'"):
+        expand_canvas_dict(_nested_graph(), "nope")
+    with pytest.raises(ValueError, match="Node 'spine' is not a subgraph"):
+        expand_canvas_dict(_nested_graph(), "spine")
+
+
+def test_main_accepts_max_depth_option(tmp_path):
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / "out.json"
+    input_path.write_text(_nested_graph().model_dump_json(by_alias=True), encoding="utf-8")
+
+    exit_code = builder_mod.main([str(input_path), "--max-depth", "1", "-o", str(output_path)])
+
+    assert exit_code == 0
+    assert json.loads(output_path.read_text(encoding="utf-8"))["children"][1]["children"] == []